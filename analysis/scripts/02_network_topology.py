@@ -8,9 +8,24 @@ Outputs:
 - analysis/results/network_metrics.json (topology statistics)
 - analysis/results/hub_proteins.csv (high-degree nodes)
 - figures/data/network_data.graphml (for Cytoscape visualization)
+- public/network_layouts/{all,high,medium,low}.json (precomputed layouts for
+  components/NetworkVisualization.tsx)
+
+Layouts are force-directed (Fruchterman-Reingold, seeded so reruns are stable)
+over UniProt-keyed nodes, started from one cluster per complex. Each file holds
+compact parallel arrays: ids, genes, integer x/y in [0, extent], the cluster of
+each node, a two-level cluster hierarchy (complex -> bait; preys join the bait
+they interact with most strongly) and edges as flat node-index pairs.
+
+The web viewer shows the network of one searched protein at a time, so each
+file also holds an ego layout per protein: 'ego' maps a UniProt ID to flat
+[node index, x, y, ...] triples for the protein (at 0, 0) and its partners,
+with x/y in [-extent/2, extent/2]. Partners sit on concentric rings in the
+angular order of a force-directed layout of the ego network (so partners that
+interact with each other stay adjacent), at least EGO_MIN_SEPARATION apart.
 
 Requirements:
-  pip install networkx pandas psycopg2-binary python-dotenv
+  pip install networkx pandas scipy psycopg2-binary python-dotenv
 
 Usage:
   export POSTGRES_URL="postgresql://..."
@@ -18,12 +33,26 @@ Usage:
 """
 
 import os
+import sys
 import json
+import math
+from pathlib import Path
+import numpy as np
 import pandas as pd
 import networkx as nx
 from urllib.parse import urlparse
 import psycopg2
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from ift_protein_extractor_updated import IFTExtractor
+
+LAYOUT_DIR = 'public/network_layouts'
+LAYOUT_EXTENT = 1000  # layout coordinates are integers in [0, LAYOUT_EXTENT]
+LAYOUT_SEED = 42
+LAYOUT_SUBNETWORKS = {'all': None, 'high': 'High', 'medium': 'Medium', 'low': 'Low'}
+EGO_MIN_SEPARATION = 60  # layout units; 22 px when the ego layout fills a 450 px high view
+EGO_RING_GAP = 100
+
 def connect_to_database():
     """Connect to PostgreSQL database"""
     database_url = os.environ.get('POSTGRES_URL')
@@ -185,6 +214,216 @@ def export_network_for_cytoscape(G, output_path):
     nx.write_graphml(G, output_path)
     print(f"Exported to {output_path}")
 
+def load_bait_complexes():
+    """UniProt -> complex for the curated bait sets in ift_protein_extractor_updated.py"""
+    extractor = IFTExtractor()
+    complexes = {}
+    for proteins in (extractor.get_human_ift_proteins(), extractor.get_bbsome_proteins(),
+                     extractor.get_chlamydomonas_ift_proteins()):
+        for uniprot, info in proteins.items():
+            complexes[uniprot] = info.get('complex') or 'Other'
+    return complexes
+
+def build_layout_graph(df, confidence_filter=None):
+    """Undirected graph keyed by UniProt (as in NetworkVisualization), weighted by ipSAE"""
+    if confidence_filter:
+        df = df[df['ipsae_confidence'] == confidence_filter]
+
+    G = nx.Graph()
+    for bait, bait_gene, prey, prey_gene, ipsae in zip(df['bait_uniprot'], df['bait_gene'], df['prey_uniprot'],
+                                                        df['prey_gene'], df['ipsae']):
+        G.add_node(bait, gene=bait_gene if isinstance(bait_gene, str) else bait, bait=True)
+        if prey not in G:
+            G.add_node(prey, gene=prey_gene if isinstance(prey_gene, str) else prey, bait=False)
+        weight = float(ipsae) if pd.notna(ipsae) else 0.0
+        # Reciprocal predictions (A->B and B->A) share one edge with the stronger score
+        if not G.has_edge(bait, prey) or G[bait][prey]['weight'] < weight:
+            G.add_edge(bait, prey, weight=weight)
+    return G
+
+def assign_clusters(G, bait_complexes):
+    """Two-level hierarchy: complex -> bait, with each prey in the cluster of its strongest bait"""
+    clusters = []
+    cluster_index = {}
+
+    def cluster_id(key, name, level, parent):
+        if key not in cluster_index:
+            cluster_index[key] = len(clusters)
+            clusters.append({'name': name, 'level': level, 'parent': parent})
+        return cluster_index[key]
+
+    node_cluster = {}
+    for bait in sorted(node for node, data in G.nodes(data=True) if data['bait']):
+        complex_name = bait_complexes.get(bait, 'Other')
+        parent = cluster_id(('complex', complex_name), complex_name, 'complex', None)
+        node_cluster[bait] = cluster_id(('bait', bait), G.nodes[bait]['gene'], 'bait', parent)
+
+    for node in G:
+        if node in node_cluster:
+            continue
+        baits = [neighbor for neighbor in G[node] if G.nodes[neighbor]['bait']]
+        strongest = max(baits, key=lambda neighbor: G[node][neighbor]['weight'])
+        node_cluster[node] = node_cluster[strongest]
+
+    return node_cluster, clusters
+
+def compute_layout(G, node_cluster, clusters, seed=LAYOUT_SEED):
+    """
+    Force-directed positions, started with each complex around its own point on
+    a circle. Connected components are laid out separately (otherwise repulsion
+    pushes small components far out and squeezes the rest) and packed in rows
+    below the largest, each in a box whose side grows with sqrt(node count).
+    """
+    rng = np.random.default_rng(seed)
+    complexes = sorted({cluster['name'] for cluster in clusters if cluster['level'] == 'complex'})
+    centers = {name: (math.cos(2 * math.pi * i / len(complexes)), math.sin(2 * math.pi * i / len(complexes)))
+               for i, name in enumerate(complexes)}
+
+    initial = {}
+    for node in sorted(G):
+        complex_name = clusters[clusters[node_cluster[node]]['parent']]['name']
+        cx, cy = centers[complex_name]
+        initial[node] = (cx + rng.normal(0, 0.15), cy + rng.normal(0, 0.15))
+
+    # Weak links still hold nodes together; ipSAE only strengthens them
+    for _, _, data in G.edges(data=True):
+        data['layout_weight'] = 0.5 + data['weight']
+
+    components = sorted(nx.connected_components(G), key=lambda component: (-len(component), min(component)))
+    row_width = math.sqrt(len(components[0]))
+    gap = 1.0
+    x = y = row_height = 0.0
+    positions = {}
+    for component in components:
+        subgraph = G.subgraph(component)
+        sub_positions = nx.spring_layout(subgraph, pos={node: initial[node] for node in subgraph},
+                                         weight='layout_weight', iterations=200, seed=seed)
+        nodes = sorted(sub_positions)
+        coords = np.array([sub_positions[node] for node in nodes])
+        coords -= coords.min(axis=0)
+        size = math.sqrt(len(component))
+        coords *= size / max(float(coords.max()), 1e-9)
+
+        if x > 0 and x + size > row_width:
+            x, y, row_height = 0.0, y + row_height + gap, 0.0
+        for node, (node_x, node_y) in zip(nodes, coords):
+            positions[node] = (x + node_x, y + node_y)
+        x += size + gap
+        row_height = max(row_height, size)
+    return positions
+
+def ego_ring_positions(n, radius, angle0=0.0):
+    """
+    n positions spread evenly in angle, alternating over as many concentric
+    rings (radius, radius - EGO_RING_GAP, ...) as needed to keep every pair at
+    least EGO_MIN_SEPARATION apart
+    """
+    for n_rings in range(1, int(radius // EGO_RING_GAP) + 1):
+        # Slots rounded up to whole turns over the rings, so the last and first
+        # node never share a ring at a narrower angle than the rest
+        slots = math.ceil(n / n_rings) * n_rings
+        angles = angle0 + 2 * math.pi * np.arange(n) / slots
+        radii = radius - EGO_RING_GAP * (np.arange(n) % n_rings)
+        coords = np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+        distances = np.linalg.norm(coords[:, None, :] - coords[None, :, :], axis=-1)
+        np.fill_diagonal(distances, np.inf)
+        if distances.min() >= EGO_MIN_SEPARATION:
+            return coords
+    return coords
+
+def compute_ego_layout(G, center, seed=LAYOUT_SEED):
+    """{node: (x, y)} for a protein at the origin and its partners on rings around it"""
+    partners = sorted(node for node in G[center] if node != center)  # homodimers are self-loops
+    if not partners:
+        return {center: (0.0, 0.0)}
+
+    # Angular order around the centre in a force-directed layout of the ego network,
+    # built in sorted node and edge order (a subgraph view iterates a set, whose
+    # order depends on PYTHONHASHSEED) so reruns are stable
+    members = [center] + partners
+    ego = nx.Graph()
+    ego.add_nodes_from(members)
+    member_set = set(members)
+    for node in members:
+        for neighbor in sorted(G[node]):
+            if neighbor in member_set and neighbor != node:
+                ego.add_edge(node, neighbor, layout_weight=G[node][neighbor].get('layout_weight', 1.0))
+    spring = nx.spring_layout(ego, weight='layout_weight', seed=seed)
+    angle = {node: math.atan2(spring[node][1] - spring[center][1], spring[node][0] - spring[center][0])
+             for node in partners}
+    ordered = sorted(partners, key=lambda node: (angle[node], node))
+
+    coords = ego_ring_positions(len(ordered), LAYOUT_EXTENT / 2, angle[ordered[0]])
+    positions = {center: (0.0, 0.0)}
+    positions.update({node: tuple(xy) for node, xy in zip(ordered, coords)})
+    return positions
+
+def ego_layouts_to_arrays(G, index):
+    """{UniProt: [node index, x, y, ...]} ego layout of every protein"""
+    ego = {}
+    for center in sorted(G):
+        flat = []
+        for node, (x, y) in compute_ego_layout(G, center).items():
+            flat += [index[node], int(round(x)), int(round(y))]
+        ego[center] = flat
+    return ego
+
+def layout_to_arrays(G, positions, node_cluster, clusters, name):
+    """Compact parallel arrays with integer coordinates in [0, LAYOUT_EXTENT]"""
+    ids = sorted(G)
+    coords = np.array([positions[node] for node in ids])
+    low = coords.min(axis=0)
+    span = max(float((coords.max(axis=0) - low).max()), 1e-9)
+    scaled = np.rint((coords - low) / span * LAYOUT_EXTENT).astype(int)
+
+    index = {node: i for i, node in enumerate(ids)}
+    edges = []
+    for source, target in G.edges():
+        edges += [index[source], index[target]]
+
+    return {
+        'name': name,
+        'extent': LAYOUT_EXTENT,
+        'ids': ids,
+        'genes': [G.nodes[node]['gene'] for node in ids],
+        'bait': [int(G.nodes[node]['bait']) for node in ids],
+        'x': scaled[:, 0].tolist(),
+        'y': scaled[:, 1].tolist(),
+        'cluster': [node_cluster[node] for node in ids],
+        'clusters': clusters,
+        'edges': edges,
+        'ego': ego_layouts_to_arrays(G, index),
+    }
+
+def export_network_layouts(df, output_dir=LAYOUT_DIR):
+    """Precompute layouts for the full network and each confidence subnetwork"""
+    print(f"\n=== PRECOMPUTING NETWORK LAYOUTS ===\n")
+
+    os.makedirs(output_dir, exist_ok=True)
+    bait_complexes = load_bait_complexes()
+    paths = []
+
+    for name, confidence in LAYOUT_SUBNETWORKS.items():
+        G = build_layout_graph(df, confidence_filter=confidence)
+        path = os.path.join(output_dir, f'{name}.json')
+        if G.number_of_nodes() == 0:
+            print(f"  {name}: no interactions, skipped")
+            continue
+
+        node_cluster, clusters = assign_clusters(G, bait_complexes)
+        positions = compute_layout(G, node_cluster, clusters)
+        layout = layout_to_arrays(G, positions, node_cluster, clusters, name)
+
+        with open(path, 'w') as f:
+            json.dump(layout, f, separators=(',', ':'))
+        paths.append(path)
+
+        n_complexes = sum(1 for cluster in clusters if cluster['level'] == 'complex')
+        print(f"  {name}: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges, "
+              f"{n_complexes} complexes -> {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+
+    return paths
+
 def analyze_confidence_levels(df):
     """Analyze network properties by confidence level"""
     print("\n=== ANALYZING BY CONFIDENCE LEVEL ===\n")
@@ -241,11 +480,16 @@ def main():
     with open(metrics_path, 'w') as f:
         json.dump(all_metrics, f, indent=2)
 
+    # 9. Precompute layouts for the web network viewer
+    layout_paths = export_network_layouts(df)
+
     print(f"\n✅ Network topology analysis complete!\n")
     print("Output files:")
     print(f"  - {metrics_path}")
     print(f"  - {hub_path}")
     print(f"  - {graphml_path}")
+    for path in layout_paths:
+        print(f"  - {path}")
 
 if __name__ == '__main__':
     main()
@@ -17,6 +17,9 @@ Usage:
   export POSTGRES_URL="postgresql://..."
   python analysis/scripts/04_biogrid_comparison.py
 
+  # Parse the BioGRID download once per release into data/external/index/
+  python analysis/scripts/04_biogrid_comparison.py --build-index
+
 BioGRID Data:
   Downloads latest human interactions from BioGRID REST API
   Alternative: manually download from https://downloads.thebiogrid.org/BioGRID/Release-Archive/
@@ -24,15 +27,21 @@ BioGRID Data:
 
 import os
 import json
+import argparse
 import pandas as pd
 import psycopg2
 from urllib.parse import urlparse
 import requests
-from collections import defaultdict
+
+from pair_index import PairIndex, index_path
+from id_mapping import get_mapper
+from alias_index import load_alias_index, store_releases, mapping_release
 
 BIOGRID_API_URL = "https://webservice.thebiogrid.org/interactions/"
 BIOGRID_VERSION = "4.4.235"  # Update with latest version
 BIOGRID_FILE_URL = f"https://downloads.thebiogrid.org/Download/BioGRID/Release-Archive/BIOGRID-{BIOGRID_VERSION}/BIOGRID-ORGANISM-Homo_sapiens-{BIOGRID_VERSION}.tab3.txt"
+INDEX_SOURCE = "biogrid-human-physical"
+CONFIDENCE_LEVELS = ['High', 'Medium', 'Low']
 
 def connect_to_database():
     """Connect to PostgreSQL database"""
@@ -116,8 +125,16 @@ def load_biogrid_data(biogrid_file):
     """Load and parse BioGRID interactions"""
     print(f"\n=== LOADING BIOGRID DATA ===\n")
 
-    # Read BioGRID file (tab-separated)
-    df = pd.read_csv(biogrid_file, sep='\t', low_memory=False)
+    # Read BioGRID file (tab-separated), only the columns used for comparison
+    df = pd.read_csv(
+        biogrid_file,
+        sep='\t',
+        usecols=['Official Symbol Interactor A', 'Official Symbol Interactor B',
+                 'SWISS-PROT Accessions Interactor A', 'SWISS-PROT Accessions Interactor B',
+                 'Synonyms Interactor A', 'Synonyms Interactor B',
+                 'Experimental System', 'Pubmed ID'],
+        dtype=str
+    )
 
     print(f"Loaded {len(df)} BioGRID interactions")
 
@@ -140,104 +157,114 @@ def load_biogrid_data(biogrid_file):
 
     return df_physical
 
-def create_gene_mapping(biogrid_df):
-    """Create mapping between official symbols and BioGRID gene names"""
-    print("\n=== CREATING GENE NAME MAPPINGS ===\n")
-
-    # BioGRID uses official gene symbols
-    # Create a mapping: {gene_symbol: [uniprot_ids]}
-    gene_to_uniprot = defaultdict(set)
+def load_biogrid_mappings(biogrid_df, mapper):
+    """Load BioGRID gene symbol, synonym and UniProt mappings into the shared ID store"""
+    print("\n=== LOADING BIOGRID GENE MAPPINGS ===\n")
+
+    # Stack both interactors; tab3 uses '-' for missing and '|' between multiple values
+    genes = pd.concat([
+        biogrid_df[[f'Official Symbol Interactor {side}', f'SWISS-PROT Accessions Interactor {side}',
+                    f'Synonyms Interactor {side}']].set_axis(['gene', 'uniprot', 'synonyms'], axis=1)
+        for side in ('A', 'B')
+    ])
+    genes['uniprot'] = genes['uniprot'].str.split('|').str[0]
+    genes = genes.mask(genes == '-').dropna(subset=['gene']).drop_duplicates()
+
+    with_uniprot = genes.dropna(subset=['uniprot'])
+    aliases = with_uniprot.assign(alias=with_uniprot['synonyms'].str.split('|')).explode('alias')
+    aliases = aliases.dropna(subset=['alias'])
+
+    mapper.load_source('biogrid', BIOGRID_VERSION, [
+        ('gene', with_uniprot['gene'], 'uniprot', with_uniprot['uniprot']),
+        ('alias', with_uniprot['gene'], 'uniprot', with_uniprot['uniprot']),
+        ('alias', aliases['alias'], 'uniprot', aliases['uniprot']),
+        ('uniprot', with_uniprot['uniprot'], 'gene', with_uniprot['gene']),
+    ])
+
+def build_biogrid_index(biogrid_df, alias_index):
+    """Convert BioGRID physical interactions into a canonical UniProt pair index"""
+    # Official symbols and synonyms normalize to the same accession as our predictions
+    biogrid_df = biogrid_df.assign(
+        uniprot_a=alias_index.normalize(biogrid_df['Official Symbol Interactor A']),
+        uniprot_b=alias_index.normalize(biogrid_df['Official Symbol Interactor B'])
+    ).dropna(subset=['uniprot_a', 'uniprot_b'])
+    print(f"Normalized {len(biogrid_df)} physical interactions to canonical UniProt pairs")
+
+    return PairIndex.from_pairs(
+        biogrid_df['uniprot_a'],
+        biogrid_df['uniprot_b'],
+        evidence={
+            'method': biogrid_df['Experimental System'].fillna(''),
+            'pmid': biogrid_df['Pubmed ID'].fillna('')
+        },
+        meta={'source': INDEX_SOURCE, 'release': BIOGRID_VERSION, 'id_type': 'uniprot',
+              'mapping_release': alias_index.release}
+    )
 
-    # Add from BioGRID data
-    for _, row in biogrid_df.iterrows():
-        gene_a = row['Official Symbol Interactor A']
-        gene_b = row['Official Symbol Interactor B']
+def load_biogrid_index(mapper, rebuild=False):
+    """Load the BioGRID pair index, downloading and parsing the release only if needed"""
+    path = index_path(INDEX_SOURCE, BIOGRID_VERSION)
+
+    # Rebuilt when keyed by gene symbol (from before alias normalization) or normalized
+    # with an alias index from other mapping store releases
+    biogrid_index = PairIndex.load(path) if os.path.exists(path) and not rebuild else None
+    if (biogrid_index is not None and biogrid_index.meta.get('id_type') == 'uniprot'
+            and biogrid_index.meta.get('mapping_release') == mapping_release(store_releases(mapper))):
+        print(f"\n=== LOADING BIOGRID INDEX ===\n")
+        print(f"Loaded {path}")
+    else:
+        biogrid_file = download_biogrid_data()
+        biogrid_df = load_biogrid_data(biogrid_file)
+        load_biogrid_mappings(biogrid_df, mapper)
+        biogrid_index = build_biogrid_index(biogrid_df, load_alias_index(mapper))
+        biogrid_index.save(path)
+        print(f"Saved BioGRID index to {path}")
+
+    print(f"BioGRID: {len(biogrid_index)} unique protein pairs")
+    return biogrid_index
+
+def count_by_confidence(df, column):
+    """Number of rows per confidence level (High/Medium/Low, zero-filled)"""
+    if len(df) == 0:
+        return pd.Series(0, index=CONFIDENCE_LEVELS)
+    return df[column].value_counts().reindex(CONFIDENCE_LEVELS, fill_value=0)
+
+def compare_with_biogrid(our_df, biogrid_index, alias_index):
+    """Compare our predictions with BioGRID experimental data"""
+    print("\n=== COMPARING WITH BIOGRID ===\n")
 
-        # BioGRID doesn't directly provide UniProt IDs in standard download
-        # We'll match by gene symbols
-        gene_to_uniprot[gene_a].add(gene_a)
-        gene_to_uniprot[gene_b].add(gene_b)
+    # Join predictions to BioGRID on order-independent canonical UniProt pair keys
+    our_keyed = our_df.assign(pair_key=biogrid_index.encode(
+        alias_index.canonical(our_df['bait_uniprot'], our_df['bait_gene']),
+        alias_index.canonical(our_df['prey_uniprot'], our_df['prey_gene'])
+    ))
+    merged = our_keyed.merge(biogrid_index.frame()[['pair_key', 'position']], on='pair_key', how='left')
+    in_biogrid = merged['position'].notna()
 
-    print(f"Created mappings for {len(gene_to_uniprot)} genes")
-    return dict(gene_to_uniprot)
+    merged = merged.rename(columns={'id': 'interaction_id', 'ipsae_confidence': 'confidence'})
+    columns = ['interaction_id', 'bait_gene', 'prey_gene', 'ipsae', 'confidence']
 
-def compare_with_biogrid(our_df, biogrid_df):
-    """Compare our predictions with BioGRID experimental data"""
-    print("\n=== COMPARING WITH BIOGRID ===\n")
+    # Aggregate experimental methods and PMIDs per matched BioGRID pair
+    validated_df = merged.loc[in_biogrid, columns + ['position']].reset_index(drop=True)
+    positions = validated_df['position'].astype('int64')
+    validated_df['biogrid_methods'] = positions.map(biogrid_index.aggregate_evidence(positions, 'method'))
+    validated_df['biogrid_pmids'] = positions.map(biogrid_index.aggregate_evidence(positions, 'pmid'))
+    validated_df = validated_df.drop(columns='position')
 
-    # Create set of BioGRID interactions (gene symbol pairs, bidirectional)
-    biogrid_pairs = set()
-    biogrid_details = {}  # Store experimental method info
-
-    for _, row in biogrid_df.iterrows():
-        gene_a = row['Official Symbol Interactor A']
-        gene_b = row['Official Symbol Interactor B']
-
-        # Add both directions (interaction is symmetric)
-        pair_1 = tuple(sorted([gene_a, gene_b]))
-        biogrid_pairs.add(pair_1)
-
-        # Store experimental method
-        if pair_1 not in biogrid_details:
-            biogrid_details[pair_1] = {
-                'methods': set(),
-                'pmids': set()
-            }
-        biogrid_details[pair_1]['methods'].add(row['Experimental System'])
-        biogrid_details[pair_1]['pmids'].add(row['Pubmed ID'])
-
-    print(f"BioGRID: {len(biogrid_pairs)} unique protein pairs")
-
-    # Compare our predictions
-    validated = []
-    novel = []
-
-    for _, row in our_df.iterrows():
-        bait_gene = row['bait_gene']
-        prey_gene = row['prey_gene']
-
-        if not bait_gene or not prey_gene:
-            continue
-
-        # Check if this pair is in BioGRID (order-independent)
-        pair = tuple(sorted([bait_gene, prey_gene]))
-
-        if pair in biogrid_pairs:
-            # Validated!
-            validated.append({
-                'interaction_id': row['id'],
-                'bait_gene': bait_gene,
-                'prey_gene': prey_gene,
-                'ipsae': row['ipsae'],
-                'confidence': row['ipsae_confidence'],
-                'biogrid_methods': ', '.join(biogrid_details[pair]['methods']),
-                'biogrid_pmids': ', '.join(str(p) for p in biogrid_details[pair]['pmids'])
-            })
-        else:
-            # Novel prediction (not in BioGRID experimental)
-            novel.append({
-                'interaction_id': row['id'],
-                'bait_gene': bait_gene,
-                'prey_gene': prey_gene,
-                'ipsae': row['ipsae'],
-                'confidence': row['ipsae_confidence']
-            })
-
-    validated_df = pd.DataFrame(validated)
-    novel_df = pd.DataFrame(novel)
+    novel_df = merged.loc[~in_biogrid, columns].reset_index(drop=True)
 
     print(f"\nResults:")
-    print(f"  Validated (in BioGRID): {len(validated)} ({len(validated)/len(our_df)*100:.1f}%)")
-    print(f"  Novel (not in BioGRID): {len(novel)} ({len(novel)/len(our_df)*100:.1f}%)")
+    print(f"  Validated (in BioGRID): {len(validated_df)} ({len(validated_df)/len(our_df)*100:.1f}%)")
+    print(f"  Novel (not in BioGRID): {len(novel_df)} ({len(novel_df)/len(our_df)*100:.1f}%)")
 
     # Breakdown by confidence
-    if len(validated) > 0:
+    if len(validated_df) > 0:
         print(f"\nValidated by confidence:")
-        for conf in ['High', 'Medium', 'Low']:
-            count = len(validated_df[validated_df['confidence'] == conf])
-            total = len(our_df[our_df['ipsae_confidence'] == conf])
-            if total > 0:
-                print(f"  {conf}: {count}/{total} ({count/total*100:.1f}%)")
+        counts = count_by_confidence(validated_df, 'confidence')
+        totals = count_by_confidence(our_df, 'ipsae_confidence')
+        for conf in CONFIDENCE_LEVELS:
+            if totals[conf] > 0:
+                print(f"  {conf}: {counts[conf]}/{totals[conf]} ({counts[conf]/totals[conf]*100:.1f}%)")
 
     return validated_df, novel_df
 
@@ -253,9 +280,12 @@ def generate_summary_stats(our_df, validated_df, novel_df):
         'by_confidence': {}
     }
 
-    for conf in ['High', 'Medium', 'Low']:
-        total = len(our_df[our_df['ipsae_confidence'] == conf])
-        validated = len(validated_df[validated_df['confidence'] == conf]) if len(validated_df) > 0 else 0
+    totals = count_by_confidence(our_df, 'ipsae_confidence')
+    validated_counts = count_by_confidence(validated_df, 'confidence')
+
+    for conf in CONFIDENCE_LEVELS:
+        total = int(totals[conf])
+        validated = int(validated_counts[conf])
 
         summary['by_confidence'][conf] = {
             'total': total,
@@ -277,18 +307,33 @@ def export_venn_diagram_data(our_df, validated_df):
     """Export data for Venn diagram visualization"""
     print("\n=== GENERATING VENN DIAGRAM DATA ===\n")
 
+    high_total = int(count_by_confidence(our_df, 'ipsae_confidence')['High'])
+    high_validated = int(count_by_confidence(validated_df, 'confidence')['High'])
+
     venn_data = {
         'our_predictions_total': len(our_df),
         'validated_in_biogrid': len(validated_df),
         'novel_predictions': len(our_df) - len(validated_df),
-        'high_confidence_validated': len(validated_df[validated_df['confidence'] == 'High']) if len(validated_df) > 0 else 0,
-        'high_confidence_novel': len(our_df[(our_df['ipsae_confidence'] == 'High')]) - len(validated_df[validated_df['confidence'] == 'High']) if len(validated_df) > 0 else len(our_df[(our_df['ipsae_confidence'] == 'High')])
+        'high_confidence_validated': high_validated,
+        'high_confidence_novel': high_total - high_validated
     }
 
     return venn_data
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Compare predictions with BioGRID')
+    parser.add_argument('--build-index', action='store_true',
+                        help='(Re)build the BioGRID pair index from the release download and exit')
+    args = parser.parse_args()
+
+    if args.build_index:
+        os.makedirs('data/external', exist_ok=True)
+        mapper = get_mapper()
+        load_biogrid_index(mapper, rebuild=True)
+        mapper.close()
+        return
+
     print("Starting BioGRID comparison analysis...")
 
     # Create output directories
@@ -299,14 +344,14 @@ def main():
     # 1. Load our predictions
     our_df = load_our_interactions()
 
-    # 2. Download BioGRID data
-    biogrid_file = download_biogrid_data()
-
-    # 3. Load BioGRID data
-    biogrid_df = load_biogrid_data(biogrid_file)
+    # 2-3. Load BioGRID pair index (downloads and parses the release on first run)
+    mapper = get_mapper()
+    biogrid_index = load_biogrid_index(mapper)
+    alias_index = load_alias_index(mapper)
+    mapper.close()
 
     # 4. Compare with BioGRID
-    validated_df, novel_df = compare_with_biogrid(our_df, biogrid_df)
+    validated_df, novel_df = compare_with_biogrid(our_df, biogrid_index, alias_index)
 
     # 5. Generate summary statistics
     summary = generate_summary_stats(our_df, validated_df, novel_df)
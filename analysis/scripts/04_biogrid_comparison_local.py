@@ -16,80 +16,123 @@ Requirements:
 
 Usage:
   python analysis/scripts/04_biogrid_comparison_local.py
+
+  # Parse the MITAB file once per release into data/external/index/
+  python analysis/scripts/04_biogrid_comparison_local.py --build-index
 """
 
 import os
+import argparse
 import pandas as pd
-from collections import defaultdict
+
+from pair_index import PairIndex, index_path
 
 # File paths
 BIOGRID_FILE = "BIOGRID-ALL-5.0.251.mitab.txt"
+BIOGRID_VERSION = "5.0.251"
 OUR_INTERACTIONS_CSV = "analysis/results/supplementary_table_S1_all_interactions.csv"
 RESULTS_DIR = "analysis/results"
+INDEX_SOURCE = "biogrid-mitab"
+
+# MITAB loading: only ID, Alt ID, method, publication and taxid columns are needed
+MITAB_COLUMNS = [0, 1, 2, 3, 6, 8, 9, 10]
+CHUNK_SIZE = 500_000  # rows per chunk
+MITAB_UNIPROT_PATTERN = r'(?:uniprot/swiss-prot|uniprotkb):([^|(]+)'
+MITAB_METHOD_PATTERN = r'\(([^)]*)\)'
+MITAB_PMID_PATTERN = r'pubmed:(\d+)'
 
-def parse_mitab_id(id_string):
-    """Extract UniProt ID from MITAB ID field"""
+def extract_mitab_uniprot(id_series):
+    """Extract UniProt IDs from a column of MITAB ID fields (vectorized)"""
     # MITAB format can have: uniprot/swiss-prot:P12345 or uniprotkb:P12345
     # Alt IDs are pipe-separated: biogrid:112315|entrez gene/locuslink:MAP2K4|uniprot/swiss-prot:P45985
-    if not isinstance(id_string, str):
-        return None
-
-    # Split by pipe to get all IDs
-    id_parts = id_string.split('|')
-
-    for part in id_parts:
-        # Look for uniprot/swiss-prot: or uniprotkb:
-        if 'uniprot/swiss-prot:' in part:
-            uniprot = part.split('uniprot/swiss-prot:')[1].split('|')[0].split('(')[0].strip()
-            return uniprot
-        elif 'uniprotkb:' in part:
-            uniprot = part.split('uniprotkb:')[1].split('|')[0].split('(')[0].strip()
-            return uniprot
-
-    return None
+    # The first UniProt entry in the field wins; missing values stay NaN
+    return id_series.str.extract(MITAB_UNIPROT_PATTERN, expand=False).str.strip()
 
 def load_biogrid_human_interactions():
-    """Load BioGRID data and extract human protein interactions"""
+    """Load BioGRID data and extract human protein interactions (one row per evidence)"""
     print("\n=== LOADING BIOGRID DATA ===\n")
     print(f"Reading: {BIOGRID_FILE}")
 
-    # Read MITAB file (tab-separated)
-    # Columns: ID_A, ID_B, AltIDs_A, AltIDs_B, Aliases_A, Aliases_B, ...
-    df = pd.read_csv(BIOGRID_FILE, sep='\t', low_memory=False)
-
-    print(f"Total BioGRID interactions: {len(df):,}")
-
-    # Filter for human-human interactions (taxid:9606)
-    # Column indices (0-based): taxid interactor A is column 9, taxid interactor B is column 10
-    human_df = df[
-        (df.iloc[:, 9].astype(str).str.contains('taxid:9606')) &
-        (df.iloc[:, 10].astype(str).str.contains('taxid:9606'))
-    ].copy()
-
-    print(f"Human-human interactions: {len(human_df):,}")
-
-    # Extract UniProt IDs from ID columns (columns 0 and 1) and Alt IDs (columns 2 and 3)
-    interactions = defaultdict(int)
-
-    for idx, row in human_df.iterrows():
-        # UniProt IDs are usually in Alt IDs columns (2 and 3)
-        uniprot_a = parse_mitab_id(str(row.iloc[2]))
-        uniprot_b = parse_mitab_id(str(row.iloc[3]))
-
-        # Also try main IDs if Alt IDs didn't work
-        if not uniprot_a:
-            uniprot_a = parse_mitab_id(str(row.iloc[0]))
-        if not uniprot_b:
-            uniprot_b = parse_mitab_id(str(row.iloc[1]))
-
-        if uniprot_a and uniprot_b:
-            # Create sorted tuple for undirected comparison
-            pair = tuple(sorted([uniprot_a, uniprot_b]))
-            interactions[pair] += 1
-
-    print(f"Unique human protein pairs with UniProt IDs: {len(interactions):,}")
-
-    return interactions
+    # Read MITAB file (tab-separated) in chunks, keeping only the columns we need
+    # Columns (0-based): 0/1 = ID A/B, 2/3 = Alt IDs A/B, 6 = detection method,
+    # 8 = publication IDs, 9/10 = taxid A/B
+    reader = pd.read_csv(
+        BIOGRID_FILE,
+        sep='\t',
+        usecols=MITAB_COLUMNS,
+        dtype=str,
+        chunksize=CHUNK_SIZE
+    )
+
+    total_rows = 0
+    human_rows = 0
+    evidence_chunks = []
+
+    for chunk in reader:
+        total_rows += len(chunk)
+
+        # Columns come back in file order
+        id_a, id_b, alt_a, alt_b, method, publication, taxid_a, taxid_b = (
+            chunk.iloc[:, i] for i in range(len(MITAB_COLUMNS))
+        )
+
+        # Filter for human-human interactions (taxid:9606) during the scan
+        is_human = (
+            taxid_a.str.contains('taxid:9606', regex=False, na=False) &
+            taxid_b.str.contains('taxid:9606', regex=False, na=False)
+        )
+        if not is_human.any():
+            continue
+        human_rows += int(is_human.sum())
+
+        # UniProt IDs are usually in Alt IDs columns, fall back to main IDs
+        uniprot_a = extract_mitab_uniprot(alt_a[is_human]).fillna(extract_mitab_uniprot(id_a[is_human]))
+        uniprot_b = extract_mitab_uniprot(alt_b[is_human]).fillna(extract_mitab_uniprot(id_b[is_human]))
+
+        mapped = uniprot_a.notna() & uniprot_b.notna()
+        evidence_chunks.append(pd.DataFrame({
+            'uniprot_a': uniprot_a[mapped],
+            'uniprot_b': uniprot_b[mapped],
+            'method': method[is_human][mapped].str.extract(MITAB_METHOD_PATTERN, expand=False).fillna(''),
+            'pmid': publication[is_human][mapped].str.extract(MITAB_PMID_PATTERN, expand=False).fillna('')
+        }))
+
+    print(f"Total BioGRID interactions: {total_rows:,}")
+    print(f"Human-human interactions: {human_rows:,}")
+
+    if evidence_chunks:
+        evidence_df = pd.concat(evidence_chunks, ignore_index=True)
+    else:
+        evidence_df = pd.DataFrame(columns=['uniprot_a', 'uniprot_b', 'method', 'pmid'])
+
+    print(f"Human interactions with UniProt IDs: {len(evidence_df):,}")
+
+    return evidence_df
+
+def build_biogrid_index(evidence_df):
+    """Convert BioGRID evidence rows into a pair index"""
+    return PairIndex.from_pairs(
+        evidence_df['uniprot_a'],
+        evidence_df['uniprot_b'],
+        evidence={'method': evidence_df['method'], 'pmid': evidence_df['pmid']},
+        meta={'source': INDEX_SOURCE, 'release': BIOGRID_VERSION, 'id_type': 'uniprot'}
+    )
+
+def load_biogrid_index(rebuild=False):
+    """Load the BioGRID pair index, parsing the raw MITAB file only if needed"""
+    path = index_path(INDEX_SOURCE, BIOGRID_VERSION)
+
+    if os.path.exists(path) and not rebuild:
+        print(f"\n=== LOADING BIOGRID INDEX ===\n")
+        biogrid_index = PairIndex.load(path)
+        print(f"Loaded {path}")
+    else:
+        biogrid_index = build_biogrid_index(load_biogrid_human_interactions())
+        biogrid_index.save(path)
+        print(f"✓ Saved BioGRID index: {path}")
+
+    print(f"Unique human protein pairs with UniProt IDs: {len(biogrid_index):,}")
+    return biogrid_index
 
 def load_our_interactions():
     """Load our predicted interactions from CSV"""
@@ -110,46 +153,43 @@ def load_our_interactions():
     print(f"Our predictions: {len(df):,}")
     return df
 
-def compare_with_biogrid(our_df, biogrid_interactions):
+def count_without_uniprot(our_df):
+    """Predictions missing a bait or prey UniProt ID (never matched, counted as novel)"""
+    return int(our_df[['bait_uniprot', 'prey_uniprot']].isna().any(axis=1).sum())
+
+def compare_with_biogrid(our_df, biogrid_index):
     """Compare our predictions with BioGRID"""
     print("\n=== COMPARING WITH BIOGRID ===\n")
 
-    validated = []
-    novel = []
-
-    for idx, row in our_df.iterrows():
-        bait_uniprot = row['bait_uniprot']
-        prey_uniprot = row['prey_uniprot']
-
-        # Create sorted pair for comparison
-        pair = tuple(sorted([bait_uniprot, prey_uniprot]))
-
-        if pair in biogrid_interactions:
-            detect_count = biogrid_interactions[pair]
-            validated.append({
-                'bait_gene': row['bait_gene'],
-                'bait_uniprot': bait_uniprot,
-                'prey_gene': row['prey_gene'],
-                'prey_uniprot': prey_uniprot,
-                'ipsae': row['ipsae'],
-                'confidence': row['ipsae_confidence'],
-                'biogrid_detect_count': detect_count
-            })
-        else:
-            novel.append({
-                'bait_gene': row['bait_gene'],
-                'bait_uniprot': bait_uniprot,
-                'prey_gene': row['prey_gene'],
-                'prey_uniprot': prey_uniprot,
-                'ipsae': row['ipsae'],
-                'confidence': row['ipsae_confidence']
-            })
-
-    validated_df = pd.DataFrame(validated)
-    novel_df = pd.DataFrame(novel)
-
-    print(f"Validated by BioGRID: {len(validated_df)} ({len(validated_df)/len(our_df)*100:.1f}%)")
-    print(f"Novel predictions: {len(novel_df)} ({len(novel_df)/len(our_df)*100:.1f}%)")
+    # Join predictions to BioGRID on order-independent pair keys
+    our_keyed = our_df.assign(
+        pair_key=biogrid_index.encode(our_df['bait_uniprot'], our_df['prey_uniprot'])
+    )
+    reference = biogrid_index.frame()[['pair_key', 'evidence_count']]
+    merged = our_keyed.merge(reference, on='pair_key', how='left')
+    in_biogrid = merged['evidence_count'].notna()
+
+    merged = merged.rename(columns={
+        'ipsae_confidence': 'confidence',
+        'evidence_count': 'biogrid_detect_count'
+    })
+    columns = ['bait_gene', 'bait_uniprot', 'prey_gene', 'prey_uniprot', 'ipsae', 'confidence']
+
+    validated_df = merged.loc[in_biogrid, columns + ['biogrid_detect_count']].reset_index(drop=True)
+    validated_df['biogrid_detect_count'] = validated_df['biogrid_detect_count'].astype(int)
+    novel_df = merged.loc[~in_biogrid, columns].reset_index(drop=True)
+
+    # Percentages are over every prediction in the CSV, as in the original report;
+    # predictions without UniProt IDs cannot match and count as novel
+    total = len(our_df)
+    if len(validated_df) + len(novel_df) != total:
+        raise ValueError(f"BioGRID join returned {len(validated_df) + len(novel_df)} rows for {total} predictions")
+
+    print(f"Validated by BioGRID: {len(validated_df)}/{total} ({len(validated_df)/total*100:.1f}% of all predictions)")
+    print(f"Novel predictions: {len(novel_df)}/{total} ({len(novel_df)/total*100:.1f}% of all predictions)")
+    unmapped = count_without_uniprot(our_df)
+    if unmapped:
+        print(f"  (includes {unmapped} predictions without UniProt IDs)")
 
     return validated_df, novel_df
 
@@ -157,46 +197,50 @@ def analyze_by_confidence(our_df, validated_df):
     """Analyze validation rates by confidence level"""
     print("\n=== VALIDATION BY CONFIDENCE LEVEL ===\n")
 
-    results = []
-
-    for conf in ['High', 'Medium', 'Low']:
-        total = len(our_df[our_df['ipsae_confidence'] == conf])
-        if len(validated_df) > 0:
-            validated = len(validated_df[validated_df['confidence'] == conf])
-        else:
-            validated = 0
+    levels = ['High', 'Medium', 'Low']
+    totals = our_df['ipsae_confidence'].value_counts().reindex(levels, fill_value=0)
+    if len(validated_df) > 0:
+        validated = validated_df['confidence'].value_counts().reindex(levels, fill_value=0)
+    else:
+        validated = pd.Series(0, index=levels)
+
+    results = pd.DataFrame({
+        'confidence': levels,
+        'total_predictions': totals.to_numpy(),
+        'biogrid_validated': validated.to_numpy()
+    })
+    rates = results['biogrid_validated'] / results['total_predictions'].where(results['total_predictions'] > 0) * 100
+    results['validation_rate_pct'] = rates.fillna(0).round(1)
 
-        if total > 0:
-            pct = (validated / total) * 100
-        else:
-            pct = 0
+    for _, row in results.iterrows():
+        print(f"{row['confidence']}: {row['biogrid_validated']}/{row['total_predictions']} validated ({row['validation_rate_pct']:.1f}%)")
 
-        results.append({
-            'confidence': conf,
-            'total_predictions': total,
-            'biogrid_validated': validated,
-            'validation_rate_pct': round(pct, 1)
-        })
+    return results
 
-        print(f"{conf}: {validated}/{total} validated ({pct:.1f}%)")
+def main():
+    parser = argparse.ArgumentParser(description='Compare predictions with local BioGRID MITAB release')
+    parser.add_argument('--build-index', action='store_true',
+                        help='(Re)build the BioGRID pair index from the MITAB file and exit')
+    args = parser.parse_args()
 
-    return pd.DataFrame(results)
+    if args.build_index:
+        load_biogrid_index(rebuild=True)
+        return
 
-def main():
     print("="*70)
     print("BIOGRID COMPARISON ANALYSIS (Local File)")
-    print("BioGRID Version: 5.0.251")
+    print(f"BioGRID Version: {BIOGRID_VERSION}")
     print("="*70)
 
     # Ensure results directory exists
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
     # Load data
-    biogrid_interactions = load_biogrid_human_interactions()
+    biogrid_index = load_biogrid_index()
     our_df = load_our_interactions()
 
     # Compare
-    validated_df, novel_df = compare_with_biogrid(our_df, biogrid_interactions)
+    validated_df, novel_df = compare_with_biogrid(our_df, biogrid_index)
 
     # Analyze by confidence
     confidence_stats = analyze_by_confidence(our_df, validated_df)
@@ -224,15 +268,16 @@ def main():
     with open(summary_path, 'w') as f:
         f.write("BioGRID Comparison Summary\n")
         f.write("="*70 + "\n\n")
-        f.write(f"BioGRID Version: 5.0.251\n")
+        f.write(f"BioGRID Version: {BIOGRID_VERSION}\n")
         f.write(f"Date: {pd.Timestamp.now().strftime('%Y-%m-%d')}\n\n")
 
         f.write("Overall Statistics:\n")
-        f.write(f"  Total predictions: {len(our_df)}\n")
+        f.write(f"  Total predictions: {len(our_df)} (denominator of all percentages: every row of {OUR_INTERACTIONS_CSV})\n")
         f.write(f"  BioGRID validated: {len(validated_df)} ({len(validated_df)/len(our_df)*100:.1f}%)\n")
-        f.write(f"  Novel predictions: {len(novel_df)} ({len(novel_df)/len(our_df)*100:.1f}%)\n\n")
+        f.write(f"  Novel predictions: {len(novel_df)} ({len(novel_df)/len(our_df)*100:.1f}%)\n")
+        f.write(f"  Without UniProt IDs (counted as novel): {count_without_uniprot(our_df)}\n\n")
 
-        f.write("Validation by Confidence Level:\n")
+        f.write("Validation by Confidence Level (validated / all predictions of that level):\n")
         for _, row in confidence_stats.iterrows():
             f.write(f"  {row['confidence']}: {row['biogrid_validated']}/{row['total_predictions']} ")
             f.write(f"({row['validation_rate_pct']:.1f}%)\n")
@@ -17,6 +17,15 @@ Usage:
   export POSTGRES_URL="postgresql://..."
   python analysis/scripts/05_string_comparison.py
 
+  # Parse the STRING download once per release into data/external/index/
+  python analysis/scripts/05_string_comparison.py --build-index
+
+  # Stream only links between our proteins (no release index; works with the
+  # full multi-species protein.links file; --links-file implies
+  # --restrict-to-predictions and skips the human links download)
+  python analysis/scripts/05_string_comparison.py --restrict-to-predictions \
+      --links-file data/external/protein.links.v12.0.txt.gz
+
 STRING Data:
   Downloads human protein links from STRING database
   URL: https://stringdb-downloads.org/download/protein.links.v12.0/9606.protein.links.v12.0.txt.gz
@@ -24,13 +33,18 @@ STRING Data:
 
 import os
 import json
-import gzip
+import argparse
+import numpy as np
 import pandas as pd
 import psycopg2
 from urllib.parse import urlparse
 import requests
 from collections import defaultdict
 
+from pair_index import PairIndex, index_path
+from id_mapping import get_mapper
+from alias_index import load_alias_index, store_releases, mapping_release
+
 STRING_VERSION = "12.0"
 STRING_URL = f"https://stringdb-downloads.org/download/protein.links.v{STRING_VERSION}/9606.protein.links.v{STRING_VERSION}.txt.gz"
 STRING_INFO_URL = f"https://stringdb-downloads.org/download/protein.info.v{STRING_VERSION}/9606.protein.info.v{STRING_VERSION}.txt.gz"
@@ -39,6 +53,10 @@ STRING_INFO_URL = f"https://stringdb-downloads.org/download/protein.info.v{STRIN
 STRING_HIGH_CONFIDENCE = 700  # High confidence
 STRING_MEDIUM_CONFIDENCE = 400  # Medium confidence
 
+INDEX_SOURCE = "string-human-medium"
+CHUNK_SIZE = 1_000_000  # links per chunk when streaming the gzipped file
+CONFIDENCE_LEVELS = ['High', 'Medium', 'Low']
+
 def connect_to_database():
     """Connect to PostgreSQL database"""
     database_url = os.environ.get('POSTGRES_URL')
@@ -86,24 +104,29 @@ def load_our_interactions():
     print(f"Loaded {len(df)} predictions from our database")
     return df
 
-def download_string_data(output_dir='data/external'):
-    """Download STRING protein links and info"""
+def download_string_data(output_dir='data/external', links_file=None):
+    """Download STRING protein links (unless a links file is given) and info"""
     print("\n=== DOWNLOADING STRING DATA ===\n")
 
     os.makedirs(output_dir, exist_ok=True)
 
-    # Download protein links
-    links_file = os.path.join(output_dir, f'9606.protein.links.v{STRING_VERSION}.txt.gz')
-    if not os.path.exists(links_file):
-        print(f"Downloading STRING links from: {STRING_URL}")
-        response = requests.get(STRING_URL, stream=True)
-        response.raise_for_status()
-        with open(links_file, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        print(f"Downloaded to: {links_file}")
+    # Download protein links (a supplied links file is used as is)
+    if links_file is not None:
+        if not os.path.exists(links_file):
+            raise FileNotFoundError(f"STRING links file not found: {links_file}")
+        print(f"Using STRING links file: {links_file}")
     else:
-        print(f"STRING links file already exists: {links_file}")
+        links_file = os.path.join(output_dir, f'9606.protein.links.v{STRING_VERSION}.txt.gz')
+        if not os.path.exists(links_file):
+            print(f"Downloading STRING links from: {STRING_URL}")
+            response = requests.get(STRING_URL, stream=True)
+            response.raise_for_status()
+            with open(links_file, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+            print(f"Downloaded to: {links_file}")
+        else:
+            print(f"STRING links file already exists: {links_file}")
 
     # Download protein info (for gene name mapping)
     info_file = os.path.join(output_dir, f'9606.protein.info.v{STRING_VERSION}.txt.gz')
@@ -120,125 +143,185 @@ def download_string_data(output_dir='data/external'):
 
     return links_file, info_file
 
-def load_string_protein_info(info_file):
-    """Load STRING protein info for gene name mapping"""
+def load_string_protein_info(info_file, mapper):
+    """Load STRING protein info into the shared ID mapping store (once per release)"""
     print("\n=== LOADING STRING PROTEIN INFO ===\n")
 
-    # Read gzipped file
-    with gzip.open(info_file, 'rt') as f:
-        df = pd.read_csv(f, sep='\t')
+    if mapper.has_release('string', STRING_VERSION):
+        print(f"Using STRING {STRING_VERSION} gene mappings from {mapper.path}")
+        return
+
+    df = pd.read_csv(info_file, sep='\t', compression='gzip',
+                     usecols=['protein_external_id', 'preferred_name'], dtype=str)
 
     print(f"Loaded info for {len(df)} proteins")
 
-    # Create mapping: gene name -> STRING protein ID
-    gene_to_string = {}
-    for _, row in df.iterrows():
-        gene_name = row['preferred_name']
-        string_id = row['protein_external_id']
-        gene_to_string[gene_name] = string_id
+    # gene name <-> STRING protein ID
+    mapper.load_source('string', STRING_VERSION, [
+        ('gene', df['preferred_name'], 'string', df['protein_external_id']),
+        ('alias', df['preferred_name'], 'string', df['protein_external_id']),
+        ('string', df['protein_external_id'], 'gene', df['preferred_name']),
+    ])
 
-    print(f"Created mappings for {len(gene_to_string)} genes")
-    return gene_to_string
+def iter_string_links(links_file, min_score=STRING_MEDIUM_CONFIDENCE, protein_ids=None):
+    """
+    Stream STRING links from the gzipped file, yielding filtered chunks.
+
+    Rows below min_score are dropped while reading; if protein_ids is given,
+    only links between two of those STRING IDs are kept. Works for both the
+    per-species and the full multi-species protein.links files.
+    """
+    reader = pd.read_csv(
+        links_file,
+        sep=' ',
+        compression='gzip',
+        usecols=['protein1', 'protein2', 'combined_score'],
+        dtype={'protein1': str, 'protein2': str, 'combined_score': 'int32'},
+        chunksize=CHUNK_SIZE
+    )
+
+    for chunk in reader:
+        keep = chunk['combined_score'] >= min_score
+        if protein_ids is not None:
+            keep &= chunk['protein1'].isin(protein_ids) & chunk['protein2'].isin(protein_ids)
+        yield len(chunk), chunk[keep]
 
-def load_string_links(links_file, gene_to_string):
-    """Load STRING protein links"""
+def load_string_links(links_file, string_to_uniprot, protein_ids=None):
+    """Load STRING protein links (streamed, filtered by score and optionally by protein)"""
     print("\n=== LOADING STRING LINKS ===\n")
 
-    # Read gzipped file
-    with gzip.open(links_file, 'rt') as f:
-        df = pd.read_csv(f, sep=' ')
+    total_rows = 0
+    chunks = []
+    for chunk_rows, chunk in iter_string_links(links_file, protein_ids=protein_ids):
+        total_rows += chunk_rows
+        chunks.append(chunk)
 
-    print(f"Loaded {len(df)} STRING interactions")
+    print(f"Scanned {total_rows} STRING interactions")
 
-    # Filter for medium confidence or higher
-    df_filtered = df[df['combined_score'] >= STRING_MEDIUM_CONFIDENCE]
-    print(f"Filtered to {len(df_filtered)} medium+ confidence interactions (score >= {STRING_MEDIUM_CONFIDENCE})")
+    if chunks:
+        df_filtered = pd.concat(chunks, ignore_index=True)
+    else:
+        df_filtered = pd.DataFrame(columns=['protein1', 'protein2', 'combined_score'])
 
-    # Convert STRING IDs to gene names
-    string_to_gene = {v: k for k, v in gene_to_string.items()}
+    restriction = f", restricted to {len(protein_ids)} STRING IDs" if protein_ids is not None else ""
+    print(f"Filtered to {len(df_filtered)} medium+ confidence interactions (score >= {STRING_MEDIUM_CONFIDENCE}{restriction})")
 
-    # Add gene names
-    df_filtered['gene_a'] = df_filtered['protein1'].apply(lambda x: string_to_gene.get(x, None))
-    df_filtered['gene_b'] = df_filtered['protein2'].apply(lambda x: string_to_gene.get(x, None))
+    # Convert STRING IDs to canonical UniProt accessions
+    df_filtered['uniprot_a'] = df_filtered['protein1'].map(string_to_uniprot)
+    df_filtered['uniprot_b'] = df_filtered['protein2'].map(string_to_uniprot)
 
-    # Remove rows without gene name mapping
-    df_filtered = df_filtered.dropna(subset=['gene_a', 'gene_b'])
+    # Remove rows without a canonical accession
+    df_filtered = df_filtered.dropna(subset=['uniprot_a', 'uniprot_b'])
 
-    print(f"After gene name mapping: {len(df_filtered)} interactions")
+    print(f"After UniProt normalization: {len(df_filtered)} interactions")
 
     return df_filtered
 
-def compare_with_string(our_df, string_df):
+def get_string_to_uniprot(mapper, alias_index):
+    """STRING ID -> canonical UniProt accession via the preferred gene name"""
+    string_to_gene = pd.Series(mapper.mapping('string', 'gene', source='string'), dtype=object)
+    return alias_index.normalize(string_to_gene).dropna()
+
+def get_our_string_ids(our_df, string_to_uniprot, alias_index):
+    """STRING IDs for all bait and prey proteins in our predictions"""
+    our_uniprot = pd.concat([
+        alias_index.canonical(our_df['bait_uniprot'], our_df['bait_gene']),
+        alias_index.canonical(our_df['prey_uniprot'], our_df['prey_gene'])
+    ]).dropna().unique()
+    string_ids = set(string_to_uniprot.index[string_to_uniprot.isin(our_uniprot)])
+    print(f"Mapped {len(string_ids)} STRING IDs to {len(our_uniprot)} of our proteins")
+    return string_ids
+
+def load_string_for_predictions(our_df, links_file, info_file, mapper, alias_index):
+    """Build an in-memory STRING index restricted to proteins in our predictions"""
+    load_string_protein_info(info_file, mapper)
+    # Reloaded so symbols from a newly loaded STRING release are included
+    alias_index = load_alias_index(mapper)
+    string_to_uniprot = get_string_to_uniprot(mapper, alias_index)
+    string_ids = get_our_string_ids(our_df, string_to_uniprot, alias_index)
+    string_df = load_string_links(links_file, string_to_uniprot, protein_ids=string_ids)
+    string_index = build_string_index(string_df, alias_index)
+    print(f"STRING: {len(string_index)} unique protein pairs")
+    return string_index
+
+def build_string_index(string_df, alias_index):
+    """Convert filtered STRING links into a canonical UniProt pair index (max score per pair)"""
+    return PairIndex.from_pairs(
+        string_df['uniprot_a'],
+        string_df['uniprot_b'],
+        scores=string_df['combined_score'].to_numpy(),
+        meta={'source': INDEX_SOURCE, 'release': STRING_VERSION, 'id_type': 'uniprot',
+              'min_score': STRING_MEDIUM_CONFIDENCE, 'mapping_release': alias_index.release}
+    )
+
+def load_string_index(mapper, alias_index, rebuild=False):
+    """Load the STRING pair index, downloading and parsing the release only if needed"""
+    path = index_path(INDEX_SOURCE, STRING_VERSION)
+
+    # Rebuilt when keyed by gene symbol (from before alias normalization) or normalized
+    # with an alias index from other mapping store releases
+    string_index = PairIndex.load(path) if os.path.exists(path) and not rebuild else None
+    if (string_index is not None and string_index.meta.get('id_type') == 'uniprot'
+            and string_index.meta.get('mapping_release') == mapping_release(store_releases(mapper))):
+        print(f"\n=== LOADING STRING INDEX ===\n")
+        print(f"Loaded {path}")
+    else:
+        links_file, info_file = download_string_data()
+        load_string_protein_info(info_file, mapper)
+        # Reloaded so symbols from a newly loaded STRING release are included
+        alias_index = load_alias_index(mapper)
+        string_to_uniprot = get_string_to_uniprot(mapper, alias_index)
+        string_index = build_string_index(load_string_links(links_file, string_to_uniprot), alias_index)
+        string_index.save(path)
+        print(f"Saved STRING index to {path}")
+
+    print(f"STRING: {len(string_index)} unique protein pairs")
+    return string_index
+
+def count_by_confidence(df, column):
+    """Number of rows per confidence level (High/Medium/Low, zero-filled)"""
+    if len(df) == 0:
+        return pd.Series(0, index=CONFIDENCE_LEVELS)
+    return df[column].value_counts().reindex(CONFIDENCE_LEVELS, fill_value=0)
+
+def compare_with_string(our_df, string_index, alias_index):
     """Compare our predictions with STRING database"""
     print("\n=== COMPARING WITH STRING ===\n")
 
-    # Create set of STRING interactions (gene symbol pairs, bidirectional)
-    string_pairs = {}  # pair -> score
-
-    for _, row in string_df.iterrows():
-        gene_a = row['gene_a']
-        gene_b = row['gene_b']
-        score = row['combined_score']
-
-        # Store as sorted tuple (order-independent)
-        pair = tuple(sorted([gene_a, gene_b]))
-        string_pairs[pair] = max(string_pairs.get(pair, 0), score)  # Keep highest score
-
-    print(f"STRING: {len(string_pairs)} unique protein pairs")
-
-    # Compare our predictions
-    in_string = []
-    not_in_string = []
-
-    for _, row in our_df.iterrows():
-        bait_gene = row['bait_gene']
-        prey_gene = row['prey_gene']
-
-        if not bait_gene or not prey_gene:
-            continue
-
-        # Check if this pair is in STRING (order-independent)
-        pair = tuple(sorted([bait_gene, prey_gene]))
-
-        if pair in string_pairs:
-            # Found in STRING
-            string_score = string_pairs[pair]
-            string_conf = 'High' if string_score >= STRING_HIGH_CONFIDENCE else 'Medium'
-
-            in_string.append({
-                'interaction_id': row['id'],
-                'bait_gene': bait_gene,
-                'prey_gene': prey_gene,
-                'ipsae': row['ipsae'],
-                'our_confidence': row['ipsae_confidence'],
-                'string_score': string_score,
-                'string_confidence': string_conf
-            })
-        else:
-            # Not in STRING
-            not_in_string.append({
-                'interaction_id': row['id'],
-                'bait_gene': bait_gene,
-                'prey_gene': prey_gene,
-                'ipsae': row['ipsae'],
-                'our_confidence': row['ipsae_confidence']
-            })
-
-    in_string_df = pd.DataFrame(in_string)
-    not_in_string_df = pd.DataFrame(not_in_string)
+    # Join predictions to STRING on order-independent canonical UniProt pair keys
+    our_keyed = our_df.assign(pair_key=string_index.encode(
+        alias_index.canonical(our_df['bait_uniprot'], our_df['bait_gene']),
+        alias_index.canonical(our_df['prey_uniprot'], our_df['prey_gene'])
+    ))
+    merged = our_keyed.merge(string_index.frame()[['pair_key', 'score']], on='pair_key', how='left')
+    found = merged['score'].notna()
+
+    merged = merged.rename(columns={
+        'id': 'interaction_id',
+        'ipsae_confidence': 'our_confidence',
+        'score': 'string_score'
+    })
+    columns = ['interaction_id', 'bait_gene', 'prey_gene', 'ipsae', 'our_confidence']
+
+    in_string_df = merged.loc[found, columns + ['string_score']].reset_index(drop=True)
+    in_string_df['string_score'] = in_string_df['string_score'].astype(int)
+    in_string_df['string_confidence'] = np.where(
+        in_string_df['string_score'] >= STRING_HIGH_CONFIDENCE, 'High', 'Medium'
+    )
+    not_in_string_df = merged.loc[~found, columns].reset_index(drop=True)
 
     print(f"\nResults:")
-    print(f"  In STRING: {len(in_string)} ({len(in_string)/len(our_df)*100:.1f}%)")
-    print(f"  Not in STRING: {len(not_in_string)} ({len(not_in_string)/len(our_df)*100:.1f}%)")
+    print(f"  In STRING: {len(in_string_df)} ({len(in_string_df)/len(our_df)*100:.1f}%)")
+    print(f"  Not in STRING: {len(not_in_string_df)} ({len(not_in_string_df)/len(our_df)*100:.1f}%)")
 
     # Breakdown by confidence
-    if len(in_string) > 0:
+    if len(in_string_df) > 0:
         print(f"\nIn STRING by our confidence:")
-        for conf in ['High', 'Medium', 'Low']:
-            count = len(in_string_df[in_string_df['our_confidence'] == conf])
-            total = len(our_df[our_df['ipsae_confidence'] == conf])
-            if total > 0:
-                print(f"  {conf}: {count}/{total} ({count/total*100:.1f}%)")
+        counts = count_by_confidence(in_string_df, 'our_confidence')
+        totals = count_by_confidence(our_df, 'ipsae_confidence')
+        for conf in CONFIDENCE_LEVELS:
+            if totals[conf] > 0:
+                print(f"  {conf}: {counts[conf]}/{totals[conf]} ({counts[conf]/totals[conf]*100:.1f}%)")
 
     return in_string_df, not_in_string_df
 
@@ -271,9 +354,12 @@ def generate_summary_stats(our_df, in_string_df, not_in_string_df):
         'by_confidence': {}
     }
 
-    for conf in ['High', 'Medium', 'Low']:
-        total = len(our_df[our_df['ipsae_confidence'] == conf])
-        in_string = len(in_string_df[in_string_df['our_confidence'] == conf]) if len(in_string_df) > 0 else 0
+    totals = count_by_confidence(our_df, 'ipsae_confidence')
+    in_string_counts = count_by_confidence(in_string_df, 'our_confidence')
+
+    for conf in CONFIDENCE_LEVELS:
+        total = int(totals[conf])
+        in_string = int(in_string_counts[conf])
 
         summary['by_confidence'][conf] = {
             'total': total,
@@ -293,6 +379,29 @@ def generate_summary_stats(our_df, in_string_df, not_in_string_df):
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Compare predictions with STRING')
+    parser.add_argument('--build-index', action='store_true',
+                        help='(Re)build the STRING pair index from the release download and exit')
+    parser.add_argument('--restrict-to-predictions', action='store_true',
+                        help='Skip the release index and stream only links between our proteins')
+    parser.add_argument('--links-file', type=str,
+                        help='Use this protein.links file (e.g. the full multi-species file) instead of '
+                             'downloading the human one; implies --restrict-to-predictions')
+    args = parser.parse_args()
+
+    if args.links_file:
+        if args.build_index:
+            parser.error('--links-file cannot be used with --build-index (the release index is built '
+                         'from the human links download)')
+        args.restrict_to_predictions = True
+
+    if args.build_index:
+        os.makedirs('data/external', exist_ok=True)
+        mapper = get_mapper()
+        load_string_index(mapper, load_alias_index(mapper), rebuild=True)
+        mapper.close()
+        return
+
     print("Starting STRING comparison analysis...")
 
     # Create output directories
@@ -303,17 +412,20 @@ def main():
     # 1. Load our predictions
     our_df = load_our_interactions()
 
-    # 2. Download STRING data
-    links_file, info_file = download_string_data()
-
-    # 3. Load STRING protein info
-    gene_to_string = load_string_protein_info(info_file)
-
-    # 4. Load STRING links
-    string_df = load_string_links(links_file, gene_to_string)
+    # 2-4. Load STRING pair index (downloads and parses the release on first run)
+    mapper = get_mapper()
+    alias_index = load_alias_index(mapper)
+    if args.restrict_to_predictions:
+        links_file, info_file = download_string_data(links_file=args.links_file)
+        string_index = load_string_for_predictions(our_df, links_file, info_file, mapper, alias_index)
+    else:
+        string_index = load_string_index(mapper, alias_index)
+    # Picks up mappings the STRING load may have added to the store
+    alias_index = load_alias_index(mapper)
+    mapper.close()
 
     # 5. Compare with STRING
-    in_string_df, not_in_string_df = compare_with_string(our_df, string_df)
+    in_string_df, not_in_string_df = compare_with_string(our_df, string_index, alias_index)
 
     # 6. Analyze score correlation
     if len(in_string_df) > 0:
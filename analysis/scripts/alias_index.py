@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Alias Normalization Index
+
+Precomputed hash map from every known gene symbol and alias (upper case) to a
+canonical UniProt accession. Comparison scripts normalize gene symbols through
+this index while loading, so an interaction reported as WDR19-TTC30A matches a
+prediction stored as IFT144-IFT70A.
+
+The index is derived from the 'gene' and 'alias' mappings in the shared ID
+mapping store (see id_mapping.py) and saved to
+experimental_data/mapping/alias_index.json together with the source releases it
+was built from; it is rebuilt automatically when any of them changes. Pair
+indexes normalized through it (BioGRID, STRING) record mapping_release() in
+their meta and are rebuilt as well.
+
+Resolution rules (deterministic):
+1. Bait dictionaries win over our predictions table, which wins over reference
+   files (BioGRID, uniprot_cache.json)
+2. Within a source rank, official symbols win over synonyms
+3. A symbol still pointing to more than one accession is ambiguous and left out
+
+Requirements:
+  pip install pandas
+
+Usage:
+  # Rebuild the index and show statistics
+  python analysis/scripts/alias_index.py
+
+  # Normalize symbols
+  python analysis/scripts/alias_index.py WDR19 TTC30A IFT56 DYF13
+"""
+
+import os
+import sys
+import json
+import hashlib
+import pandas as pd
+
+from id_mapping import get_mapper
+
+ALIAS_INDEX_JSON = "experimental_data/mapping/alias_index.json"
+
+# Lower rank wins; sources not listed here are reference files
+SOURCE_RANK = {'bait_dictionaries': 0, 'predictions': 1}
+REFERENCE_RANK = 2
+TYPE_RANK = {'gene': 0, 'alias': 1}
+
+
+def store_releases(mapper):
+    """{source: release} of everything loaded into the mapping store"""
+    sources = mapper.sources()
+    return dict(zip(sources['source'], sources['release']))
+
+
+def mapping_release(releases):
+    """
+    Hash of mapping store releases (first 12 hex digits), recorded in the meta of
+    pair indexes normalized through the alias index so they are rebuilt when the
+    mappings change
+    """
+    return hashlib.sha1(json.dumps(releases, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class AliasIndex:
+    """Upper-case symbol -> canonical UniProt accession"""
+
+    def __init__(self, aliases, releases=None, ambiguous=None):
+        self.aliases = aliases
+        self.releases = releases or {}
+        self.ambiguous = ambiguous or []
+
+    def __len__(self):
+        return len(self.aliases)
+
+    @property
+    def release(self):
+        """mapping_release() of the mapping store the index was built from"""
+        return mapping_release(self.releases)
+
+    @classmethod
+    def build(cls, mapper):
+        """Derive the index from gene/alias -> UniProt mappings in the mapping store"""
+        table = mapper.table(['gene', 'alias'], 'uniprot')
+        table['rank'] = (table['source'].map(SOURCE_RANK).fillna(REFERENCE_RANK) * len(TYPE_RANK)
+                         + table['from_type'].map(TYPE_RANK))
+
+        # Keep only the best-ranked candidates for every symbol
+        best = table[table['rank'] == table.groupby('from_id')['rank'].transform('min')]
+        candidates = best.groupby('from_id')['to_id'].nunique()
+        ambiguous = candidates.index[candidates > 1]
+        resolved = best[~best['from_id'].isin(ambiguous)].drop_duplicates('from_id')
+
+        return cls(dict(zip(resolved['from_id'], resolved['to_id'])), store_releases(mapper), sorted(ambiguous))
+
+    @classmethod
+    def load(cls, path=ALIAS_INDEX_JSON):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data['aliases'], data['releases'], data['ambiguous'])
+
+    def save(self, path=ALIAS_INDEX_JSON):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'releases': self.releases, 'ambiguous': self.ambiguous,
+                       'aliases': self.aliases}, f)
+
+    def normalize(self, symbols):
+        """Canonical UniProt accession for each symbol in a Series (NaN if unknown)"""
+        symbols = pd.Series(symbols, dtype=object)
+        return symbols.str.strip().str.upper().map(self.aliases)
+
+    def canonical(self, uniprot, symbols):
+        """UniProt accessions where present, otherwise the accession of the normalized symbol"""
+        uniprot = pd.Series(uniprot, dtype=object)
+        uniprot = uniprot.mask(uniprot == '')
+        return uniprot.fillna(self.normalize(symbols).set_axis(uniprot.index))
+
+
+def load_alias_index(mapper=None, path=ALIAS_INDEX_JSON):
+    """Load the alias index, rebuilding it if the mapping store has new releases"""
+    close = mapper is None
+    mapper = mapper or get_mapper()
+    releases = store_releases(mapper)
+
+    alias_index = AliasIndex.load(path) if os.path.exists(path) else None
+    if alias_index is None or alias_index.releases != releases:
+        alias_index = AliasIndex.build(mapper)
+        alias_index.save(path)
+        print(f"Built alias index: {len(alias_index):,} symbols "
+              f"({len(alias_index.ambiguous)} ambiguous left out) → {path}")
+
+    if close:
+        mapper.close()
+    return alias_index
+
+
+def main():
+    alias_index = load_alias_index()
+
+    if len(sys.argv) > 1:
+        symbols = sys.argv[1:]
+        for symbol, uniprot in zip(symbols, alias_index.normalize(symbols)):
+            print(f"  {symbol} → {uniprot if isinstance(uniprot, str) else 'not found'}")
+    else:
+        print(f"Alias index: {ALIAS_INDEX_JSON}")
+        print(f"  Symbols: {len(alias_index):,}")
+        print(f"  Accessions: {len(set(alias_index.aliases.values())):,}")
+        print(f"  Ambiguous (left out): {len(alias_index.ambiguous)}")
+        for source, release in sorted(alias_index.releases.items()):
+            print(f"  {source}: {release}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Experimental Dataset Importer
+
+Turns literature interaction datasets into canonical UniProt pair indexes (see
+pair_index.py) from declarative specs in experimental_data/datasets.json, so
+adding a proteomics study means adding a spec rather than writing a parser.
+
+Spec fields:
+- file: raw table (.xlsx/.xls via the scripts/excel_cache.py columnar cache,
+  .csv, or .tsv/.txt)
+- sheet, header: workbook sheet (default: first) and column-name row (default: 0)
+- bait, prey: columns holding the two interaction partners
+- extract: optional regex whose first group pulls the ID out of both columns
+  (e.g. the accession from 'sp|A8JH98|A8JH98_CHLRE ...')
+- filter: optional pandas query selecting the rows to keep, e.g. "Bait != 'GFP'"
+- organism, id_type: how partner IDs map to human UniProt (see ID_ROUTES)
+- orthologs: optional {partner ID: human UniProt} applied before ID_ROUTES
+  (e.g. curated Chlamydomonas orthologs missing from the mapping store)
+- score: optional numeric column, reduced to the max per pair
+- max_unmapped: optional fraction of rows that may be dropped because a partner
+  has no human UniProt accession (default MAX_UNMAPPED)
+- evidence: optional columns kept per row as index side tables
+- name, pmid, method: descriptive metadata stored with the index
+
+Indexes are written to data/external/index/<dataset>-<release>.npz, where the
+release is a hash of the raw file, the spec and the ID mapping store releases,
+so an index is rebuilt whenever any of them changes. Gene symbols are mapped
+through the alias index, which covers all human genes once the HGNC complete
+set is in the mapping store (--download-hgnc, or id_mapping.py --download-hgnc;
+nothing is downloaded otherwise). Rows with a partner that cannot be mapped are
+dropped; the unmapped fraction is reported per dataset and building fails when
+it exceeds max_unmapped, since overlaps with a mostly dropped dataset would be
+meaningless. lacey-2024 sets max_unmapped to 0.99: its XL-MS crosslinks cover
+the whole Chlamydomonas IFT train, but only the curated IFT orthologs have a
+human counterpart, so ~98.5% of rows are dropped by design; the bound still
+fails if the ortholog mapping stops matching altogether.
+validation_engine.py registers every dataset as a reference source.
+
+Requirements:
+  pip install numpy pandas openpyxl pyarrow
+
+Usage:
+  # Build (or load) indexes for all datasets and show statistics
+  python analysis/scripts/dataset_importer.py
+
+  # Selected datasets, rebuilding even if an index exists
+  python analysis/scripts/dataset_importer.py sang-2011 gupta-2015 --rebuild
+
+  # Fetch the HGNC complete set first (needed to map gene-symbol datasets)
+  python analysis/scripts/dataset_importer.py --download-hgnc
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import pandas as pd
+from pathlib import Path
+
+from pair_index import PairIndex, index_path
+from id_mapping import get_mapper, download_hgnc_table
+from alias_index import load_alias_index, store_releases
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'scripts'))
+from excel_cache import load_sheet, WORKBOOK_SUFFIXES
+
+DATASET_SPECS_JSON = "experimental_data/datasets.json"
+REQUIRED_FIELDS = ('file', 'bait', 'prey', 'organism', 'id_type')
+MAX_UNMAPPED = 0.2  # default max_unmapped
+
+# (organism, id_type) -> how partner IDs reach human UniProt accessions:
+# - uniprot: used as-is
+# - alias: gene symbol through the alias index (mouse symbols match their
+#   human orthologs case-insensitively)
+# - cr_uniprot: Chlamydomonas accession through the ortholog mappings
+ID_ROUTES = {
+    ('human', 'uniprot'): 'uniprot',
+    ('human', 'gene'): 'alias',
+    ('mouse', 'gene'): 'alias',
+    ('chlamydomonas', 'uniprot'): 'cr_uniprot',
+}
+
+
+def load_dataset_specs(path=DATASET_SPECS_JSON):
+    """Dataset specs by name, checked for required fields and supported ID routes"""
+    with open(path) as f:
+        specs = json.load(f)
+    for name, spec in specs.items():
+        missing = [field for field in REQUIRED_FIELDS if field not in spec]
+        if missing:
+            raise ValueError(f"Dataset spec {name!r} is missing: {', '.join(missing)}")
+        if (spec['organism'], spec['id_type']) not in ID_ROUTES:
+            raise ValueError(f"Dataset spec {name!r}: no mapping from {spec['organism']} "
+                             f"{spec['id_type']} IDs to human UniProt")
+    return specs
+
+
+def dataset_release(spec, mapper):
+    """Hash of the raw file, the spec and the mapping store releases (first 12 hex digits)"""
+    digest = hashlib.sha1()
+    with open(spec['file'], 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(json.dumps(spec, sort_keys=True).encode())
+    digest.update(mapper.sources()[['source', 'release']].to_json().encode())
+    return digest.hexdigest()[:12]
+
+
+def read_dataset(spec):
+    """Raw dataset table as described by the spec"""
+    path = Path(spec['file'])
+    header = spec.get('header', 0)
+    if path.suffix.lower() in WORKBOOK_SUFFIXES:
+        return load_sheet(path, spec.get('sheet'), header=header)
+    if path.suffix.lower() in ('.tsv', '.txt'):
+        return pd.read_csv(path, sep='\t', header=header)
+    return pd.read_csv(path, header=header)
+
+
+def map_to_uniprot(ids, spec, mapper, alias_index):
+    """Human UniProt accession for each partner ID (NaN where it cannot be mapped)"""
+    route = ID_ROUTES[(spec['organism'], spec['id_type'])]
+    ids = ids.astype('string').str.strip().mask(lambda s: s == '').astype(object)
+    if route == 'alias':
+        uniprot = alias_index.normalize(ids).set_axis(ids.index)
+    elif route == 'cr_uniprot':
+        uniprot = mapper.resolve_series(ids, 'cr_uniprot', 'uniprot')
+    else:
+        uniprot = ids
+    if spec.get('orthologs'):
+        uniprot = ids.map(spec['orthologs']).fillna(uniprot)
+    return uniprot
+
+
+def build_dataset_index(name, spec, mapper, alias_index, release=None):
+    """Read, filter and normalize a dataset into a canonical UniProt pair index"""
+    df = read_dataset(spec)
+    rows = len(df)
+    if spec.get('filter'):
+        df = df.query(spec['filter'])
+
+    bait, prey = df[spec['bait']], df[spec['prey']]
+    if spec.get('extract'):
+        bait = bait.astype(str).str.extract(spec['extract'], expand=False)
+        prey = prey.astype(str).str.extract(spec['extract'], expand=False)
+
+    df = df.assign(uniprot_a=map_to_uniprot(bait, spec, mapper, alias_index),
+                   uniprot_b=map_to_uniprot(prey, spec, mapper, alias_index))
+    mapped = df.dropna(subset=['uniprot_a', 'uniprot_b'])
+    print(f"  {name}: {rows:,} rows, {len(df):,} after filter, "
+          f"{len(mapped):,} with both partners mapped to UniProt")
+
+    partners = pd.concat([pd.Series(bait.to_numpy()), pd.Series(prey.to_numpy())])
+    partner_uniprot = pd.concat([df['uniprot_a'], df['uniprot_b']]).to_numpy()
+    unmapped_ids = partners[pd.isna(partner_uniprot)].dropna().value_counts()
+    unmapped = 1 - len(mapped) / len(df) if len(df) else 0.0
+    max_unmapped = spec.get('max_unmapped', MAX_UNMAPPED)
+    if len(unmapped_ids):
+        print(f"  {'✗' if unmapped > max_unmapped else '⚠️ '} {name}: {unmapped:.1%} of rows dropped, "
+              f"{len(unmapped_ids):,} of {partners.nunique():,} partner IDs unmapped "
+              f"(e.g. {', '.join(map(str, unmapped_ids.index[:5]))})")
+    if unmapped > max_unmapped:
+        raise ValueError(f"Dataset {name!r}: {unmapped:.1%} of rows have a partner without a human UniProt "
+                         f"accession (max_unmapped {max_unmapped:.0%}); load a symbol table into the "
+                         f"mapping store (python analysis/scripts/id_mapping.py --download-hgnc) or "
+                         f"raise max_unmapped in its spec")
+
+    meta = {key: spec[key] for key in ('name', 'pmid', 'method') if key in spec}
+    meta.update({'source': name, 'id_type': 'uniprot', 'rows': len(mapped), 'unmapped': round(unmapped, 4)})
+    if release is not None:
+        meta['release'] = release
+
+    return PairIndex.from_pairs(
+        mapped['uniprot_a'],
+        mapped['uniprot_b'],
+        scores=pd.to_numeric(mapped[spec['score']], errors='coerce').fillna(0) if spec.get('score') else None,
+        evidence={field: mapped[field].fillna('') for field in spec.get('evidence', [])} or None,
+        meta=meta
+    )
+
+
+def load_dataset_index(name, spec, mapper, alias_index=None, rebuild=False):
+    """Load a dataset's pair index, building it if the raw file, spec or mappings changed"""
+    if alias_index is not None and alias_index.releases != store_releases(mapper):
+        alias_index = None
+
+    release = dataset_release(spec, mapper)
+    path = index_path(name, release)
+    if os.path.exists(path) and not rebuild:
+        dataset_index = PairIndex.load(path)
+        # Indexes from before the unmapped check are rebuilt so the check runs
+        if 'unmapped' in dataset_index.meta:
+            return dataset_index
+
+    dataset_index = build_dataset_index(name, spec, mapper, alias_index or load_alias_index(mapper), release)
+    dataset_index.save(path)
+    print(f"  Saved {name} index to {path}")
+    return dataset_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build pair indexes for literature datasets from specs')
+    parser.add_argument('datasets', nargs='*', help='Datasets to import (default: all in the spec file)')
+    parser.add_argument('--specs', default=DATASET_SPECS_JSON, help='Dataset spec file')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild indexes even if up to date')
+    parser.add_argument('--download-hgnc', action='store_true',
+                        help='Download the HGNC complete set (gene symbol mappings) before importing')
+    args = parser.parse_args()
+
+    specs = load_dataset_specs(args.specs)
+    unknown = [name for name in args.datasets if name not in specs]
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)} (known: {', '.join(specs)})")
+
+    print("\n=== IMPORTING EXPERIMENTAL DATASETS ===\n")
+    if args.download_hgnc:
+        try:
+            download_hgnc_table()
+        except OSError as e:
+            print(f"  ⚠️  Could not download the HGNC complete set: {e}")
+    mapper = get_mapper()
+    alias_index = load_alias_index(mapper)
+    failed = []
+
+    for name in args.datasets or specs:
+        spec = specs[name]
+        if not os.path.exists(spec['file']):
+            print(f"  Skipping {name}: raw file not found ({spec['file']})")
+            continue
+        try:
+            dataset_index = load_dataset_index(name, spec, mapper, alias_index, args.rebuild)
+        except ValueError as e:
+            print(f"  ✗ {e}")
+            failed.append(name)
+            continue
+        print(f"  {name} ({spec.get('name', name)}, {spec.get('method', 'n/a')}): "
+              f"{len(dataset_index):,} pairs over {len(dataset_index.proteins):,} proteins, "
+              f"{float(dataset_index.meta.get('unmapped', 0)):.1%} of rows unmapped")
+
+    mapper.close()
+    if failed:
+        print(f"\n✗ Import failed for: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ Dataset import complete")
+
+
+if __name__ == '__main__':
+    main()
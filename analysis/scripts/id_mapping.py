@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Protein ID Mapping Service
+
+Persistent mapping between UniProt accessions, gene symbols, aliases, STRING IDs
+and Chlamydomonas orthologs, shared by all analysis scripts. Mappings are stored
+in SQLite (experimental_data/mapping/id_mapping.sqlite) and tagged with the source
+release they came from; loading a new release of a source replaces the old one.
+
+ID types:
+- uniprot: UniProt accession (human unless noted)
+- gene: official / preferred gene symbol
+- alias: any gene symbol or alias, including official symbols
+- string: STRING protein ID (e.g. 9606.ENSP00000354878)
+- cr_uniprot: Chlamydomonas UniProt accession
+
+Sources are loaded by the scripts that read them (STRING protein.info in
+05_string_comparison.py, BioGRID tab3 in 04_biogrid_comparison.py); the bait
+dictionaries, the Node.js uniprot_cache.json, the gene/UniProt pairs of our
+predictions table and the HGNC complete set (approved symbols, aliases and
+previous symbols of all human genes, once downloaded) are loaded from here.
+
+Requirements:
+  pip install pandas
+
+Usage:
+  # Load bait dictionaries and uniprot_cache.json, then show loaded sources
+  python analysis/scripts/id_mapping.py
+
+  # Download and load the HGNC complete set (needed to map literature datasets
+  # given as gene symbols, see dataset_importer.py)
+  python analysis/scripts/id_mapping.py --download-hgnc
+
+  # Resolve identifiers
+  python analysis/scripts/id_mapping.py --resolve gene uniprot IFT144 WDR19 BBS1
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import urllib.request
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+MAPPING_DB = "experimental_data/mapping/id_mapping.sqlite"
+UNIPROT_CACHE_JSON = "experimental_data/mapping/uniprot_cache.json"
+PREDICTIONS_CSV = "analysis/results/supplementary_table_S1_all_interactions.csv"
+HGNC_TABLE = "data/external/hgnc_complete_set.txt"
+HGNC_URL = "https://storage.googleapis.com/public-download-files/hgnc/tsv/tsv/hgnc_complete_set.txt"
+BATCH_SIZE = 500  # identifiers per SQL query (below SQLite's variable limit)
+
+# Lookup keys of these ID types are stored upper case so lookups are
+# case-insensitive; resolved values keep the case given by their source
+CASE_INSENSITIVE_TYPES = {'gene', 'alias'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mappings (
+    source TEXT NOT NULL,
+    from_type TEXT NOT NULL,
+    from_id TEXT NOT NULL,
+    to_type TEXT NOT NULL,
+    to_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mappings_lookup ON mappings (from_type, to_type, from_id);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    release TEXT NOT NULL,
+    loaded_at TEXT NOT NULL,
+    mapping_count INTEGER NOT NULL
+);
+"""
+
+
+def _normalize(ids, id_type):
+    """Strip identifiers and upper-case symbol types"""
+    ids = pd.Series(ids, dtype=object).astype(str).str.strip()
+    if id_type in CASE_INSENSITIVE_TYPES:
+        ids = ids.str.upper()
+    return ids
+
+
+class IDMapper:
+    """Bulk ID resolution backed by an on-disk SQLite store with an in-process cache"""
+
+    def __init__(self, path=MAPPING_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._cache = {}  # (from_type, to_type) -> {from_id: to_id}
+
+    def close(self):
+        self.conn.close()
+
+    def release(self, source):
+        """Loaded release of a source (None if never loaded)"""
+        row = self.conn.execute("SELECT release FROM sources WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def has_release(self, source, release):
+        return self.release(source) == str(release)
+
+    def sources(self):
+        """All loaded sources as a DataFrame"""
+        return pd.read_sql_query("SELECT * FROM sources ORDER BY source", self.conn)
+
+    def load_source(self, source, release, mappings):
+        """
+        Replace all mappings of a source with a new release.
+
+        mappings: iterable of (from_type, from_ids, to_type, to_ids) with aligned ID columns
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM mappings WHERE source = ?", (source,))
+            count = 0
+            for from_type, from_ids, to_type, to_ids in mappings:
+                frame = pd.DataFrame({'from_id': list(from_ids), 'to_id': list(to_ids)}).dropna()
+                frame['from_id'] = _normalize(frame['from_id'], from_type)
+                frame['to_id'] = frame['to_id'].astype(str).str.strip()
+                frame = frame[(frame['from_id'] != '') & (frame['to_id'] != '')].drop_duplicates()
+                self.conn.executemany(
+                    "INSERT INTO mappings VALUES (?, ?, ?, ?, ?)",
+                    ((source, from_type, f, to_type, t) for f, t in frame.itertuples(index=False))
+                )
+                count += len(frame)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                (source, str(release), datetime.now().isoformat(), count)
+            )
+        self._cache.clear()
+        print(f"  ✓ Loaded {count:,} mappings from {source} (release {release})")
+
+    def resolve(self, ids, from_type, to_type):
+        """Resolve identifiers in bulk; returns {input_id: resolved_id} for those found"""
+        ids = list(dict.fromkeys(i for i in ids if isinstance(i, str) and i))
+        keys = _normalize(ids, from_type).tolist() if ids else []
+        cache = self._cache.setdefault((from_type, to_type), {})
+
+        missing = [k for k in dict.fromkeys(keys) if k not in cache]
+        for start in range(0, len(missing), BATCH_SIZE):
+            batch = missing[start:start + BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            # Several sources may map the same ID; the first by source name wins
+            rows = self.conn.execute(
+                f"SELECT from_id, to_id FROM mappings "
+                f"WHERE from_type = ? AND to_type = ? AND from_id IN ({placeholders}) "
+                f"ORDER BY source, rowid",
+                [from_type, to_type] + batch
+            ).fetchall()
+            for from_id, to_id in rows:
+                cache.setdefault(from_id, to_id)
+            for key in batch:
+                cache.setdefault(key, None)
+
+        return {i: cache[k] for i, k in zip(ids, keys) if cache[k] is not None}
+
+    def resolve_series(self, series, from_type, to_type):
+        """Resolve a pandas Series of identifiers (unresolved values become NaN)"""
+        return series.map(self.resolve(series.dropna().unique(), from_type, to_type))
+
+    def mapping(self, from_type, to_type, source=None):
+        """Full {from_id: to_id} dictionary, optionally restricted to one source"""
+        query = "SELECT from_id, to_id FROM mappings WHERE from_type = ? AND to_type = ?"
+        params = [from_type, to_type]
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
+        return dict(self.conn.execute(query + " ORDER BY rowid", params).fetchall())
+
+    def table(self, from_types, to_type):
+        """All mappings from any of from_types to to_type, with their source"""
+        placeholders = ','.join('?' * len(from_types))
+        return pd.read_sql_query(
+            f"SELECT source, from_type, from_id, to_id FROM mappings "
+            f"WHERE from_type IN ({placeholders}) AND to_type = ? ORDER BY rowid",
+            self.conn, params=list(from_types) + [to_type]
+        )
+
+
+def get_bait_dictionaries():
+    """Human IFT, BBSome and Chlamydomonas IFT dictionaries from the extractor"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+    from ift_protein_extractor_updated import IFTExtractor
+
+    extractor = IFTExtractor()
+    human = {**extractor.get_human_ift_proteins(), **extractor.get_bbsome_proteins()}
+    return human, extractor.get_chlamydomonas_ift_proteins()
+
+
+def load_bait_dictionaries(mapper):
+    """Load gene symbols, aliases and Chlamydomonas orthologs of our bait proteins"""
+    human, chlamydomonas = get_bait_dictionaries()
+    release = hashlib.sha1(json.dumps([human, chlamydomonas], sort_keys=True).encode()).hexdigest()[:12]
+    if mapper.has_release('bait_dictionaries', release):
+        return
+
+    rows = []  # (uniprot, symbol, is_primary)
+    for uniprot, info in human.items():
+        # Combined names like 'TTC26/IFT56' list the gene symbol and its IFT name
+        names = info['gene'].split('/')
+        rows += [(uniprot, name, True) for name in names]
+        rows += [(uniprot, alias, False) for alias in info.get('aliases', [])]
+    symbols = pd.DataFrame(rows, columns=['uniprot', 'symbol', 'primary'])
+    primary = symbols[symbols['primary']].drop_duplicates('uniprot', keep='last')
+
+    # Orthologs: Chlamydomonas gene name matches a human gene symbol or alias
+    by_symbol = dict(zip(symbols['symbol'].str.upper(), symbols['uniprot']))
+    orthologs = [(cr_uniprot, by_symbol[info['gene'].upper()])
+                 for cr_uniprot, info in chlamydomonas.items() if info['gene'].upper() in by_symbol]
+    cr_uniprot, human_uniprot = zip(*orthologs) if orthologs else ((), ())
+
+    mapper.load_source('bait_dictionaries', release, [
+        ('gene', primary['symbol'], 'uniprot', primary['uniprot']),
+        ('alias', symbols['symbol'], 'uniprot', symbols['uniprot']),
+        ('uniprot', primary['uniprot'], 'gene', primary['symbol']),
+        ('cr_uniprot', cr_uniprot, 'uniprot', human_uniprot),
+        ('uniprot', human_uniprot, 'cr_uniprot', cr_uniprot),
+    ])
+
+
+def load_uniprot_cache_json(mapper, path=UNIPROT_CACHE_JSON):
+    """Import the Node.js mapping cache ({'GENE_Homo sapiens': uniprot})"""
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        cache = json.load(f)
+    release = hashlib.sha1(json.dumps(cache, sort_keys=True).encode()).hexdigest()[:12]
+    if mapper.has_release('uniprot_cache_json', release):
+        return
+
+    human = {key.rsplit('_', 1)[0]: uniprot for key, uniprot in cache.items()
+             if key.endswith('_Homo sapiens') and uniprot}
+    mapper.load_source('uniprot_cache_json', release, [
+        ('alias', list(human.keys()), 'uniprot', list(human.values())),
+    ])
+
+
+def load_predictions_table(mapper, path=PREDICTIONS_CSV):
+    """Import the gene symbol / UniProt pairs used in our predictions table"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        release = hashlib.sha1(f.read()).hexdigest()[:12]
+    if mapper.has_release('predictions', release):
+        return
+
+    df = pd.read_csv(path, usecols=['Bait_Gene', 'Bait_UniProt', 'Prey_Gene', 'Prey_UniProt'], dtype=str)
+    genes = pd.concat([
+        df[['Bait_Gene', 'Bait_UniProt']].set_axis(['gene', 'uniprot'], axis=1),
+        df[['Prey_Gene', 'Prey_UniProt']].set_axis(['gene', 'uniprot'], axis=1)
+    ]).dropna().drop_duplicates()
+
+    mapper.load_source('predictions', release, [
+        ('gene', genes['gene'], 'uniprot', genes['uniprot']),
+        ('alias', genes['gene'], 'uniprot', genes['uniprot']),
+        ('uniprot', genes['uniprot'], 'gene', genes['gene']),
+    ])
+
+
+def download_hgnc_table(path=HGNC_TABLE):
+    """Download the HGNC complete set unless it is already present; returns its path"""
+    if os.path.exists(path):
+        return path
+    print(f"Downloading HGNC complete set from: {HGNC_URL}")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    urllib.request.urlretrieve(HGNC_URL, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    print(f"Downloaded to: {path}")
+    return path
+
+
+def load_hgnc_table(mapper, path=HGNC_TABLE):
+    """Import approved HGNC symbols, aliases and previous symbols with their UniProt accession"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        release = hashlib.sha1(f.read()).hexdigest()[:12]
+    if mapper.has_release('hgnc', release):
+        return
+
+    df = pd.read_csv(path, sep='\t', usecols=['symbol', 'alias_symbol', 'prev_symbol', 'uniprot_ids', 'status'],
+                     dtype=str)
+    df = df[(df['status'] == 'Approved') & df['uniprot_ids'].notna()]
+    # A few genes list several accessions; the first is the reviewed entry
+    df = df.assign(uniprot=df['uniprot_ids'].str.split('|').str[0])
+
+    symbols = pd.concat([
+        df[['symbol', 'uniprot']],
+        df[['alias_symbol', 'uniprot']].set_axis(['symbol', 'uniprot'], axis=1),
+        df[['prev_symbol', 'uniprot']].set_axis(['symbol', 'uniprot'], axis=1),
+    ]).dropna()
+    symbols = symbols.assign(symbol=symbols['symbol'].str.split('|')).explode('symbol')
+
+    mapper.load_source('hgnc', release, [
+        ('gene', df['symbol'], 'uniprot', df['uniprot']),
+        ('alias', symbols['symbol'], 'uniprot', symbols['uniprot']),
+        ('uniprot', df['uniprot'], 'gene', df['symbol']),
+    ])
+
+
+def get_mapper(path=MAPPING_DB):
+    """Open the shared mapping store, refreshing bait dictionary, cache, prediction and HGNC mappings"""
+    mapper = IDMapper(path)
+    load_bait_dictionaries(mapper)
+    load_uniprot_cache_json(mapper)
+    load_predictions_table(mapper)
+    load_hgnc_table(mapper)
+    return mapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared protein ID mapping store')
+    parser.add_argument('--resolve', nargs='+', metavar='ARG',
+                        help='FROM_TYPE TO_TYPE ID [ID ...]')
+    parser.add_argument('--download-hgnc', action='store_true',
+                        help=f'Download the HGNC complete set to {HGNC_TABLE} and load it')
+    args = parser.parse_args()
+
+    if args.download_hgnc:
+        download_hgnc_table()
+    mapper = get_mapper()
+
+    if args.resolve:
+        if len(args.resolve) < 3:
+            parser.error('--resolve needs FROM_TYPE TO_TYPE and at least one ID')
+        from_type, to_type, *ids = args.resolve
+        resolved = mapper.resolve(ids, from_type, to_type)
+        for identifier in ids:
+            print(f"  {identifier} → {resolved.get(identifier, 'not found')}")
+    else:
+        print(f"Mapping store: {mapper.path}")
+        print(mapper.sources().to_string(index=False))
+
+    mapper.close()
+
+
+if __name__ == '__main__':
+    main()
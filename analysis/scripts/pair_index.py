@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Protein Pair Index
+
+Compact on-disk index of undirected protein pairs for reference databases
+(BioGRID, STRING). Raw downloads are parsed once per release by the comparison
+scripts and stored here; later runs load the index instead of the raw file.
+
+Layout (single uncompressed .npz file):
+- proteins: sorted vocabulary of protein IDs (UniProt or gene symbol)
+- keys: sorted uint64 pair keys, (low code << 32) | high code
+- scores: optional per-pair score (e.g. STRING combined score, max per pair)
+- evidence_pair + evidence_<field>_codes/_values: optional per-evidence side
+  tables (e.g. BioGRID detection method and PMID for each reported interaction)
+
+Requirements:
+  pip install numpy pandas
+
+Usage:
+  # Build indexes (run once per release)
+  python analysis/scripts/04_biogrid_comparison_local.py --build-index
+  python analysis/scripts/04_biogrid_comparison.py --build-index
+  python analysis/scripts/05_string_comparison.py --build-index
+
+  # Inspect an index
+  python analysis/scripts/pair_index.py data/external/index/biogrid-mitab-5.0.251.npz
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+INDEX_DIR = "data/external/index"
+MISSING_CODE = np.uint64(0xFFFFFFFF)
+
+
+def index_path(source, release, index_dir=INDEX_DIR):
+    """Return the index file path for a reference source release"""
+    return os.path.join(index_dir, f"{source}-{release}.npz")
+
+
+class PairIndex:
+    """Sorted array of 64-bit protein pair keys with side tables"""
+
+    def __init__(self, proteins, keys, scores=None, evidence_pair=None,
+                 evidence_fields=None, meta=None):
+        self.proteins = proteins
+        self.keys = keys
+        self.scores = scores
+        self.evidence_pair = evidence_pair
+        self.evidence_fields = evidence_fields or {}  # field -> (codes, values)
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_pairs(cls, protein_a, protein_b, scores=None, evidence=None, meta=None):
+        """
+        Build an index from two aligned columns of protein IDs.
+
+        scores: optional values aligned with the input rows, reduced to max per pair
+        evidence: optional {field: values} aligned with the input rows, kept per row
+        """
+        protein_a = np.asarray(protein_a, dtype=str)
+        protein_b = np.asarray(protein_b, dtype=str)
+
+        proteins, codes = np.unique(np.concatenate([protein_a, protein_b]), return_inverse=True)
+        codes = codes.astype(np.uint64)
+        row_keys = _pack(codes[:len(protein_a)], codes[len(protein_a):])
+
+        keys, row_pair = np.unique(row_keys, return_inverse=True)
+
+        pair_scores = None
+        if scores is not None:
+            # Every pair has at least one row, so the group-by result aligns with keys
+            pair_scores = pd.Series(np.asarray(scores)).groupby(row_pair).max().to_numpy()
+
+        evidence_pair = None
+        evidence_fields = {}
+        if evidence:
+            order = np.argsort(row_pair, kind='stable')
+            evidence_pair = row_pair[order].astype(np.int64)
+            for field, values in evidence.items():
+                values, field_codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+                evidence_fields[field] = (field_codes[order].astype(np.int32), values)
+
+        return cls(proteins, keys, pair_scores, evidence_pair, evidence_fields, meta)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with save()"""
+        with np.load(path) as data:
+            meta = {k[len('meta_'):]: str(data[k]) for k in data.files if k.startswith('meta_')}
+            evidence_fields = {}
+            for name in data.files:
+                if name.startswith('evidence_') and name.endswith('_codes'):
+                    field = name[len('evidence_'):-len('_codes')]
+                    evidence_fields[field] = (data[name], data[f'evidence_{field}_values'])
+            return cls(
+                proteins=data['proteins'],
+                keys=data['keys'],
+                scores=data['scores'] if 'scores' in data.files else None,
+                evidence_pair=data['evidence_pair'] if 'evidence_pair' in data.files else None,
+                evidence_fields=evidence_fields,
+                meta=meta
+            )
+
+    def save(self, path):
+        """Save index as an uncompressed .npz file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        arrays = {'proteins': self.proteins, 'keys': self.keys}
+        if self.scores is not None:
+            arrays['scores'] = self.scores
+        if self.evidence_pair is not None:
+            arrays['evidence_pair'] = self.evidence_pair
+        for field, (codes, values) in self.evidence_fields.items():
+            arrays[f'evidence_{field}_codes'] = codes
+            arrays[f'evidence_{field}_values'] = values
+        for key, value in self.meta.items():
+            arrays[f'meta_{key}'] = np.array(str(value))
+        np.savez(path, **arrays)
+
+    def encode(self, protein_a, protein_b):
+        """Encode query pairs as keys; pairs with unknown proteins get an unused key"""
+        code_a = self._codes(protein_a)
+        code_b = self._codes(protein_b)
+        keys = _pack(code_a, code_b)
+        unknown = (code_a == MISSING_CODE) | (code_b == MISSING_CODE)
+        keys[unknown] = np.iinfo(np.uint64).max
+        return keys
+
+    def lookup(self, protein_a, protein_b):
+        """Return index positions for query pairs (-1 where the pair is absent)"""
+        query = self.encode(protein_a, protein_b)
+        if len(self.keys) == 0:
+            return np.full(len(query), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.keys, query), len(self.keys) - 1)
+        return np.where(self.keys[positions] == query, positions, -1)
+
+    def contains(self, protein_a, protein_b):
+        """Vectorized membership test for query pairs"""
+        return self.lookup(protein_a, protein_b) >= 0
+
+    def evidence_count(self):
+        """Number of evidence rows per pair"""
+        if self.evidence_pair is None:
+            return np.ones(len(self.keys), dtype=np.int64)
+        return np.bincount(self.evidence_pair, minlength=len(self.keys))
+
+    def evidence_values(self, field):
+        """Decoded per-evidence values for a side-table field"""
+        codes, values = self.evidence_fields[field]
+        return values[codes]
+
+    def evidence_for(self, position, field):
+        """Evidence values for a single pair position"""
+        start, stop = np.searchsorted(self.evidence_pair, [position, position + 1])
+        codes, values = self.evidence_fields[field]
+        return values[codes[start:stop]]
+
+    def frame(self):
+        """Pair keys with their positions, for joining against encoded query pairs"""
+        frame = pd.DataFrame({'pair_key': self.keys, 'position': np.arange(len(self.keys))})
+        if self.scores is not None:
+            frame['score'] = self.scores
+        if self.evidence_pair is not None:
+            frame['evidence_count'] = self.evidence_count()
+        return frame
+
+    def aggregate_evidence(self, positions, field, sep=', '):
+        """Join the distinct evidence values of each requested pair position"""
+        wanted = np.isin(self.evidence_pair, positions)
+        codes, values = self.evidence_fields[field]
+        evidence = pd.DataFrame({
+            'position': self.evidence_pair[wanted],
+            field: values[codes[wanted]]
+        })
+        return evidence.drop_duplicates().groupby('position')[field].agg(sep.join)
+
+    def pairs(self):
+        """Decode all pairs as a DataFrame (protein_1 <= protein_2)"""
+        return pd.DataFrame({
+            'protein_1': self.proteins[(self.keys >> np.uint64(32)).astype(np.int64)],
+            'protein_2': self.proteins[(self.keys & MISSING_CODE).astype(np.int64)]
+        })
+
+    def _codes(self, protein_ids):
+        """Map protein IDs to vocabulary codes (MISSING_CODE if unknown)"""
+        protein_ids = np.asarray(pd.Series(protein_ids).fillna('').astype(str), dtype=str)
+        if len(self.proteins) == 0:
+            return np.full(len(protein_ids), MISSING_CODE, dtype=np.uint64)
+        codes = np.minimum(np.searchsorted(self.proteins, protein_ids), len(self.proteins) - 1)
+        return np.where(self.proteins[codes] == protein_ids, codes, MISSING_CODE).astype(np.uint64)
+
+
+def _pack(code_a, code_b):
+    """Pack two code arrays into order-independent 64-bit keys"""
+    low = np.minimum(code_a, code_b)
+    high = np.maximum(code_a, code_b)
+    return (low << np.uint64(32)) | high
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    index = PairIndex.load(sys.argv[1])
+    print(f"Index: {sys.argv[1]}")
+    for key, value in index.meta.items():
+        print(f"  {key}: {value}")
+    print(f"  Proteins: {len(index.proteins):,}")
+    print(f"  Pairs: {len(index):,}")
+    if index.scores is not None:
+        print(f"  Scores: {index.scores.min()}-{index.scores.max()}")
+    if index.evidence_pair is not None:
+        print(f"  Evidence rows: {len(index.evidence_pair):,} ({', '.join(index.evidence_fields)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Multi-Database Validation Engine
+
+Loads our predictions once and compares them against any number of reference
+sources in a single pass. Every source provides a PairIndex (see pair_index.py)
+over UniProt accessions or gene symbols; the engine encodes each prediction as
+a canonical pair key per ID type and records membership for every source.
+
+Built-in sources:
+- biogrid-mitab: local BioGRID MITAB index (04_biogrid_comparison_local.py --build-index)
+- biogrid: BioGRID human physical index (04_biogrid_comparison.py --build-index)
+- string: STRING medium+ confidence index (05_string_comparison.py --build-index)
+- literature: curated validations from Validation_Details in our predictions
+- boldt-2016, gupta-2015, sang-2011, lacey-2024: published proteomics datasets
+  imported from their specs in experimental_data/datasets.json (see
+  dataset_importer.py)
+
+New databases (IntAct, other crosslink sets) are added by registering a source
+class with @register_source, new proteomics studies by adding a dataset spec,
+or without code via --index NAME=PATH for any prebuilt pair index file.
+
+Outputs:
+- analysis/results/validation_overlap_summary.csv
+- analysis/results/validation_overlap_by_confidence.csv
+- analysis/results/validation_venn_counts.csv
+- analysis/results/validation_membership.csv
+- figures/data/validation_venn.json
+
+Requirements:
+  pip install numpy pandas openpyxl pyarrow
+
+Usage:
+  python analysis/scripts/validation_engine.py
+  python analysis/scripts/validation_engine.py --source biogrid-mitab --source literature
+  python analysis/scripts/validation_engine.py --index intact=data/external/index/intact-2024.npz
+"""
+
+import os
+import sys
+import json
+import argparse
+import functools
+import pandas as pd
+
+from pair_index import PairIndex, index_path
+from id_mapping import get_mapper
+from dataset_importer import load_dataset_specs, load_dataset_index
+
+OUR_INTERACTIONS_CSV = "analysis/results/supplementary_table_S1_all_interactions.csv"
+RESULTS_DIR = "analysis/results"
+FIGURE_DATA_DIR = "figures/data"
+
+CONFIDENCE_LEVELS = ['High', 'Medium', 'Low']
+
+# Prediction columns used to build pair keys for each ID type
+ID_COLUMNS = {
+    'uniprot': ('bait_uniprot', 'prey_uniprot'),
+    'gene': ('bait_gene', 'prey_gene'),
+}
+
+SOURCE_TYPES = {}
+
+
+def register_source(name):
+    """Class decorator registering a reference source under a CLI name"""
+    def decorator(cls):
+        cls.name = name
+        SOURCE_TYPES[name] = cls
+        return cls
+    return decorator
+
+
+class ReferenceSource:
+    """A reference set of protein pairs exposed through a PairIndex"""
+
+    name = None
+    id_type = 'uniprot'
+
+    def load_index(self, predictions):
+        """Return a PairIndex for this source (predictions are available for derived sources)"""
+        raise NotImplementedError
+
+
+class IndexFileSource(ReferenceSource):
+    """Source backed by a prebuilt pair index file"""
+
+    path = None
+
+    def __init__(self, path=None, name=None):
+        if path is not None:
+            self.path = path
+        if name is not None:
+            self.name = name
+
+    def load_index(self, predictions):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Pair index not found: {self.path}")
+        index = PairIndex.load(self.path)
+        self.id_type = index.meta.get('id_type', self.id_type)
+        return index
+
+
+@register_source('biogrid-mitab')
+class BioGridMitabSource(IndexFileSource):
+    """BioGRID MITAB release (UniProt pairs)"""
+    path = index_path('biogrid-mitab', '5.0.251')
+
+
+@register_source('biogrid')
+class BioGridSource(IndexFileSource):
+    """BioGRID human physical interactions (alias-normalized UniProt pairs)"""
+    path = index_path('biogrid-human-physical', '4.4.235')
+
+
+@register_source('string')
+class StringSource(IndexFileSource):
+    """STRING medium+ confidence links (alias-normalized UniProt pairs)"""
+    path = index_path('string-human-medium', '12.0')
+
+
+@register_source('literature')
+class LiteratureSource(ReferenceSource):
+    """Curated experimental validations recorded with our predictions"""
+
+    def load_index(self, predictions):
+        validated = predictions[predictions['has_experimental_validation'] == 'Yes']
+        return PairIndex.from_pairs(
+            validated['bait_uniprot'],
+            validated['prey_uniprot'],
+            meta={'source': self.name, 'id_type': 'uniprot'}
+        )
+
+
+class DatasetSource(ReferenceSource):
+    """Published proteomics dataset imported from its spec (see dataset_importer.py)"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = spec
+        self.path = spec['file']
+
+    def load_index(self, predictions):
+        mapper = get_mapper()
+        try:
+            return load_dataset_index(self.name, self.spec, mapper)
+        finally:
+            mapper.close()
+
+
+def register_dataset_sources():
+    """Register every dataset in experimental_data/datasets.json as a source"""
+    for name, spec in load_dataset_specs().items():
+        SOURCE_TYPES[name] = functools.partial(DatasetSource, name, spec)
+
+
+class ValidationEngine:
+    """Computes overlaps between our predictions and registered reference sources"""
+
+    def __init__(self, predictions):
+        self.predictions = predictions
+        self.sources = []
+        self.optional = set()
+
+    def register(self, source, required=True):
+        """Add a source; an optional source that fails to load is skipped with a warning"""
+        self.sources.append(source)
+        if not required:
+            self.optional.add(source.name)
+        return self
+
+    def run(self):
+        """Membership of every prediction in every source (one boolean column per source)"""
+        print("\n=== COMPARING WITH REFERENCE SOURCES ===\n")
+
+        membership = pd.DataFrame(index=self.predictions.index)
+        for source in self.sources:
+            try:
+                index = source.load_index(self.predictions)
+            except (ValueError, OSError) as e:
+                if source.name not in self.optional:
+                    raise
+                print(f"  ⚠️  Skipping {source.name}: {e}")
+                continue
+            bait_column, prey_column = ID_COLUMNS[source.id_type]
+            membership[source.name] = index.contains(
+                self.predictions[bait_column], self.predictions[prey_column]
+            )
+            print(f"  {source.name}: {len(index):,} reference pairs, "
+                  f"{int(membership[source.name].sum())} predictions matched")
+
+        return membership
+
+    def summarize(self, membership):
+        """Overall overlap, per-confidence breakdown and Venn region counts"""
+        total = len(self.predictions)
+        confidence = self.predictions['ipsae_confidence']
+
+        summary = pd.DataFrame({
+            'source': membership.columns,
+            'total_predictions': total,
+            'validated': membership.sum().to_numpy(),
+        })
+        summary['validation_rate_pct'] = (summary['validated'] / total * 100).round(1) if total else 0.0
+
+        by_confidence = membership.groupby(confidence).sum().reindex(CONFIDENCE_LEVELS, fill_value=0)
+        by_confidence.insert(0, 'total_predictions',
+                             confidence.value_counts().reindex(CONFIDENCE_LEVELS, fill_value=0))
+        by_confidence = by_confidence.rename_axis('confidence').reset_index()
+
+        # Venn regions: one row per observed combination of sources ('none' = novel)
+        venn = membership.value_counts().reset_index(name='predictions')
+        venn.insert(0, 'sources', [
+            '+'.join(name for name, hit in zip(membership.columns, combination) if hit) or 'none'
+            for combination in venn[membership.columns].itertuples(index=False)
+        ])
+
+        return summary, by_confidence, venn
+
+
+def load_our_interactions():
+    """Load our predicted interactions from CSV"""
+    print("\n=== LOADING OUR PREDICTIONS ===\n")
+
+    df = pd.read_csv(OUR_INTERACTIONS_CSV)
+    df = df.rename(columns={
+        'Interaction_ID': 'interaction_id',
+        'Bait_Gene': 'bait_gene',
+        'Bait_UniProt': 'bait_uniprot',
+        'Prey_Gene': 'prey_gene',
+        'Prey_UniProt': 'prey_uniprot',
+        'ipSAE': 'ipsae',
+        'Confidence': 'ipsae_confidence',
+        'Has_Experimental_Validation': 'has_experimental_validation'
+    })
+
+    print(f"Our predictions: {len(df):,}")
+    return df
+
+
+def main():
+    register_dataset_sources()
+
+    parser = argparse.ArgumentParser(description='Compare predictions with multiple reference databases')
+    parser.add_argument('--source', action='append', choices=sorted(SOURCE_TYPES),
+                        help='Built-in source to include (repeatable; default: all available)')
+    parser.add_argument('--index', action='append', default=[], metavar='NAME=PATH',
+                        help='Additional prebuilt pair index to include (repeatable)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("MULTI-DATABASE VALIDATION")
+    print("=" * 70)
+
+    predictions = load_our_interactions()
+    engine = ValidationEngine(predictions)
+
+    for name in args.source or sorted(SOURCE_TYPES):
+        source = SOURCE_TYPES[name]()
+        if isinstance(source, (IndexFileSource, DatasetSource)) and not os.path.exists(source.path):
+            kind = 'pair index' if isinstance(source, IndexFileSource) else 'raw dataset'
+            if args.source:
+                print(f"ERROR: {kind.capitalize()} not found for {name}: {source.path}")
+                sys.exit(1)
+            print(f"Skipping {name}: no {kind} at {source.path}")
+            continue
+        # Sources named with --source must load; by default unusable ones are skipped
+        engine.register(source, required=bool(args.source))
+
+    for spec in args.index:
+        name, _, path = spec.partition('=')
+        engine.register(IndexFileSource(path=path, name=name))
+
+    try:
+        membership = engine.run()
+    except (ValueError, OSError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    summary, by_confidence, venn = engine.summarize(membership)
+
+    # Save results
+    print("\n=== SAVING RESULTS ===\n")
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    os.makedirs(FIGURE_DATA_DIR, exist_ok=True)
+
+    summary_path = os.path.join(RESULTS_DIR, 'validation_overlap_summary.csv')
+    summary.to_csv(summary_path, index=False)
+    print(f"✓ Saved overlap summary: {summary_path}")
+
+    conf_path = os.path.join(RESULTS_DIR, 'validation_overlap_by_confidence.csv')
+    by_confidence.to_csv(conf_path, index=False)
+    print(f"✓ Saved confidence breakdown: {conf_path}")
+
+    venn_path = os.path.join(RESULTS_DIR, 'validation_venn_counts.csv')
+    venn.to_csv(venn_path, index=False)
+    print(f"✓ Saved Venn counts: {venn_path}")
+
+    membership_path = os.path.join(RESULTS_DIR, 'validation_membership.csv')
+    id_columns = ['interaction_id', 'bait_gene', 'bait_uniprot', 'prey_gene', 'prey_uniprot', 'ipsae', 'ipsae_confidence']
+    pd.concat([predictions[id_columns], membership], axis=1).to_csv(membership_path, index=False)
+    print(f"✓ Saved per-prediction membership: {membership_path}")
+
+    venn_json_path = os.path.join(FIGURE_DATA_DIR, 'validation_venn.json')
+    with open(venn_json_path, 'w') as f:
+        json.dump({
+            'total_predictions': len(predictions),
+            'sources': list(membership.columns),
+            'regions': {sources: int(count) for sources, count in zip(venn['sources'], venn['predictions'])}
+        }, f, indent=2)
+    print(f"✓ Saved Venn data: {venn_json_path}")
+
+    print("\n" + "=" * 70)
+    print("✅ Multi-database validation complete!")
+    print("=" * 70)
+
+    for _, row in summary.iterrows():
+        print(f"  {row['source']}: {row['validated']}/{row['total_predictions']} ({row['validation_rate_pct']:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
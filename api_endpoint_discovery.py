@@ -2,130 +2,70 @@
 """
 API Endpoint Discovery Script for ciliaaf3predictions.vercel.app
 Run this first to figure out how to query the database
+
+All candidate endpoints are probed concurrently (see endpoint_probe.py) and
+ranked by latency and payload size; --report saves the ranking as JSON and
+--repeat turns the run into a quick latency benchmark.
+
+Usage:
+  python api_endpoint_discovery.py
+  python api_endpoint_discovery.py --base-url http://localhost:3000 --report discovery_report.json
 """
 
-import requests
 import json
-from typing import Dict, List
+import argparse
+
+from endpoint_probe import add_probe_arguments, run_probes, describe, print_report
 
-def test_api_endpoints():
+
+def test_api_endpoints(args):
     """Test various possible API endpoint patterns"""
-    
-    base_url = "https://ciliaaf3predictions.vercel.app"
-    test_protein = "Q8NEZ3"  # IFT144/WDR19 - a known IFT protein
-    
+
     print("="*60)
-    print(f"Testing API endpoints for {base_url}")
-    print(f"Using test protein: {test_protein} (IFT144/WDR19)")
+    print(f"Testing API endpoints for {args.base_url}")
+    print(f"Using test protein: {args.protein} (IFT144/WDR19)")
+    print(f"Probing concurrently with {args.workers} workers, {args.timeout:g}s timeout")
     print("="*60 + "\n")
-    
-    # Common API patterns to try
-    endpoints = [
-        # Direct protein queries
-        f"{base_url}/api/protein/{test_protein}",
-        f"{base_url}/api/proteins/{test_protein}",
-        f"{base_url}/api/interaction/{test_protein}",
-        f"{base_url}/api/interactions/{test_protein}",
-        
-        # Search endpoints
-        f"{base_url}/api/search?query={test_protein}",
-        f"{base_url}/api/search?q={test_protein}",
-        f"{base_url}/api/search?uniprot={test_protein}",
-        f"{base_url}/api/search?protein={test_protein}",
-        
-        # Version-specific endpoints
-        f"{base_url}/api/v4/protein/{test_protein}",
-        f"{base_url}/api/v4/interactions/{test_protein}",
-        f"{base_url}/api/protein/{test_protein}?version=v4",
-        
-        # Data file endpoints
-        f"{base_url}/data/{test_protein}.json",
-        f"{base_url}/data/proteins/{test_protein}.json",
-        f"{base_url}/data/interactions/{test_protein}.json",
-        
-        # GraphQL endpoint
-        f"{base_url}/graphql",
-        f"{base_url}/api/graphql",
-        
-        # Other common patterns
-        f"{base_url}/api/bait/{test_protein}",
-        f"{base_url}/api/network/{test_protein}",
-        f"{base_url}/api/get-interactions?bait={test_protein}",
-    ]
-    
+
+    results, elapsed = run_probes(args, graphql=True)
+
     working_endpoints = []
-    
-    for endpoint in endpoints:
-        try:
-            print(f"Testing: {endpoint}")
-            
-            # Special handling for GraphQL
-            if "graphql" in endpoint:
-                # Try a simple GraphQL query
-                query = {
-                    "query": f"""
-                    {{
-                        protein(uniprot: "{test_protein}") {{
-                            interactions {{
-                                prey
-                                confidence
-                            }}
-                        }}
-                    }}
-                    """
-                }
-                response = requests.post(endpoint, json=query, timeout=5)
-            else:
-                response = requests.get(endpoint, timeout=5)
-            
-            print(f"  Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"  ✓ SUCCESS! Got JSON response")
+
+    for result in results:
+        print(f"Testing: {result.method} {result.url}")
+        print(f"  {describe(result)}")
+
+        if result.ok:
+            if result.is_json:
+                data = result.data
+                print(f"  ✓ SUCCESS! Got JSON response")
+
+                # Try to understand the structure
+                if isinstance(data, dict):
                     print(f"  Response keys: {list(data.keys())[:5]}...")  # Show first 5 keys
-                    
-                    # Try to understand the structure
-                    if isinstance(data, dict):
-                        for key in ['results', 'data', 'interactions', 'proteins', 'items']:
-                            if key in data:
-                                print(f"  Found '{key}' field with {len(data[key])} items")
-                    
-                    working_endpoints.append(endpoint)
-                    
-                    # Save a sample response for analysis
-                    with open(f'sample_response_{len(working_endpoints)}.json', 'w') as f:
-                        json.dump(data, f, indent=2)
-                    print(f"  Saved sample response to sample_response_{len(working_endpoints)}.json")
-                    
-                except json.JSONDecodeError:
-                    print(f"  Response is not JSON")
-            
-            elif response.status_code == 404:
-                print(f"  Not found (404)")
-            elif response.status_code == 405:
-                print(f"  Method not allowed (405)")
-            elif response.status_code == 500:
-                print(f"  Server error (500)")
+                    for key in ['results', 'data', 'interactions', 'proteins', 'items']:
+                        if key in data:
+                            print(f"  Found '{key}' field with {len(data[key])} items")
+
+                working_endpoints.append(result.url)
+
+                # Save a sample response for analysis
+                with open(f'sample_response_{len(working_endpoints)}.json', 'w') as f:
+                    json.dump(data, f, indent=2)
+                print(f"  Saved sample response to sample_response_{len(working_endpoints)}.json")
             else:
-                print(f"  Other status: {response.status_code}")
-                
-        except requests.Timeout:
-            print(f"  Timeout (no response after 5 seconds)")
-        except requests.ConnectionError:
-            print(f"  Connection error")
-        except Exception as e:
-            print(f"  Error: {str(e)[:50]}")
-        
+                print(f"  Response is not JSON")
+
         print()  # Empty line between tests
-    
+
+    print("="*60)
+    print_report(results, elapsed)
     print("="*60)
     print(f"Summary: Found {len(working_endpoints)} working endpoints:")
     for ep in working_endpoints:
         print(f"  ✓ {ep}")
     print("="*60)
-    
+
     if working_endpoints:
         print("\nNext steps:")
         print("1. Check the saved sample_response_*.json files")
@@ -140,8 +80,9 @@ def test_api_endpoints():
         print("1. Open the site in a browser")
         print("2. Open Developer Tools (F12)")
         print("3. Go to Network tab")
-        print("4. Search for 'Q8NEZ3'")
+        print(f"4. Search for '{args.protein}'")
         print("5. Look for XHR/Fetch requests that return data")
 
 if __name__ == "__main__":
-    test_api_endpoints()
+    parser = add_probe_arguments(argparse.ArgumentParser(description='Discover API endpoints'))
+    test_api_endpoints(parser.parse_args())
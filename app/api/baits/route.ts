@@ -1,5 +1,7 @@
 import { db } from '@vercel/postgres';
 import { NextRequest, NextResponse } from 'next/server';
+import { BAITS_QUERY } from '../../../lib/interactionQuery.mjs';
+import { readBaitsShard } from '../../../lib/interactionShards.mjs';
 
 // Force dynamic rendering - prevents build-time execution
 export const dynamic = 'force-dynamic';
@@ -13,6 +15,9 @@ export const dynamic = 'force-dynamic';
  * Query Parameters:
  *   mode - Analysis mode: 'v3' (default) or 'ipsae' (v4)
  *
+ * Served from public/interaction_shards/baits.json when it has been exported
+ * and the database has not changed since (see lib/interactionShards.mjs).
+ *
  * Response format:
  * {
  *   baits: [
@@ -23,24 +28,18 @@ export const dynamic = 'force-dynamic';
  * }
  */
 export async function GET(request: NextRequest) {
-  const client = await db.connect();
+  let client;
 
   try {
-    const query = `
-      SELECT DISTINCT
-        bait.uniprot_id,
-        bait.gene_name,
-        bait.organism,
-        bait.organism_code,
-        COUNT(i.id) as interaction_count
-      FROM interactions i
-      JOIN proteins bait ON i.bait_protein_id = bait.id
-      GROUP BY bait.uniprot_id, bait.gene_name, bait.organism, bait.organism_code
-      HAVING COUNT(i.id) > 0
-      ORDER BY bait.gene_name ASC, bait.uniprot_id ASC
-    `;
+    // Precomputed by scripts/export_interaction_shards.mjs, while the database is unchanged since
+    // (cached version check, no connection taken for a shard hit)
+    const shard = await readBaitsShard(db);
+    if (shard) {
+      return NextResponse.json(shard);
+    }
 
-    const { rows } = await client.query(query);
+    client = await db.connect();
+    const { rows } = await client.query(BAITS_QUERY);
 
     return NextResponse.json({
       baits: rows,
@@ -53,6 +52,6 @@ export async function GET(request: NextRequest) {
       details: error.message
     }, { status: 500 });
   } finally {
-    await client.release();
+    if (client) await client.release();
   }
 }
\ No newline at end of file
@@ -0,0 +1,24 @@
+import { db } from '@vercel/postgres';
+import { NextResponse } from 'next/server';
+import { fetchDataVersion } from '../../../lib/interactionQuery.mjs';
+
+// Force dynamic rendering - prevents build-time execution
+export const dynamic = 'force-dynamic';
+
+/**
+ * GET /api/data-version
+ *
+ * Current database version (DATA_VERSION_QUERY), so clients holding exported
+ * interaction shards (e.g. ift_protein_extractor_updated.py --shards) can check
+ * them against index.json's data_version before using them.
+ *
+ * Response format:
+ * { data_version: "9e107d9d372bb6826bd81d3542a419d6" }
+ */
+export async function GET() {
+  const dataVersion = await fetchDataVersion(db);
+  if (!dataVersion) {
+    return NextResponse.json({ error: 'Could not determine the database version' }, { status: 503 });
+  }
+  return NextResponse.json({ data_version: dataVersion });
+}
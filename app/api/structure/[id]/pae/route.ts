@@ -7,6 +7,10 @@
  * Usage: GET /api/structure/123/pae
  *
  * Data source: public/contacts_data/{id}.json
+ *
+ * If scripts/static_assets.py wrote pre-compressed siblings ({id}.json.br,
+ * {id}.json.gz), they are returned as-is to clients that accept the encoding,
+ * so responses are not compressed on every request.
  */
 
 import { NextRequest, NextResponse } from 'next/server';
@@ -17,6 +21,29 @@ import path from 'path';
 // Force dynamic rendering
 export const dynamic = 'force-dynamic';
 
+const CACHE_CONTROL = 'public, max-age=31536000, immutable';
+
+// Pre-compressed siblings, in order of preference
+const PRECOMPRESSED = [
+  { encoding: 'br', suffix: '.br' },
+  { encoding: 'gzip', suffix: '.gz' },
+];
+
+/**
+ * Encodings the client accepts (ignoring those with q=0)
+ */
+function acceptedEncodings(header: string | null): Set<string> {
+  const accepted = new Set<string>();
+  for (const part of (header || '').split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.find((p) => p.trim().startsWith('q='));
+    if (name && !(q && parseFloat(q.trim().slice(2)) === 0)) {
+      accepted.add(name);
+    }
+  }
+  return accepted;
+}
+
 export async function GET(
   request: NextRequest,
   { params }: { params: Promise<{ id: string }> }
@@ -44,6 +71,23 @@ export async function GET(
       );
     }
 
+    // Serve pre-compressed bytes when available and accepted
+    const accepted = acceptedEncodings(request.headers.get('accept-encoding'));
+    for (const { encoding, suffix } of PRECOMPRESSED) {
+      if (accepted.has(encoding) && fs.existsSync(contactPath + suffix)) {
+        const body = await readFile(contactPath + suffix);
+        return new NextResponse(body, {
+          status: 200,
+          headers: {
+            'Content-Type': 'application/json',
+            'Content-Encoding': encoding,
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': CACHE_CONTROL
+          }
+        });
+      }
+    }
+
     // Read and return contact data
     const contactData = await readFile(contactPath, 'utf8');
     const parsed = JSON.parse(contactData);
@@ -51,7 +95,8 @@ export async function GET(
     return NextResponse.json(parsed, {
       status: 200,
       headers: {
-        'Cache-Control': 'public, max-age=31536000, immutable'
+        'Cache-Control': CACHE_CONTROL,
+        'Vary': 'Accept-Encoding'
       }
     });
 
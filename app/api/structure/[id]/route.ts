@@ -7,6 +7,10 @@
  * Usage: GET /api/structure/123
  *
  * Data source: Vercel Blob Storage with UniProt-based naming
+ *
+ * Interaction lookups read the slim sharded index in
+ * public/cif_manifest_index/ (index.json + one shard of a few KB) and fall
+ * back to the full cif_manifest.json when the index has not been generated.
  */
 
 import { NextRequest, NextResponse } from 'next/server';
@@ -33,6 +37,36 @@ interface CifManifest {
   entries: Record<string, CifManifestEntry>;
 }
 
+interface CifManifestIndex {
+  shard_size: number;
+  shards: Record<string, { file: string; count: number }>;
+}
+
+const INDEX_DIR = path.join(process.cwd(), 'public', 'cif_manifest_index');
+
+// Load index and shards once (cached)
+let manifestIndex: CifManifestIndex | null = null;
+const indexShards = new Map<string, Record<string, CifManifestEntry>>();
+
+async function loadIndexEntry(interactionId: string): Promise<CifManifestEntry | undefined> {
+  if (!manifestIndex) {
+    manifestIndex = JSON.parse(await readFile(path.join(INDEX_DIR, 'index.json'), 'utf8'));
+  }
+
+  const id = Number(interactionId);
+  if (!Number.isInteger(id) || id < 0) return undefined;
+  const key = String(manifestIndex!.shard_size > 0 ? Math.floor(id / manifestIndex!.shard_size) : 0);
+  const shardInfo = manifestIndex!.shards[key];
+  if (!shardInfo) return undefined;
+
+  let shard = indexShards.get(key);
+  if (!shard) {
+    shard = JSON.parse(await readFile(path.join(INDEX_DIR, shardInfo.file), 'utf8')) as Record<string, CifManifestEntry>;
+    indexShards.set(key, shard);
+  }
+  return shard[interactionId];
+}
+
 // Load manifest once (cached)
 let manifest: CifManifest | null = null;
 
@@ -60,9 +94,10 @@ export async function GET(
     const { searchParams } = new URL(request.url);
     const isDownload = searchParams.get('download') === 'true';
 
-    // Load manifest to get interaction directory name
-    const manifest = await loadManifest();
-    const entry = manifest.entries[interactionId];
+    // Look up interaction directory name (slim index, full manifest as fallback)
+    const entry = fs.existsSync(path.join(INDEX_DIR, 'index.json'))
+      ? await loadIndexEntry(interactionId)
+      : (await loadManifest()).entries[interactionId];
 
     if (!entry) {
       return NextResponse.json(
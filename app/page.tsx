@@ -2,7 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import { Container, Row, Col, Form, Button, Card, Spinner, Table, OverlayTrigger, Tooltip } from 'react-bootstrap';
-import { NetworkVisualization } from '../components/NetworkVisualization';
+import { NetworkVisualization, NetworkLayout, loadNetworkLayout } from '../components/NetworkVisualization';
 import dynamic from 'next/dynamic';
 
 // Dynamically import StructureViewer (Mol* requires browser environment)
@@ -113,6 +113,7 @@ export default function Home() {
   const [baitProteins, setBaitProteins] = useState([]);
   const [selectedBait, setSelectedBait] = useState('');
   const [networkDimensions, setNetworkDimensions] = useState({ width: 450, height: 850 });
+  const [networkLayout, setNetworkLayout] = useState<NetworkLayout | null>(null);
 
   // Structure viewer state
   const [viewMode, setViewMode] = useState<'network' | 'structure'>('network');
@@ -347,6 +348,13 @@ export default function Home() {
     }
   }, [confidenceFilters]);
 
+  // Precomputed layout for the enabled confidence levels (full network unless exactly one)
+  useEffect(() => {
+    const enabled = Object.entries(confidenceFilters).filter(([_, on]) => on).map(([level]) => level);
+    const name = enabled.length === 1 ? enabled[0].toLowerCase() : 'all';
+    loadNetworkLayout(name).then(setNetworkLayout);
+  }, [confidenceFilters]);
+
   // Handle responsive sizing
   useEffect(() => {
     const updateDimensions = () => {
@@ -546,6 +554,7 @@ export default function Home() {
                       centerProtein={searchTerm}
                       showLayoutControl={true}
                       legendType="nodes"
+                      precomputedLayout={networkLayout}
                     />
                   ) : (
                     <div className="d-flex justify-content-center align-items-center h-100">
@@ -585,6 +594,7 @@ export default function Home() {
                       centerProtein={secondaryProtein}
                       showLayoutControl={false}
                       legendType="nodes"
+                      precomputedLayout={networkLayout}
                     />
                   ) : (
                     <div className="d-flex justify-content-center align-items-center h-100">
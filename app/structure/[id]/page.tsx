@@ -16,6 +16,24 @@ interface InteractionInfo {
   preyGene: string;
 }
 
+// Look up an interaction in the slim sharded index (index.json + one shard of
+// a few KB); fall back to the full manifest if the index is not deployed
+async function fetchManifestEntry(id: string) {
+  const indexRes = await fetch('/cif_manifest_index/index.json');
+  if (!indexRes.ok) {
+    const data = await (await fetch('/cif_manifest.json')).json();
+    return data.entries[id];
+  }
+
+  const index = await indexRes.json();
+  const key = index.shard_size > 0 ? Math.floor(Number(id) / index.shard_size) : 0;
+  const shardInfo = index.shards[key];
+  if (!shardInfo) return undefined;
+
+  const shard = await (await fetch(`/cif_manifest_index/${shardInfo.file}`)).json();
+  return shard[id];
+}
+
 // Calculate safe canvas dimensions based on screen size and memory constraints
 function calculateSafeCanvasDimensions() {
   if (typeof window === 'undefined') return { width: 1920, height: 1080 };
@@ -79,11 +97,9 @@ export default function StructurePage() {
   useEffect(() => {
     if (!id) return;
 
-    // Fetch interaction info from manifest
-    fetch('/cif_manifest.json')
-      .then(res => res.json())
-      .then(data => {
-        const entry = data.entries[id];
+    // Fetch interaction info from manifest index
+    fetchManifestEntry(String(id))
+      .then(entry => {
         if (entry) {
           setInfo({
             baitGene: entry.bait_gene || 'Unknown',
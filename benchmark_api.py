@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the interactions API
+
+Replays a realistic query mix against a deployment at a configurable
+concurrency and records latency percentiles, throughput, payload bytes and
+error rates per endpoint kind:
+
+- interactions: /api/interactions/<uniprot> for every bait in the extractor's
+  human IFT, BBSome and Chlamydomonas IFT dictionaries
+- structure: /api/structure/<id> CIF downloads for interactions in the slim
+  manifest index (public/cif_manifest_index/), or cif_manifest.json without it
+- contacts: /api/structure/<id>/pae contact data for interactions in public/contacts_data
+
+Requests share keep-alive connections through endpoint_probe.EndpointProber.
+The JSON report can be diffed against a report from another deployment or an
+earlier build (--compare); the exit status is 1 when a percentile, throughput
+or error rate regresses by more than --threshold.
+
+Usage:
+  # Local production build (npm run build && npx next start)
+  python benchmark_api.py --base-url http://localhost:3000 --requests 1000 --concurrency 16 \\
+      --report benchmark_local.json
+
+  # Compare with a previous run
+  python benchmark_api.py --base-url http://localhost:3000 --compare benchmark_main.json
+
+  # Diff two saved reports without running
+  python benchmark_api.py --diff benchmark_main.json benchmark_branch.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import http.client
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from endpoint_probe import EndpointProber, DEFAULT_BASE_URL, DEFAULT_TIMEOUT
+from ift_protein_extractor_updated import IFTExtractor
+from manifest_index import ManifestIndex, INDEX_DIR, INDEX_JSON
+
+CIF_MANIFEST_JSON = "cif_manifest.json"
+CONTACTS_DIR = "public/contacts_data"
+
+# Share of requests per endpoint kind
+DEFAULT_MIX = {'interactions': 0.6, 'contacts': 0.25, 'structure': 0.15}
+DEFAULT_REQUESTS = 500
+DEFAULT_CONCURRENCY = 8
+DEFAULT_THRESHOLD = 0.10  # relative change that counts as a regression
+
+# Report metrics compared by --compare/--diff and whether higher is better
+DIFF_METRICS = {'p50_ms': False, 'p95_ms': False, 'p99_ms': False,
+                'throughput_rps': True, 'error_rate': False}
+
+
+def load_targets():
+    """Paths per endpoint kind, from the bait dictionaries, CIF manifest and contacts data"""
+    extractor = IFTExtractor()
+    baits = {**extractor.get_human_ift_proteins(), **extractor.get_bbsome_proteins(),
+             **extractor.get_chlamydomonas_ift_proteins()}
+    targets = {'interactions': [f"/api/interactions/{uniprot}" for uniprot in baits]}
+
+    if (INDEX_DIR / INDEX_JSON).exists():
+        entries = dict(ManifestIndex().items())
+    elif os.path.exists(CIF_MANIFEST_JSON):
+        with open(CIF_MANIFEST_JSON) as f:
+            entries = json.load(f)['entries']
+    else:
+        entries = {}
+    if entries:
+        targets['structure'] = [f"/api/structure/{interaction_id}" for interaction_id, entry in entries.items()
+                                if entry.get('status', 'found') == 'found']
+
+    if os.path.isdir(CONTACTS_DIR):
+        ids = sorted(name[:-len('.json')] for name in os.listdir(CONTACTS_DIR) if name.endswith('.json'))
+        targets['contacts'] = [f"/api/structure/{interaction_id}/pae" for interaction_id in ids]
+
+    return {kind: paths for kind, paths in targets.items() if paths}
+
+
+def build_query_mix(targets, mix, n_requests, seed=0):
+    """Shuffled (kind, path) requests with kinds in the given proportions (reproducible)"""
+    rng = random.Random(seed)
+    mix = {kind: weight for kind, weight in mix.items() if kind in targets and weight > 0}
+    total = sum(mix.values())
+    queries = []
+    for kind, weight in mix.items():
+        count = round(n_requests * weight / total)
+        queries += [(kind, rng.choice(targets[kind])) for _ in range(count)]
+    rng.shuffle(queries)
+    return queries
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile of already sorted values"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def summarize(samples, wall_time):
+    """Latency percentiles, throughput, bytes and error rate for a list of samples"""
+    errors = [s for s in samples if s['error'] or not 200 <= s['status'] < 300]
+    # Failed requests often return fast; latency and throughput cover successful responses only
+    latencies = sorted(s['latency_ms'] for s in samples if not s['error'] and 200 <= s['status'] < 300)
+    total_bytes = sum(s['bytes'] for s in samples)
+    statuses = {}
+    for s in samples:
+        key = str(s['status']) if s['status'] is not None else 'error'
+        statuses[key] = statuses.get(key, 0) + 1
+
+    def ms(value):
+        return None if value is None else round(value, 1)
+
+    return {
+        'requests': len(samples),
+        'errors': len(errors),
+        'error_rate': round(len(errors) / len(samples), 4) if samples else 0.0,
+        'throughput_rps': round(len(latencies) / wall_time, 2) if wall_time else None,
+        'p50_ms': ms(percentile(latencies, 50)),
+        'p95_ms': ms(percentile(latencies, 95)),
+        'p99_ms': ms(percentile(latencies, 99)),
+        'mean_ms': ms(statistics.mean(latencies)) if latencies else None,
+        'max_ms': ms(latencies[-1]) if latencies else None,
+        'bytes_total': total_bytes,
+        'bytes_mean': round(total_bytes / len(samples)) if samples else 0,
+        'status_counts': statuses,
+    }
+
+
+def run_benchmark(prober, queries, concurrency, warmup=0):
+    """Replay the queries concurrently; returns per-request samples and wall time"""
+    def fetch(query):
+        kind, path = query
+        start = time.perf_counter()
+        try:
+            response, content, _ = prober.request('GET', prober.base_url + path)
+            status, size, error = response.status, len(content), None
+        except (http.client.HTTPException, OSError) as e:
+            status, size, error = None, 0, type(e).__name__
+        return {'kind': kind, 'path': path, 'status': status, 'bytes': size, 'error': error,
+                'latency_ms': (time.perf_counter() - start) * 1000}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Warm-up requests open connections and fill server caches; they are not recorded
+        list(pool.map(fetch, queries[:warmup]))
+        start = time.perf_counter()
+        samples = list(pool.map(fetch, queries[warmup:]))
+        wall_time = time.perf_counter() - start
+    return samples, wall_time
+
+
+def build_report(samples, wall_time, config):
+    kinds = sorted({s['kind'] for s in samples})
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'config': config,
+        'wall_time_s': round(wall_time, 3),
+        'overall': summarize(samples, wall_time),
+        # Per-kind throughput is the kind's share of the run, measured over the same wall time
+        'by_kind': {kind: summarize([s for s in samples if s['kind'] == kind], wall_time) for kind in kinds},
+    }
+
+
+def print_summary(report):
+    print(f"{'Kind':<14} {'Requests':>8} {'Errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'req/s':>8} {'Mean bytes':>11}")
+    rows = list(report['by_kind'].items()) + [('overall', report['overall'])]
+    for kind, stats in rows:
+        print(f"{kind:<14} {stats['requests']:>8} {stats['errors']:>7} {_fmt(stats['p50_ms'])} "
+              f"{_fmt(stats['p95_ms'])} {_fmt(stats['p99_ms'])} {_fmt(stats['throughput_rps'])} "
+              f"{stats['bytes_mean']:>11,}")
+
+
+def _fmt(value, width=8):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.1f}"
+
+
+def diff_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Print metric changes between two reports; returns the list of regressions"""
+    regressions = []
+    print(f"Baseline: {baseline['config'].get('base_url')} ({baseline['generated_at']})")
+    print(f"Current:  {current['config'].get('base_url')} ({current['generated_at']})\n")
+    print(f"{'Kind':<14} {'Metric':<15} {'Baseline':>10} {'Current':>10} {'Change':>9}")
+
+    sections = [('overall', baseline['overall'], current['overall'])]
+    sections += [(kind, baseline['by_kind'][kind], current['by_kind'][kind])
+                 for kind in sorted(set(baseline['by_kind']) & set(current['by_kind']))]
+    for kind, old, new in sections:
+        for metric, higher_is_better in DIFF_METRICS.items():
+            before, after = old.get(metric), new.get(metric)
+            if before is None or after is None:
+                continue
+            if metric == 'error_rate':
+                # Absolute change: a rate going from 0 has no meaningful relative change
+                change = after - before
+                change_text = f"{change * 100:+.1f}pp"
+            else:
+                change = (after - before) / before if before else 0.0
+                change_text = f"{change * 100:+.1f}%"
+            worse = -change if higher_is_better else change
+            flag = ''
+            if worse > threshold:
+                regressions.append((kind, metric, before, after))
+                flag = '  ⚠️ regression'
+            print(f"{kind:<14} {metric:<15} {before:>10} {after:>10} {change_text:>9}{flag}")
+
+    print(f"\n{len(regressions)} regression(s) beyond {threshold * 100:.0f}%")
+    return regressions
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load benchmark for the interactions API')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='Deployment to benchmark')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='Recorded requests')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Concurrent requests')
+    parser.add_argument('--warmup', type=int, default=20, help='Unrecorded warm-up requests')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT * 3, help='Per-request timeout (seconds)')
+    parser.add_argument('--mix', default=','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()),
+                        help='Request shares per kind, e.g. interactions=1 for one kind only')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the query mix')
+    parser.add_argument('--report', help='Write the JSON report to this path')
+    parser.add_argument('--compare', metavar='BASELINE', help='Diff the results against a saved report')
+    parser.add_argument('--diff', nargs=2, metavar=('BASELINE', 'CURRENT'), help='Diff two saved reports and exit')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative change that counts as a regression (default 0.10)')
+    args = parser.parse_args()
+
+    if args.diff:
+        regressions = diff_reports(load_report(args.diff[0]), load_report(args.diff[1]), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    mix = {kind: float(weight) for kind, _, weight in (item.partition('=') for item in args.mix.split(','))}
+    targets = load_targets()
+    queries = build_query_mix(targets, mix, args.requests + args.warmup, args.seed)
+
+    print("=" * 60)
+    print(f"Benchmarking {args.base_url}")
+    print(f"{len(queries) - args.warmup} requests ({args.warmup} warm-up) at concurrency {args.concurrency}")
+    print("Targets: " + ", ".join(f"{kind} {len(paths)}" for kind, paths in targets.items()))
+    print("=" * 60 + "\n")
+
+    prober = EndpointProber(args.base_url, args.concurrency, args.timeout)
+    samples, wall_time = run_benchmark(prober, queries, args.concurrency, args.warmup)
+
+    config = {'base_url': prober.base_url, 'requests': len(samples), 'concurrency': args.concurrency,
+              'warmup': args.warmup, 'mix': mix, 'seed': args.seed, 'timeout_s': args.timeout}
+    report = build_report(samples, wall_time, config)
+    print_summary(report)
+    print(f"\nWall time: {wall_time:.2f}s")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved benchmark report to {args.report}")
+
+    if args.compare:
+        print()
+        regressions = diff_reports(load_report(args.compare), report, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
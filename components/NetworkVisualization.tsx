@@ -27,6 +27,38 @@ interface InteractionLink {
   alphafold_version: string;
 }
 
+// Precomputed layout from analysis/scripts/02_network_topology.py
+// (public/network_layouts/<name>.json): parallel arrays indexed by node, plus
+// an ego layout per protein ([node index, x, y, ...] with the protein at 0, 0)
+export interface NetworkLayout {
+  name: string;
+  extent: number;
+  ids: string[];
+  genes: string[];
+  bait: number[];
+  x: number[];
+  y: number[];
+  cluster: number[];
+  clusters: { name: string; level: 'complex' | 'bait'; parent: number | null }[];
+  edges: number[];
+  ego?: Record<string, number[]>;
+}
+
+const layoutCache = new Map<string, Promise<NetworkLayout | null>>();
+
+/**
+ * Fetch a precomputed layout ('all', 'high', 'medium' or 'low') once per page;
+ * resolves to null if it has not been exported
+ */
+export function loadNetworkLayout(name: string): Promise<NetworkLayout | null> {
+  if (!layoutCache.has(name)) {
+    layoutCache.set(name, fetch(`/network_layouts/${name}.json`)
+      .then(res => (res.ok ? res.json() : null))
+      .catch(() => null));
+  }
+  return layoutCache.get(name)!;
+}
+
 interface NetworkVisualizationProps {
   interactions: any[];
   width?: number;
@@ -38,6 +70,7 @@ interface NetworkVisualizationProps {
   showLayoutControl?: boolean;
   onLayoutChange?: (layout: 'force' | 'radial') => void;
   legendType?: 'nodes' | 'edges' | 'both';
+  precomputedLayout?: NetworkLayout | null;
 }
 
 export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
@@ -50,7 +83,8 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
   layout = 'force',
   showLayoutControl = false,
   onLayoutChange,
-  legendType = 'both'
+  legendType = 'both',
+  precomputedLayout = null
 }) => {
   const svgRef = useRef<SVGSVGElement>(null);
   const [tooltip, setTooltip] = useState<{ x: number; y: number; content: string } | null>(null);
@@ -220,6 +254,57 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
     }
   };
 
+  // Place the searched protein's network at its precomputed ego layout, with
+  // the protein in the middle of the view. Returns true if every node was placed.
+  const applyEgoLayout = (nodes: ProteinNode[], precomputed: NetworkLayout): boolean => {
+    if (!centerProtein || !precomputed.ego) return false;
+    const term = centerProtein.toUpperCase();
+    const center = nodes.find(n => n.id === centerProtein) ||
+      nodes.find(n => n.gene?.toUpperCase() === term);
+    const ego = center && precomputed.ego[center.id];
+    if (!ego) return false;
+
+    const positions = new Map<string, [number, number]>();
+    for (let i = 0; i < ego.length; i += 3) {
+      positions.set(precomputed.ids[ego[i]], [ego[i + 1], ego[i + 2]]);
+    }
+    const margin = 40;
+    const scale = (Math.min(width, height) / 2 - margin) / (precomputed.extent / 2);
+    nodes.forEach(n => {
+      const position = positions.get(n.id);
+      if (position) {
+        n.x = width / 2 + position[0] * scale;
+        n.y = height / 2 + position[1] * scale;
+      }
+    });
+    return nodes.every(n => positions.has(n.id));
+  };
+
+  // Start nodes not placed yet at their position in the whole-network layout,
+  // rescaled to fit this view. Only a seed for the force simulation: a subset
+  // of the global layout is too scattered to show as is.
+  const seedFromGlobalLayout = (nodes: ProteinNode[], precomputed: NetworkLayout) => {
+    const index = new Map(precomputed.ids.map((id, i) => [id, i] as [string, number]));
+    const known = nodes.filter(n => n.x === undefined && index.has(n.id));
+    if (known.length === 0) return;
+
+    const xs = known.map(n => precomputed.x[index.get(n.id)!]);
+    const ys = known.map(n => precomputed.y[index.get(n.id)!]);
+    const minX = Math.min(...xs);
+    const minY = Math.min(...ys);
+    const spanX = Math.max(Math.max(...xs) - minX, 1);
+    const spanY = Math.max(Math.max(...ys) - minY, 1);
+    const margin = 40;
+    const scale = Math.min((width - 2 * margin) / spanX, (height - 2 * margin) / spanY);
+    const offsetX = (width - spanX * scale) / 2;
+    const offsetY = (height - spanY * scale) / 2;
+
+    known.forEach((n, i) => {
+      n.x = offsetX + (xs[i] - minX) * scale;
+      n.y = offsetY + (ys[i] - minY) * scale;
+    });
+  };
+
   const [predominantOrganism, setPredominantOrganism] = useState<string | null>(null);
 
   useEffect(() => {
@@ -231,6 +316,21 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
     const { nodes, links, predominantOrganism: detectedOrganism } = prepareNetworkData();
     setPredominantOrganism(detectedOrganism);
 
+    // With a complete precomputed ego layout, render immediately instead of
+    // simulating forces; otherwise precomputed positions only seed the simulation
+    const placed = layout === 'force' && precomputedLayout
+      ? applyEgoLayout(nodes, precomputedLayout)
+      : false;
+    if (layout === 'force' && precomputedLayout && !placed) {
+      seedFromGlobalLayout(nodes, precomputedLayout);
+    }
+    const layoutIndex = new Map((precomputedLayout?.ids || []).map((id, i) => [id, i] as [string, number]));
+    const getComplex = (id: string): string | null => {
+      if (!precomputedLayout || !layoutIndex.has(id)) return null;
+      const parent = precomputedLayout.clusters[precomputedLayout.cluster[layoutIndex.get(id)!]].parent;
+      return parent === null ? null : precomputedLayout.clusters[parent].name;
+    };
+
     // Create zoom behavior
     const zoom = d3.zoom<SVGSVGElement, unknown>()
       .scaleExtent([0.1, 4])
@@ -262,6 +362,10 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
         .force('y', d3.forceY(height / 2).strength(0.2));
     }
 
+    if (placed) {
+      simulation.stop();
+    }
+
     // Create links
     const link = container.append('g')
       .attr('class', 'links')
@@ -291,15 +395,24 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
       .style('cursor', 'pointer')
       .call(d3.drag<SVGCircleElement, ProteinNode>()
         .on('start', (event, d) => {
+          if (placed) return;
           if (!event.active) simulation.alphaTarget(0.3).restart();
           d.fx = d.x;
           d.fy = d.y;
         })
         .on('drag', (event, d) => {
+          if (placed) {
+            // Static layout: move only the dragged node
+            d.x = event.x;
+            d.y = event.y;
+            render();
+            return;
+          }
           d.fx = event.x;
           d.fy = event.y;
         })
         .on('end', (event, d) => {
+          if (placed) return;
           if (!event.active) simulation.alphaTarget(0);
           d.fx = null;
           d.fy = null;
@@ -329,9 +442,11 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
           (typeof l.source === 'object' ? l.source.id : l.source) === d.id ||
           (typeof l.target === 'object' ? l.target.id : l.target) === d.id
         );
+        const complex = getComplex(d.id);
         content = `
           <div style="font-weight: bold; margin-bottom: 5px;">${d.name} (${d.uniprot})</div>
           <div>Type: ${d.group === 'bait' ? 'Bait protein' : 'Prey protein'}</div>
+          ${complex ? `<div>Complex: ${complex}</div>` : ''}
           <div>Interactions: ${nodeLinks.length}</div>
         `;
       } else {
@@ -371,7 +486,7 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
     link.on('mouseover', showTooltip).on('mouseout', hideTooltip);
 
     // Update positions on tick
-    simulation.on('tick', () => {
+    const render = () => {
       link
         .attr('x1', (d: any) => d.source.x)
         .attr('y1', (d: any) => d.source.y)
@@ -385,7 +500,13 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
       label
         .attr('x', (d: any) => d.x)
         .attr('y', (d: any) => d.y);
-    });
+    };
+    simulation.on('tick', render);
+
+    if (placed) {
+      render();
+      return;
+    }
 
     // Center the network after simulation settles
     setTimeout(() => {
@@ -401,7 +522,7 @@ export const NetworkVisualization: React.FC<NetworkVisualizationProps> = ({
       }
     }, 1000);
 
-  }, [interactions, layout, width, height]);
+  }, [interactions, layout, width, height, precomputedLayout]);
 
   return (
     <div style={{ position: 'relative' }}>
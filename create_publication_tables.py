@@ -1,47 +1,229 @@
 #!/usr/bin/env python3
 """
 Create publication-ready tables from IFT/BBSome extraction data
+
+Input is read as a stream of records, so memory does not grow with the screen
+size. Supported formats (by extension):
+- .json: the extraction JSON array (parsed record by record)
+- .ndjson / .jsonl: one interaction record per line
+- .parquet: columnar snapshot (requires pyarrow)
+
+Only the sorted per-interaction tables keep records: the high-confidence v4
+table either keeps the --top-k best by ipSAE in a heap, or is externally
+sorted like the validated table (sorted runs spilled to temporary files and
+merged while writing).
+
+Usage:
+  python create_publication_tables.py
+  python create_publication_tables.py ift_bbsome_extraction_20251031_131653.ndjson --top-k 500
+
+  # Convert an extraction JSON to NDJSON for later runs
+  python create_publication_tables.py ift_bbsome_extraction_20251031_131653.json \
+      --write-ndjson ift_bbsome_extraction_20251031_131653.ndjson
 """
 
+import sys
 import json
 import csv
+import heapq
+import argparse
+import tempfile
 from datetime import datetime
 from collections import defaultdict, Counter
 
-def load_data(filename):
-    """Load the extraction data"""
+DEFAULT_DATA_FILE = 'ift_bbsome_extraction_20251031_131653.json'
+READ_CHUNK_SIZE = 1 << 16  # characters read at a time from JSON arrays
+SORT_BUFFER_SIZE = 50000  # records held in memory per external sort run
+
+def iter_json_array(f, chunk_size=READ_CHUNK_SIZE):
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    
+    while True:
+        buffer = buffer.lstrip()
+        if started and buffer.startswith(','):
+            buffer = buffer[1:].lstrip()
+        
+        if buffer:
+            if not started:
+                if not buffer.startswith('['):
+                    raise ValueError("Expected a JSON array of interaction records")
+                buffer = buffer[1:]
+                started = True
+                continue
+            if buffer.startswith(']'):
+                return
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                pass  # record continues in the next chunk
+            else:
+                yield record
+                buffer = buffer[end:]
+                continue
+        
+        chunk = f.read(chunk_size)
+        if not chunk:
+            raise ValueError("Unexpected end of JSON array")
+        buffer += chunk
+
+def iter_parquet(filename, batch_size=SORT_BUFFER_SIZE):
+    """Yield records from a columnar (Parquet) snapshot, one row group batch at a time"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("ERROR: Reading Parquet snapshots requires pyarrow (pip install pyarrow)")
+        sys.exit(1)
+    
+    for batch in pq.ParquetFile(filename).iter_batches(batch_size=batch_size):
+        for record in batch.to_pylist():
+            # Nested validation details may be stored as JSON strings in columnar form
+            if isinstance(record.get('experimental_validation'), str):
+                record['experimental_validation'] = json.loads(record['experimental_validation'])
+            yield record
+
+def iter_records(filename):
+    """Stream interaction records from JSON, NDJSON or Parquet input"""
+    if filename.endswith('.parquet'):
+        yield from iter_parquet(filename)
+        return
+    
     with open(filename, 'r') as f:
-        return json.load(f)
+        if filename.endswith(('.ndjson', '.jsonl')):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+def write_ndjson(records, output_file):
+    """Write records as NDJSON (one compact JSON object per line)"""
+    count = 0
+    with open(output_file, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            count += 1
+    return count
 
-def analyze_interactions(data):
-    """Analyze the interaction data and create publication tables"""
+class ExternalSort:
+    """Sort records in bounded memory: sorted runs are spilled to temporary files and merged"""
+    
+    def __init__(self, key, buffer_size=SORT_BUFFER_SIZE):
+        self.key = key
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.runs = []
+        self.count = 0
     
-    # Analysis by complex and confidence
-    complex_analysis = defaultdict(lambda: {'total': 0, 'high': 0, 'medium': 0, 'low': 0, 'v4': 0, 'validated': 0})
+    def append(self, record):
+        # The insertion counter keeps the sort stable and avoids comparing records
+        self.buffer.append((self.key(record), self.count, record))
+        self.count += 1
+        if len(self.buffer) >= self.buffer_size:
+            self._spill()
     
-    # Count interactions by bait complex and confidence
-    for interaction in data:
-        complex = interaction.get('query_complex', 'Unknown')
+    def _spill(self):
+        self.buffer.sort(key=lambda item: item[:2])
+        run = tempfile.TemporaryFile('w+')
+        for item in self.buffer:
+            run.write(json.dumps(item) + '\n')
+        run.seek(0)
+        self.runs.append(run)
+        self.buffer = []
+    
+    def _read_run(self, run):
+        for line in run:
+            key, index, record = json.loads(line)
+            yield tuple(key), index, record
+        run.close()
+    
+    def __iter__(self):
+        self.buffer.sort(key=lambda item: item[:2])
+        merged = heapq.merge(self.buffer, *(self._read_run(run) for run in self.runs),
+                             key=lambda item: item[:2])
+        for _, _, record in merged:
+            yield record
+
+class TopK:
+    """Keep the k records with the largest key (ties keep the earliest records)"""
+    
+    def __init__(self, k, key):
+        self.k = k
+        self.key = key
+        self.heap = []
+        self.count = 0
+    
+    def append(self, record):
+        item = (self.key(record), -self.count, record)
+        self.count += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+    
+    def __iter__(self):
+        for _, _, record in sorted(self.heap, key=lambda item: item[:2], reverse=True):
+            yield record
+
+CONFIDENCE_KEYS = {'High': 'high', 'Medium': 'medium', 'Low': 'low'}
+
+def empty_stats():
+    """Counters kept per complex and per queried protein"""
+    return {'total': 0, 'high': 0, 'medium': 0, 'low': 0, 'v4': 0, 'validated': 0}
+
+def aggregate_interactions(records, top_k=None, buffer_size=SORT_BUFFER_SIZE):
+    """Compute every aggregate used by the publication tables in a single pass"""
+    
+    # High-confidence v4 rows by ipSAE (descending); validated rows by complex and confidence
+    if top_k:
+        high_conf_v4 = TopK(top_k, key=lambda x: (x.get('ipsae', 0),))
+    else:
+        high_conf_v4 = ExternalSort(key=lambda x: (-x.get('ipsae', 0),), buffer_size=buffer_size)
+    validated_rows = ExternalSort(
+        key=lambda x: (x.get('bait_complex', ''), x.get('confidence', '')), buffer_size=buffer_size
+    )
+    
+    aggregates = {
+        'total': 0,
+        'complexes': defaultdict(empty_stats),
+        'proteins': defaultdict(lambda: {**empty_stats(), 'complex': ''}),
+        'high_confidence_v4': high_conf_v4,
+        'validated': validated_rows,
+        'query_proteins': set()
+    }
+    
+    for interaction in records:
         confidence = interaction.get('confidence', 'Unknown')
-        version = interaction.get('analysis_version', 'v3')
+        is_v4 = interaction.get('analysis_version', 'v3') == 'v4'
         validated = interaction.get('validated', False)
         
-        complex_analysis[complex]['total'] += 1
+        # Per-protein stats are keyed by the queried protein
+        protein_key = f"{interaction.get('query_gene', '')} ({interaction.get('query_uniprot', '')})"
+        protein = aggregates['proteins'][protein_key]
+        protein['complex'] = interaction.get('query_complex', '')
+        complex_stats = aggregates['complexes'][interaction.get('query_complex', 'Unknown')]
         
-        if confidence == 'High':
-            complex_analysis[complex]['high'] += 1
-        elif confidence == 'Medium':
-            complex_analysis[complex]['medium'] += 1
-        elif confidence == 'Low':
-            complex_analysis[complex]['low'] += 1
-            
-        if version == 'v4':
-            complex_analysis[complex]['v4'] += 1
-            
+        for stats in (complex_stats, protein):
+            stats['total'] += 1
+            if confidence in CONFIDENCE_KEYS:
+                stats[CONFIDENCE_KEYS[confidence]] += 1
+            if is_v4:
+                stats['v4'] += 1
+            if validated:
+                stats['validated'] += 1
+        
+        # Rows for the per-interaction tables
+        if confidence == 'High' and is_v4:
+            aggregates['high_confidence_v4'].append(interaction)
         if validated:
-            complex_analysis[complex]['validated'] += 1
+            aggregates['validated'].append(interaction)
+        
+        aggregates['query_proteins'].add(interaction.get('query_uniprot'))
+        aggregates['total'] += 1
     
-    return complex_analysis
+    return aggregates
 
 def create_complex_summary_table(complex_analysis, output_file):
     """Create a summary table by protein complex"""
@@ -105,17 +287,8 @@ def create_complex_summary_table(complex_analysis, output_file):
             f"{total_v4_pct:.1f}%"
         ])
 
-def create_high_confidence_v4_table(data, output_file):
-    """Create table of high-confidence v4 interactions for publication"""
-    
-    # Filter for high-confidence v4 interactions
-    high_conf_v4 = [
-        interaction for interaction in data 
-        if interaction.get('confidence') == 'High' and interaction.get('analysis_version') == 'v4'
-    ]
-    
-    # Sort by ipSAE score (descending)
-    high_conf_v4.sort(key=lambda x: x.get('ipsae', 0), reverse=True)
+def create_high_confidence_v4_table(high_conf_v4, output_file):
+    """Create table of high-confidence v4 interactions for publication (rows in ipSAE order)"""
     
     with open(output_file, 'w', newline='') as f:
         writer = csv.writer(f)
@@ -157,17 +330,8 @@ def create_high_confidence_v4_table(data, output_file):
                 validation_method
             ])
 
-def create_validated_interactions_table(data, output_file):
-    """Create table of experimentally validated interactions"""
-    
-    # Filter for validated interactions
-    validated = [
-        interaction for interaction in data 
-        if interaction.get('validated', False)
-    ]
-    
-    # Sort by complex and confidence
-    validated.sort(key=lambda x: (x.get('bait_complex', ''), x.get('confidence', '')))
+def create_validated_interactions_table(validated, output_file):
+    """Create table of experimentally validated interactions (rows sorted by complex and confidence)"""
     
     with open(output_file, 'w', newline='') as f:
         writer = csv.writer(f)
@@ -213,39 +377,9 @@ def create_validated_interactions_table(data, output_file):
                 val_notes
             ])
 
-def create_protein_coverage_table(data, output_file):
+def create_protein_coverage_table(protein_stats, output_file):
     """Create table showing coverage for each queried protein"""
     
-    # Count interactions per protein
-    protein_stats = defaultdict(lambda: {
-        'total': 0, 'high': 0, 'medium': 0, 'low': 0, 'v4': 0, 'validated': 0, 'complex': ''
-    })
-    
-    for interaction in data:
-        query_id = interaction.get('query_uniprot', '')
-        query_gene = interaction.get('query_gene', '')
-        query_complex = interaction.get('query_complex', '')
-        confidence = interaction.get('confidence', '')
-        version = interaction.get('analysis_version', 'v3')
-        validated = interaction.get('validated', False)
-        
-        key = f"{query_gene} ({query_id})"
-        protein_stats[key]['complex'] = query_complex
-        protein_stats[key]['total'] += 1
-        
-        if confidence == 'High':
-            protein_stats[key]['high'] += 1
-        elif confidence == 'Medium':
-            protein_stats[key]['medium'] += 1
-        elif confidence == 'Low':
-            protein_stats[key]['low'] += 1
-            
-        if version == 'v4':
-            protein_stats[key]['v4'] += 1
-            
-        if validated:
-            protein_stats[key]['validated'] += 1
-    
     with open(output_file, 'w', newline='') as f:
         writer = csv.writer(f)
         
@@ -284,38 +418,51 @@ def create_protein_coverage_table(data, output_file):
 def main():
     """Main function to create all publication tables"""
     
-    print("Creating publication-ready tables from IFT/BBSome extraction data...")
+    parser = argparse.ArgumentParser(description='Create publication tables from extraction data')
+    parser.add_argument('input', nargs='?', default=DEFAULT_DATA_FILE,
+                        help='Extraction data (.json, .ndjson/.jsonl or .parquet)')
+    parser.add_argument('--top-k', type=int,
+                        help='Keep only the K highest-ipSAE rows in the high-confidence v4 table')
+    parser.add_argument('--buffer-size', type=int, default=SORT_BUFFER_SIZE,
+                        help='Records held in memory per external sort run')
+    parser.add_argument('--write-ndjson', metavar='OUTPUT',
+                        help='Convert the input to NDJSON and exit')
+    args = parser.parse_args()
     
-    # Load the data
-    data_file = 'ift_bbsome_extraction_20251031_131653.json'
-    data = load_data(data_file)
+    if args.write_ndjson:
+        count = write_ndjson(iter_records(args.input), args.write_ndjson)
+        print(f"Wrote {count} interactions to {args.write_ndjson}")
+        return
+    
+    print("Creating publication-ready tables from IFT/BBSome extraction data...")
     
-    print(f"Loaded {len(data)} interactions")
+    # Stream the data and aggregate everything the tables need in one pass
+    aggregates = aggregate_interactions(iter_records(args.input), top_k=args.top_k,
+                                        buffer_size=args.buffer_size)
     
-    # Analyze the data
-    complex_analysis = analyze_interactions(data)
+    print(f"Loaded {aggregates['total']} interactions from {args.input}")
     
     # Create output files with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     # 1. Complex summary table
     complex_summary_file = f"publication_complex_summary_{timestamp}.csv"
-    create_complex_summary_table(complex_analysis, complex_summary_file)
+    create_complex_summary_table(aggregates['complexes'], complex_summary_file)
     print(f"Created complex summary table: {complex_summary_file}")
     
     # 2. High-confidence v4 interactions
     high_conf_file = f"publication_high_confidence_v4_{timestamp}.csv"
-    create_high_confidence_v4_table(data, high_conf_file)
+    create_high_confidence_v4_table(aggregates['high_confidence_v4'], high_conf_file)
     print(f"Created high-confidence v4 table: {high_conf_file}")
     
     # 3. Validated interactions
     validated_file = f"publication_validated_interactions_{timestamp}.csv"
-    create_validated_interactions_table(data, validated_file)
+    create_validated_interactions_table(aggregates['validated'], validated_file)
     print(f"Created validated interactions table: {validated_file}")
     
     # 4. Protein coverage table
     coverage_file = f"publication_protein_coverage_{timestamp}.csv"
-    create_protein_coverage_table(data, coverage_file)
+    create_protein_coverage_table(aggregates['proteins'], coverage_file)
     print(f"Created protein coverage table: {coverage_file}")
     
     # Print summary statistics
@@ -323,10 +470,10 @@ def main():
     print("PUBLICATION TABLE SUMMARY")
     print(f"{'='*60}")
     
-    total_interactions = len(data)
-    high_conf_v4 = len([i for i in data if i.get('confidence') == 'High' and i.get('analysis_version') == 'v4'])
-    validated = len([i for i in data if i.get('validated')])
-    unique_proteins = len(set(i.get('query_uniprot') for i in data))
+    total_interactions = aggregates['total']
+    high_conf_v4 = aggregates['high_confidence_v4'].count
+    validated = aggregates['validated'].count
+    unique_proteins = len(aggregates['query_proteins'])
     
     print(f"Total interactions: {total_interactions}")
     print(f"High-confidence v4 interactions: {high_conf_v4}")
@@ -335,7 +482,8 @@ def main():
     
     print(f"\nFiles created:")
     print(f"1. {complex_summary_file} - Summary by protein complex")
-    print(f"2. {high_conf_file} - High-confidence v4 interactions")
+    top_k_note = f" (top {args.top_k} by ipSAE)" if args.top_k else ""
+    print(f"2. {high_conf_file} - High-confidence v4 interactions{top_k_note}")
     print(f"3. {validated_file} - Experimentally validated interactions")
     print(f"4. {coverage_file} - Coverage per protein")
     
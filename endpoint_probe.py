@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Concurrent API endpoint probing, shared by api_endpoint_discovery.py and
+simple_endpoint_test.py (standard library only).
+
+Candidate endpoints are probed from a thread pool; every worker thread keeps one
+persistent keep-alive connection per host, so a run costs roughly the slowest
+probe instead of the sum of all timeouts. Each probe records status, latency
+(request sent to full body read), time to first byte and payload size, and can
+be repeated to turn a discovery run into a quick latency benchmark of the
+deployed API. Results are ranked by success, median latency and payload size,
+and can be written as a JSON report.
+
+Usage:
+  python endpoint_probe.py
+  python endpoint_probe.py --base-url http://localhost:3000 --repeat 5 --report probe_report.json
+"""
+
+import json
+import time
+import argparse
+import threading
+import statistics
+import http.client
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from urllib.parse import urlsplit, urljoin
+
+DEFAULT_BASE_URL = "https://ciliaaf3predictions.vercel.app"
+DEFAULT_PROTEIN = "Q8NEZ3"  # IFT144/WDR19 - a known IFT protein
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 5
+MAX_REDIRECTS = 5
+USER_AGENT = "ift-endpoint-probe/1.0"
+
+
+@dataclass
+class Probe:
+    """One candidate request"""
+    path: str
+    method: str = 'GET'
+    body: Optional[dict] = None  # sent as JSON (e.g. a GraphQL query)
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing one endpoint (latencies in milliseconds, over all repeats)"""
+    url: str
+    method: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    content_type: Optional[str] = None
+    is_json: bool = False
+    size_bytes: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    ttfb_ms: List[float] = field(default_factory=list)
+    data: object = field(default=None, repr=False)
+
+    @property
+    def ok(self):
+        return self.status == 200 and self.error is None
+
+    @property
+    def median_ms(self):
+        return statistics.median(self.latencies_ms) if self.latencies_ms else None
+
+    def summary(self):
+        """JSON-serializable summary (without the response body)"""
+        summary = asdict(self)
+        summary.pop('data')
+        summary.update({
+            'ok': self.ok,
+            'median_ms': _round(self.median_ms),
+            'min_ms': _round(min(self.latencies_ms, default=None)),
+            'max_ms': _round(max(self.latencies_ms, default=None)),
+            'latencies_ms': [_round(v) for v in self.latencies_ms],
+            'ttfb_ms': [_round(v) for v in self.ttfb_ms],
+        })
+        return summary
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def candidate_probes(protein=DEFAULT_PROTEIN, graphql=True):
+    """Common API URL patterns for a protein query"""
+    paths = [
+        # Direct protein queries
+        f"/api/protein/{protein}",
+        f"/api/proteins/{protein}",
+        f"/api/interaction/{protein}",
+        f"/api/interactions/{protein}",
+
+        # Search endpoints
+        f"/api/search?query={protein}",
+        f"/api/search?q={protein}",
+        f"/api/search?uniprot={protein}",
+        f"/api/search?protein={protein}",
+
+        # Version-specific endpoints
+        f"/api/v4/protein/{protein}",
+        f"/api/v4/interactions/{protein}",
+        f"/api/protein/{protein}?version=v4",
+
+        # Data file endpoints
+        f"/data/{protein}.json",
+        f"/data/proteins/{protein}.json",
+        f"/data/interactions/{protein}.json",
+
+        # Other common patterns
+        f"/api/bait/{protein}",
+        f"/api/network/{protein}",
+        f"/api/get-interactions?bait={protein}",
+    ]
+    probes = [Probe(path) for path in paths]
+
+    if graphql:
+        query = {"query": f'{{ protein(uniprot: "{protein}") {{ interactions {{ prey confidence }} }} }}'}
+        probes += [Probe("/graphql", 'POST', query), Probe("/api/graphql", 'POST', query)]
+    return probes
+
+
+class EndpointProber:
+    """Probes endpoints of one API concurrently over per-thread keep-alive connections"""
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.workers = workers
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self, scheme, netloc):
+        """This thread's persistent connection to a host"""
+        if not hasattr(self._local, 'connections'):
+            self._local.connections = {}
+        connections = self._local.connections
+        key = (scheme, netloc)
+        if key not in connections:
+            cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            connections[key] = cls(netloc, timeout=self.timeout)
+        return connections[key]
+
+    def _drop_connection(self, scheme, netloc):
+        connection = getattr(self._local, 'connections', {}).pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def _send(self, method, parts, payload, headers):
+        """One request over this thread's connection; returns (response, body, ttfb_s)"""
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        for attempt in range(2):
+            connection = self._connection(parts.scheme, parts.netloc)
+            reused = connection.sock is not None
+            start = time.perf_counter()
+            try:
+                connection.request(method, target, body=payload, headers=headers)
+                response = connection.getresponse()
+                ttfb = time.perf_counter() - start
+                content = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                self._drop_connection(parts.scheme, parts.netloc)
+                # The server may have closed an idle keep-alive connection: reconnect once
+                stale = isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+                if reused and stale and attempt == 0:
+                    continue
+                raise
+            if response.will_close:
+                self._drop_connection(parts.scheme, parts.netloc)
+            return response, content, ttfb
+
+    def request(self, method, url, body=None):
+        """Send one request, following redirects; returns (response, body, ttfb_s)"""
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json, */*'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+
+        for _ in range(MAX_REDIRECTS + 1):
+            response, content, ttfb = self._send(method, urlsplit(url), payload, headers)
+            if response.status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+                url = urljoin(url, response.getheader('Location'))
+                continue
+            return response, content, ttfb
+        raise http.client.HTTPException(f"More than {MAX_REDIRECTS} redirects")
+
+    def probe(self, probe, repeat=1):
+        """Probe one endpoint `repeat` times, keeping the last response body"""
+        result = ProbeResult(url=self.base_url + probe.path, method=probe.method)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                response, content, ttfb = self.request(probe.method, result.url, probe.body)
+            except TimeoutError:
+                result.error = f"Timeout (no response after {self.timeout} seconds)"
+                break
+            except (http.client.HTTPException, OSError) as e:
+                result.error = f"Connection error: {str(e)[:80]}"
+                break
+            result.latencies_ms.append((time.perf_counter() - start) * 1000)
+            result.ttfb_ms.append(ttfb * 1000)
+            result.status = response.status
+            result.size_bytes = len(content)
+            result.content_type = response.getheader('Content-Type')
+
+        if result.ok:
+            text = content.decode('utf-8', errors='replace')
+            try:
+                result.data = json.loads(text)
+                result.is_json = True
+            except json.JSONDecodeError:
+                result.data = text
+        return result
+
+    def probe_all(self, probes, repeat=1):
+        """Probe all endpoints concurrently; results in ranked order"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(lambda p: self.probe(p, repeat), probes))
+        return rank_results(results)
+
+
+def rank_results(results):
+    """Working endpoints first, then by median latency and payload size"""
+    return sorted(results, key=lambda r: (not r.ok, r.median_ms if r.median_ms is not None else float('inf'),
+                                          r.size_bytes))
+
+
+def describe(result, glyph=True):
+    """One-line status for a probe result (glyph=False drops the leading ✓ of working endpoints)"""
+    if result.error:
+        return result.error
+    timing = f"{result.median_ms:.0f} ms, {result.size_bytes:,} bytes"
+    if result.ok:
+        text = f"{result.status} {'JSON' if result.is_json else result.content_type or 'non-JSON'} ({timing})"
+        return f"✓ {text}" if glyph else text
+    labels = {404: 'Not found', 405: 'Method not allowed', 500: 'Server error'}
+    return f"{result.status} {labels.get(result.status, 'Other status')} ({timing})"
+
+
+def print_report(results, elapsed):
+    """Ranked table of probe results"""
+    print(f"{'Rank':>4}  {'Median ms':>9}  {'Bytes':>9}  {'Status':>6}  Endpoint")
+    for rank, result in enumerate(results, 1):
+        median = f"{result.median_ms:.0f}" if result.median_ms is not None else '-'
+        status = result.status if result.status is not None else 'ERR'
+        print(f"{rank:>4}  {median:>9}  {result.size_bytes:>9,}  {status:>6}  {result.method} {result.url}")
+    serial = sum(sum(r.latencies_ms) for r in results) / 1000
+    print(f"\nWall time: {elapsed:.2f}s (sum of probe latencies: {serial:.2f}s)")
+
+
+def write_report(results, path, base_url, elapsed, repeat):
+    """Save the ranked results as a JSON report"""
+    report = {
+        'base_url': base_url,
+        'generated_at': datetime.now().isoformat(),
+        'repeat': repeat,
+        'wall_time_s': round(elapsed, 3),
+        'working': [r.url for r in results if r.ok],
+        'results': [r.summary() for r in results],
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved probe report to {path}")
+
+
+def add_probe_arguments(parser):
+    """Command-line options shared by the probing scripts"""
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='API base URL (e.g. a local stub server)')
+    parser.add_argument('--protein', default=DEFAULT_PROTEIN, help='UniProt accession used in probe URLs')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent probes')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='Per-request timeout (seconds)')
+    parser.add_argument('--repeat', type=int, default=1, help='Requests per endpoint (latency benchmark)')
+    parser.add_argument('--report', help='Write a JSON report of the ranked results to this path')
+    return parser
+
+
+def run_probes(args, graphql=True):
+    """Probe the candidate endpoints described by parsed command-line options"""
+    prober = EndpointProber(args.base_url, args.workers, args.timeout)
+    start = time.perf_counter()
+    results = prober.probe_all(candidate_probes(args.protein, graphql), args.repeat)
+    elapsed = time.perf_counter() - start
+    if args.report:
+        write_report(results, args.report, prober.base_url, elapsed, args.repeat)
+    return results, elapsed
+
+
+def main():
+    parser = add_probe_arguments(argparse.ArgumentParser(description='Probe candidate API endpoints concurrently'))
+    args = parser.parse_args()
+
+    print(f"Probing {args.base_url} with {args.workers} workers\n")
+    results, elapsed = run_probes(args)
+    print_report(results, elapsed)
+
+
+if __name__ == '__main__':
+    main()
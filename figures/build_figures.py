@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Figure driver
+
+Renders the publication panels in one process from a single load of the
+analysis results (see figure_data.py), re-rendering only stale panels.
+
+A panel format (e.g. panel_a as PDF) is stale when the hash of one of the
+panel's input tables, its plot script or figure_data.py differs from the last
+successful build of that format, or when its output file is missing. State is
+kept per format, so `--format png` does not mark the PDF as current. Panels
+with rendering modes (RENDER_MODES, e.g. panel_b) also record the --mode they
+were rendered with, so changing it re-renders them. Hashes are kept in
+figures/data/.figure_build_state.json.
+
+With --jobs N, every (panel, format) pair is rendered in its own worker
+process with the Agg backend, so PNG and PDF outputs are written in parallel.
+Workers are forked after the data is loaded and share the cached tables.
+
+Outputs: figures/data/<panel>.png and .pdf
+
+Usage:
+  python figures/build_figures.py
+  python figures/build_figures.py --panel panel_c
+  python figures/build_figures.py --jobs 4
+  python figures/build_figures.py --panel panel_b --mode hexbin
+  python figures/build_figures.py --force
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import figure_data
+from figure_data import FigureData, OUTPUT_DIR, FIGURE_FORMATS
+import plot_panel_a
+import plot_panel_b_scatter
+import plot_panel_c_boxplots
+import plot_panel_d_per_bait
+import plot_validation
+import plot_venn_diagram
+
+PANELS = {
+    'panel_a': plot_panel_a,
+    'panel_b': plot_panel_b_scatter,
+    'panel_c': plot_panel_c_boxplots,
+    'panel_d': plot_panel_d_per_bait,
+    'validation': plot_validation,
+    'venn': plot_venn_diagram,
+}
+
+STATE_FILE = os.path.join(OUTPUT_DIR, '.figure_build_state.json')
+
+# Set in the parent before forking so workers inherit the loaded data
+_figure_data = None
+
+
+def file_hash(path):
+    """SHA-1 of a file's contents (None if missing)"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def panel_mode(module, mode):
+    """Rendering mode passed to a panel, or None if the panel has no modes"""
+    return mode if hasattr(module, 'RENDER_MODES') else None
+
+
+def panel_fingerprint(module, results_dir, mode='auto'):
+    """Hashes of a panel's input tables, plot script and the shared data module, plus its rendering mode"""
+    paths = [os.path.join(results_dir, name) for name in module.INPUTS]
+    paths += [module.__file__, figure_data.__file__]
+    fingerprint = {os.path.relpath(path): file_hash(path) for path in paths}
+    if panel_mode(module, mode) is not None:
+        fingerprint['render_mode'] = mode
+    return fingerprint
+
+
+def panel_outputs(module, formats):
+    return [os.path.join(OUTPUT_DIR, f'{module.OUTPUT}.{fmt}') for fmt in formats]
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {}
+    with open(STATE_FILE) as f:
+        return json.load(f)
+
+
+def save_state(state):
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def stale_formats(name, fingerprint, formats, state):
+    """Formats of a panel whose inputs changed since they were last built, or whose output is missing"""
+    built = state.get(name, {})
+    return [fmt for fmt, path in zip(formats, panel_outputs(PANELS[name], formats))
+            if built.get(fmt) != fingerprint or not os.path.exists(path)]
+
+
+def render_panel(name, formats, mode='auto'):
+    """Render one panel in the given formats (runs in the driver or a worker)"""
+    module = PANELS[name]
+    if panel_mode(module, mode) is not None:
+        module.render(_figure_data, formats, mode=mode)
+    else:
+        module.render(_figure_data, formats)
+    return name
+
+
+def main():
+    global _figure_data
+
+    parser = argparse.ArgumentParser(description='Render publication figure panels')
+    parser.add_argument('--panel', action='append', choices=sorted(PANELS),
+                        help='Panel to render (repeatable; default: all)')
+    parser.add_argument('--format', action='append', choices=FIGURE_FORMATS, dest='formats',
+                        help='Output format (repeatable; default: png and pdf)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Render panel/format pairs in parallel worker processes')
+    parser.add_argument('--mode', choices=plot_panel_b_scatter.RENDER_MODES, default='auto',
+                        help='Rendering mode of panels that have one (panel_b: auto, scatter, downsample, hexbin)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render panels even if their inputs are unchanged')
+    args = parser.parse_args()
+
+    formats = tuple(args.formats or FIGURE_FORMATS)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    _figure_data = FigureData()
+    state = load_state()
+    fingerprints = {name: panel_fingerprint(PANELS[name], _figure_data.results_dir, args.mode)
+                    for name in args.panel or PANELS}
+
+    stale = {}
+    for name, fingerprint in fingerprints.items():
+        outdated = list(formats) if args.force else stale_formats(name, fingerprint, formats, state)
+        if outdated:
+            stale[name] = tuple(outdated)
+        else:
+            print(f"Up to date: {name}")
+    if not stale:
+        print("\n✅ All panels up to date")
+        return
+
+    _figure_data.load_all()
+    print(f"Loaded figure data: {len(_figure_data.confidence_distribution)} interactions, "
+          f"{len(_figure_data.bait_summary)} baits")
+
+    # Workers must inherit the loaded data, which needs the fork start method
+    if args.jobs > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=args.jobs, mp_context=context) as pool:
+            tasks = [(name, (fmt,)) for name, outdated in stale.items() for fmt in outdated]
+            futures = [pool.submit(render_panel, name, fmt, args.mode) for name, fmt in tasks]
+            for future in futures:
+                future.result()
+    else:
+        for name, outdated in stale.items():
+            print(f"\n=== {name} ({', '.join(outdated)}) ===")
+            render_panel(name, outdated, args.mode)
+
+    # Record fingerprints only after every stale panel format rendered successfully
+    for name, outdated in stale.items():
+        built = state.get(name)
+        # Pre-format state files stored one fingerprint per panel
+        if not isinstance(built, dict) or not set(built) <= set(FIGURE_FORMATS):
+            built = state[name] = {}
+        for fmt in outdated:
+            built[fmt] = fingerprints[name]
+    save_state(state)
+
+    print(f"\n✅ Rendered {len(stale)} panels into {OUTPUT_DIR}/: {', '.join(stale)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Shared figure data cache
+
+Loads the analysis result tables once and exposes the per-confidence groupings
+used by several panels. The plot_* scripts take a FigureData instance, so the
+figure driver (build_figures.py) can render every panel from a single load
+while each script still runs on its own.
+"""
+
+import os
+from functools import cached_property
+
+import pandas as pd
+import matplotlib.pyplot as plt
+
+RESULTS_DIR = 'analysis/results'
+OUTPUT_DIR = 'figures/data'
+
+CONFIDENCE_DISTRIBUTION_CSV = 'confidence_distribution.csv'
+BAIT_SUMMARY_CSV = 'bait_summary.csv'
+PREDICTIONS_CSV = 'supplementary_table_S1_all_interactions.csv'
+BIOGRID_VALIDATED_CSV = 'biogrid_validated_interactions.csv'
+FIGURE_FORMATS = ('png', 'pdf')
+
+CONFIDENCE_ORDER = ['High', 'Medium', 'Low']
+CONFIDENCE_COLORS = {'High': '#28a745', 'Medium': '#fd7e14', 'Low': '#dc3545'}
+
+
+class FigureData:
+    """Figure inputs and derived groupings, each computed on first use"""
+
+    def __init__(self, results_dir=RESULTS_DIR):
+        self.results_dir = results_dir
+
+    @cached_property
+    def confidence_distribution(self):
+        """Per-interaction scores (ipSAE, iPTM, interface pLDDT, PAE contacts, confidence)"""
+        return pd.read_csv(os.path.join(self.results_dir, CONFIDENCE_DISTRIBUTION_CSV))
+
+    @cached_property
+    def by_confidence(self):
+        """Interactions split by confidence level, in CONFIDENCE_ORDER"""
+        groups = dict(tuple(self.confidence_distribution.groupby('Confidence', sort=False)))
+        empty = self.confidence_distribution.iloc[0:0]
+        return {conf: groups.get(conf, empty) for conf in CONFIDENCE_ORDER}
+
+    @cached_property
+    def confidence_counts(self):
+        """Number of interactions per confidence level"""
+        return pd.Series({conf: len(subset) for conf, subset in self.by_confidence.items()})
+
+    @cached_property
+    def bait_summary(self):
+        """Per-bait interaction counts by confidence level"""
+        return pd.read_csv(os.path.join(self.results_dir, BAIT_SUMMARY_CSV))
+
+    @cached_property
+    def predictions(self):
+        """All predicted interactions with their literature Validation_Details"""
+        return pd.read_csv(os.path.join(self.results_dir, PREDICTIONS_CSV))
+
+    @cached_property
+    def biogrid_validated(self):
+        """Predictions found in BioGRID (04_biogrid_comparison*.py output)"""
+        return pd.read_csv(os.path.join(self.results_dir, BIOGRID_VALIDATED_CSV))
+
+    def load_all(self):
+        """Load every available table and grouping up front (e.g. before forking panel workers)"""
+        tables = {
+            'confidence_counts': CONFIDENCE_DISTRIBUTION_CSV,
+            'bait_summary': BAIT_SUMMARY_CSV,
+            'predictions': PREDICTIONS_CSV,
+            'biogrid_validated': BIOGRID_VALIDATED_CSV,
+        }
+        for attribute, filename in tables.items():
+            # Missing tables are left for the panel that needs them to report
+            if os.path.exists(os.path.join(self.results_dir, filename)):
+                getattr(self, attribute)
+        return self
+
+
+def save_figure(fig, name, formats=FIGURE_FORMATS, output_dir=OUTPUT_DIR):
+    """Save a figure as PNG (300 dpi) and/or PDF, then close it"""
+    if 'png' in formats:
+        png_path = os.path.join(output_dir, f'{name}.png')
+        fig.savefig(png_path, dpi=300, bbox_inches='tight')
+        print(f"✅ Saved: {png_path}")
+    if 'pdf' in formats:
+        pdf_path = os.path.join(output_dir, f'{name}.pdf')
+        fig.savefig(pdf_path, bbox_inches='tight')
+        print(f"✅ Saved: {pdf_path}")
+    plt.close(fig)
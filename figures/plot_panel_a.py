@@ -1,33 +1,45 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# Data from analysis
-data = {
-    'Confidence': ['High', 'Medium', 'Low'],
-    'Count': [20, 135, 393],
-    'Percentage': [3.6, 24.6, 71.7],
-    'Color': ['#28a745', '#fd7e14', '#dc3545']
-}
-df = pd.DataFrame(data)
-
-# Create bar chart
-fig, ax = plt.subplots(figsize=(7, 5))
-bars = ax.bar(df['Confidence'], df['Count'], color=df['Color'], alpha=0.8, edgecolor='black', linewidth=1.5)
-
-ax.set_xlabel('Confidence Level', fontsize=14, fontweight='bold')
-ax.set_ylabel('Number of Interactions', fontsize=14, fontweight='bold')
-ax.set_title('Interaction Confidence Distribution (n=548)', fontsize=16, fontweight='bold')
-ax.set_ylim(0, 450)
-
-# Add count and percentage labels on bars
-for bar, count, pct in zip(bars, df['Count'], df['Percentage']):
-    height = bar.get_height()
-    ax.text(bar.get_x() + bar.get_width()/2., height + 10,
-            f'{count}\n({pct}%)',
-            ha='center', va='bottom', fontsize=12, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('figures/data/figure1_panel_a.png', dpi=300, bbox_inches='tight')
-print("✅ Saved: figures/data/figure1_panel_a.png")
-plt.savefig('figures/data/figure1_panel_a.pdf', bbox_inches='tight')
-print("✅ Saved: figures/data/figure1_panel_a.pdf")
+from figure_data import FigureData, CONFIDENCE_ORDER, CONFIDENCE_COLORS, save_figure
+from figure_data import CONFIDENCE_DISTRIBUTION_CSV, FIGURE_FORMATS
+
+# Results tables this panel reads (used by build_figures.py to detect stale panels)
+INPUTS = [CONFIDENCE_DISTRIBUTION_CSV]
+OUTPUT = 'figure1_panel_a'
+
+
+def render(figure_data, formats=FIGURE_FORMATS):
+    """Figure 1A: interaction confidence distribution"""
+    # Counts and percentages from the shared per-confidence grouping
+    counts = figure_data.confidence_counts
+    total = int(counts.sum())
+    df = pd.DataFrame({
+        'Confidence': CONFIDENCE_ORDER,
+        'Count': [int(counts[conf]) for conf in CONFIDENCE_ORDER],
+        'Percentage': [round(counts[conf] / total * 100, 1) for conf in CONFIDENCE_ORDER],
+        'Color': [CONFIDENCE_COLORS[conf] for conf in CONFIDENCE_ORDER]
+    })
+
+    # Create bar chart
+    fig, ax = plt.subplots(figsize=(7, 5))
+    bars = ax.bar(df['Confidence'], df['Count'], color=df['Color'], alpha=0.8, edgecolor='black', linewidth=1.5)
+
+    ax.set_xlabel('Confidence Level', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Number of Interactions', fontsize=14, fontweight='bold')
+    ax.set_title(f'Interaction Confidence Distribution (n={total})', fontsize=16, fontweight='bold')
+    ax.set_ylim(0, 450)
+
+    # Add count and percentage labels on bars
+    for bar, count, pct in zip(bars, df['Count'], df['Percentage']):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 10,
+                f'{count}\n({pct}%)',
+                ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+    fig.tight_layout()
+    save_figure(fig, OUTPUT, formats)
+
+
+if __name__ == '__main__':
+    render(FigureData())
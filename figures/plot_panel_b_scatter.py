@@ -1,55 +1,169 @@
-import pandas as pd
+import argparse
+
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy import stats
 
-# Load confidence distribution data
-df = pd.read_csv('analysis/results/confidence_distribution.csv')
-
-# Create scatter plot: ipSAE vs PAE contacts
-fig, ax = plt.subplots(figsize=(8, 6))
-
-# Color by confidence level
-colors = {'High': '#28a745', 'Medium': '#fd7e14', 'Low': '#dc3545'}
-for conf in ['High', 'Medium', 'Low']:
-    subset = df[df['Confidence'] == conf]
-    ax.scatter(subset['ipSAE'], subset['PAE_Contacts_<3A'],
-               c=colors[conf], label=conf, alpha=0.6, s=50, edgecolors='black', linewidth=0.5)
-
-# Calculate and plot correlation
-correlation = stats.pearsonr(df['ipSAE'], df['PAE_Contacts_<3A'])
-print(f"Pearson correlation: r = {correlation[0]:.3f}, p = {correlation[1]:.2e}")
-
-# Add trend line
-z = np.polyfit(df['ipSAE'], df['PAE_Contacts_<3A'], 1)
-p = np.poly1d(z)
-x_line = np.linspace(df['ipSAE'].min(), df['ipSAE'].max(), 100)
-ax.plot(x_line, p(x_line), "k--", alpha=0.5, linewidth=2,
-        label=f'r = {correlation[0]:.2f}, p < 0.001')
-
-# Add vertical lines for confidence thresholds
-ax.axvline(x=0.7, color='gray', linestyle='--', linewidth=1, alpha=0.3)
-ax.axvline(x=0.5, color='gray', linestyle='--', linewidth=1, alpha=0.3)
-
-ax.set_xlabel('ipSAE Score', fontsize=14, fontweight='bold')
-ax.set_ylabel('High-Precision PAE Contacts (<3Å)', fontsize=14, fontweight='bold')
-ax.set_title('Correlation Between ipSAE and Interface Quality', fontsize=16, fontweight='bold')
-ax.legend(loc='upper left', fontsize=11, framealpha=0.9)
-ax.grid(True, alpha=0.2)
-
-plt.tight_layout()
-plt.savefig('figures/data/figure1_panel_b_scatter.png', dpi=300, bbox_inches='tight')
-print("✅ Saved: figures/data/figure1_panel_b_scatter.png")
-plt.savefig('figures/data/figure1_panel_b_scatter.pdf', bbox_inches='tight')
-print("✅ Saved: figures/data/figure1_panel_b_scatter.pdf")
-plt.close()
-
-# Calculate statistics by confidence level
-print("\n=== Statistics by Confidence Level ===")
-for conf in ['High', 'Medium', 'Low']:
-    subset = df[df['Confidence'] == conf]
-    print(f"\n{conf} Confidence (n={len(subset)}):")
-    print(f"  Average ipSAE: {subset['ipSAE'].mean():.3f}")
-    print(f"  Average PAE contacts <3Å: {subset['PAE_Contacts_<3A'].mean():.1f}")
-    print(f"  Average interface pLDDT: {subset['Interface_pLDDT'].mean():.1f}")
-    print(f"  Average iPTM: {subset['iPTM'].mean():.3f}")
+from figure_data import FigureData, CONFIDENCE_COLORS, save_figure
+from figure_data import CONFIDENCE_DISTRIBUTION_CSV, FIGURE_FORMATS
+
+# Results tables this panel reads (used by build_figures.py to detect stale panels)
+INPUTS = [CONFIDENCE_DISTRIBUTION_CSV]
+OUTPUT = 'figure1_panel_b_scatter'
+
+# Rendering modes: every point, stratified downsample per confidence class, or hexbin density.
+# 'auto' draws every point up to LARGE_DATA_THRESHOLD interactions and hexbins beyond that.
+RENDER_MODES = ('auto', 'scatter', 'downsample', 'hexbin')
+LARGE_DATA_THRESHOLD = 20000
+MAX_POINTS_PER_CLASS = 5000
+HEXBIN_GRIDSIZE = 60
+STATS_CHUNK_SIZE = 100000
+SAMPLE_SEED = 0
+
+
+class StreamingCorrelation:
+    """Pearson correlation and least-squares line from running moments, updated chunk by chunk"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+        self.min_x = np.inf
+        self.max_x = -np.inf
+
+    def update(self, x, y):
+        """Merge a chunk of paired values (Chan et al. pairwise update)"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n_b = len(x)
+        if n_b == 0:
+            return
+        mean_x_b, mean_y_b = x.mean(), y.mean()
+        dx, dy = x - mean_x_b, y - mean_y_b
+
+        n = self.n + n_b
+        delta_x = mean_x_b - self.mean_x
+        delta_y = mean_y_b - self.mean_y
+        self.m2_x += (dx @ dx) + delta_x * delta_x * self.n * n_b / n
+        self.m2_y += (dy @ dy) + delta_y * delta_y * self.n * n_b / n
+        self.c_xy += (dx @ dy) + delta_x * delta_y * self.n * n_b / n
+        self.mean_x += delta_x * n_b / n
+        self.mean_y += delta_y * n_b / n
+        self.n = n
+        self.min_x = min(self.min_x, x.min())
+        self.max_x = max(self.max_x, x.max())
+
+    @property
+    def r(self):
+        return self.c_xy / np.sqrt(self.m2_x * self.m2_y)
+
+    @property
+    def p_value(self):
+        """Two-sided p-value of r (t-test with n - 2 degrees of freedom, as scipy.stats.pearsonr)"""
+        r = min(abs(self.r), 1.0)
+        if r == 1.0:
+            return 0.0
+        t = r * np.sqrt((self.n - 2) / (1.0 - r * r))
+        return 2 * stats.t.sf(t, self.n - 2)
+
+    @property
+    def line(self):
+        """Least-squares trend line as a numpy poly1d"""
+        slope = self.c_xy / self.m2_x
+        return np.poly1d([slope, self.mean_y - slope * self.mean_x])
+
+
+def format_p_value(p_value):
+    """Legend text for a p-value ('p < 0.001' below 0.001)"""
+    if p_value < 0.001:
+        return 'p < 0.001'
+    return f'p = {p_value:.3f}'
+
+
+def correlation_stats(df, x_column, y_column, chunk_size=STATS_CHUNK_SIZE):
+    """Streaming Pearson statistics over every row, in fixed-size chunks"""
+    correlation = StreamingCorrelation()
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size][[x_column, y_column]].dropna()
+        correlation.update(chunk[x_column].to_numpy(), chunk[y_column].to_numpy())
+    return correlation
+
+
+def stratified_sample(by_confidence, max_per_class=MAX_POINTS_PER_CLASS, seed=SAMPLE_SEED):
+    """At most max_per_class interactions from each confidence class (reproducible)"""
+    return {conf: subset.sample(n=max_per_class, random_state=seed) if len(subset) > max_per_class else subset
+            for conf, subset in by_confidence.items()}
+
+
+def resolve_mode(mode, n_points):
+    if mode == 'auto':
+        return 'hexbin' if n_points > LARGE_DATA_THRESHOLD else 'scatter'
+    return mode
+
+
+def render(figure_data, formats=FIGURE_FORMATS, mode='auto'):
+    """Figure 1B: ipSAE vs high-precision PAE contacts"""
+    df = figure_data.confidence_distribution
+    mode = resolve_mode(mode, len(df))
+    print(f"Rendering {len(df):,} interactions ({mode} mode)")
+
+    # Create scatter plot: ipSAE vs PAE contacts
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    if mode == 'hexbin':
+        # Density of all interactions; rasterized so PDF size does not grow with n
+        hexbin = ax.hexbin(df['ipSAE'], df['PAE_Contacts_<3A'], gridsize=HEXBIN_GRIDSIZE,
+                           bins='log', mincnt=1, cmap='viridis', rasterized=True)
+        fig.colorbar(hexbin, ax=ax, label='Interactions per bin')
+    else:
+        # Color by confidence level
+        shown = stratified_sample(figure_data.by_confidence) if mode == 'downsample' else figure_data.by_confidence
+        for conf, subset in shown.items():
+            total = len(figure_data.by_confidence[conf])
+            label = conf if len(subset) == total else f'{conf} ({len(subset):,} of {total:,} shown)'
+            ax.scatter(subset['ipSAE'], subset['PAE_Contacts_<3A'],
+                       c=CONFIDENCE_COLORS[conf], label=label, alpha=0.6, s=50, edgecolors='black', linewidth=0.5,
+                       rasterized=mode == 'downsample')
+
+    # Correlation and trend line always use every interaction
+    correlation = correlation_stats(df, 'ipSAE', 'PAE_Contacts_<3A')
+    print(f"Pearson correlation: r = {correlation.r:.3f}, p = {correlation.p_value:.2e}")
+
+    # Add trend line
+    p = correlation.line
+    x_line = np.linspace(correlation.min_x, correlation.max_x, 100)
+    ax.plot(x_line, p(x_line), "k--", alpha=0.5, linewidth=2,
+            label=f'r = {correlation.r:.2f}, {format_p_value(correlation.p_value)}')
+
+    # Add vertical lines for confidence thresholds
+    ax.axvline(x=0.7, color='gray', linestyle='--', linewidth=1, alpha=0.3)
+    ax.axvline(x=0.5, color='gray', linestyle='--', linewidth=1, alpha=0.3)
+
+    ax.set_xlabel('ipSAE Score', fontsize=14, fontweight='bold')
+    ax.set_ylabel('High-Precision PAE Contacts (<3Å)', fontsize=14, fontweight='bold')
+    ax.set_title('Correlation Between ipSAE and Interface Quality', fontsize=16, fontweight='bold')
+    ax.legend(loc='upper left', fontsize=11, framealpha=0.9)
+    ax.grid(True, alpha=0.2)
+
+    fig.tight_layout()
+    save_figure(fig, OUTPUT, formats)
+
+    # Calculate statistics by confidence level
+    print("\n=== Statistics by Confidence Level ===")
+    for conf, subset in figure_data.by_confidence.items():
+        print(f"\n{conf} Confidence (n={len(subset)}):")
+        print(f"  Average ipSAE: {subset['ipSAE'].mean():.3f}")
+        print(f"  Average PAE contacts <3Å: {subset['PAE_Contacts_<3A'].mean():.1f}")
+        print(f"  Average interface pLDDT: {subset['Interface_pLDDT'].mean():.1f}")
+        print(f"  Average iPTM: {subset['iPTM'].mean():.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Figure 1B: ipSAE vs PAE contacts')
+    parser.add_argument('--mode', choices=RENDER_MODES, default='auto',
+                        help=f'Rendering mode (auto: hexbin above {LARGE_DATA_THRESHOLD:,} interactions)')
+    args = parser.parse_args()
+    render(FigureData(), mode=args.mode)
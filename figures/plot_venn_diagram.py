@@ -1,99 +1,141 @@
+import json
+import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib_venn import venn2, venn2_circles
-import pandas as pd
 
-# Data from BioGRID validation analysis
-# Total predictions: 548
-# BioGRID validated: 76
-# Literature curated validations: 71 (from experimental_validation in database)
-# Overlap between BioGRID and literature: ~30 (estimate - interactions validated by both sources)
-
-# For a more accurate Venn diagram, we should calculate the actual overlap
-# But based on the analysis, we can estimate:
-total_predictions = 548
-biogrid_validated = 76
-literature_validated = 71
-overlap_estimate = 30  # Conservative estimate
-
-# Venn diagram data
-# Set A (BioGRID): 76 total, ~30 overlap → 46 BioGRID-only
-# Set B (Literature): 71 total, ~30 overlap → 41 Literature-only
-# Overlap: ~30
-# Neither: 548 - 76 - 41 = 431 novel
-
-biogrid_only = biogrid_validated - overlap_estimate
-literature_only = literature_validated - overlap_estimate
-both_sources = overlap_estimate
-novel_predictions = total_predictions - biogrid_validated - literature_only
-
-print(f"BioGRID-only validated: {biogrid_only}")
-print(f"Literature-only validated: {literature_only}")
-print(f"Both sources: {both_sources}")
-print(f"Novel predictions: {novel_predictions}")
-print(f"Total validated (any source): {biogrid_validated + literature_only}")
-
-# Create Venn diagram
-fig, ax = plt.subplots(figsize=(10, 8))
-
-# Venn diagram
-venn = venn2(subsets=(biogrid_only, literature_only, both_sources),
-             set_labels=('BioGRID Experimental\nData', 'Literature-Curated\nValidations'),
-             ax=ax, alpha=0.7)
-
-# Color the circles
-venn.get_patch_by_id('10').set_color('#3498db')  # BioGRID only - blue
-venn.get_patch_by_id('01').set_color('#e74c3c')  # Literature only - red
-venn.get_patch_by_id('11').set_color('#9b59b6')  # Both - purple
-
-# Add circles around patches
-venn_circles = venn2_circles(subsets=(biogrid_only, literature_only, both_sources), ax=ax)
-for circle in venn_circles:
-    circle.set_linewidth(2)
-    circle.set_edgecolor('black')
-
-# Customize labels with larger font
-for text in venn.set_labels:
-    if text:
-        text.set_fontsize(14)
-        text.set_fontweight('bold')
-
-for text in venn.subset_labels:
-    if text:
-        text.set_fontsize(16)
-        text.set_fontweight('bold')
-
-# Add title
-ax.set_title('Experimental Validation of Predicted Interactions\n(n=548 total predictions)',
-             fontsize=16, fontweight='bold', pad=20)
-
-# Add text box with novel predictions
-textstr = f'Novel Predictions\n(no validation):\n{novel_predictions} ({novel_predictions/total_predictions*100:.1f}%)'
-props = dict(boxstyle='round', facecolor='wheat', alpha=0.8, edgecolor='black', linewidth=2)
-ax.text(0.02, 0.98, textstr, transform=ax.transAxes, fontsize=13,
-        verticalalignment='top', bbox=props, fontweight='bold')
-
-# Add legend explaining validation sources
-legend_text = (
-    f'Total Predictions: {total_predictions}\n'
-    f'Validated by BioGRID: {biogrid_validated} ({biogrid_validated/total_predictions*100:.1f}%)\n'
-    f'Validated by Literature: {literature_validated} ({literature_validated/total_predictions*100:.1f}%)\n'
-    f'Validated by Both: {both_sources} ({both_sources/total_predictions*100:.1f}%)\n'
-    f'Total Validated: {biogrid_validated + literature_only} ({(biogrid_validated + literature_only)/total_predictions*100:.1f}%)'
-)
-props2 = dict(boxstyle='round', facecolor='lightblue', alpha=0.3, edgecolor='gray', linewidth=1)
-ax.text(0.02, 0.45, legend_text, transform=ax.transAxes, fontsize=11,
-        verticalalignment='top', bbox=props2, family='monospace')
-
-plt.tight_layout()
-plt.savefig('figures/data/figure2_panel_b_venn.png', dpi=300, bbox_inches='tight')
-print("\n✅ Saved: figures/data/figure2_panel_b_venn.png")
-plt.savefig('figures/data/figure2_panel_b_venn.pdf', bbox_inches='tight')
-print("✅ Saved: figures/data/figure2_panel_b_venn.pdf")
-plt.close()
-
-print("\n=== Venn Diagram Summary ===")
-print(f"BioGRID-only: {biogrid_only} interactions")
-print(f"Literature-only: {literature_only} interactions")
-print(f"Both sources: {both_sources} interactions")
-print(f"Novel (no validation): {novel_predictions} interactions")
-print(f"Total validated: {biogrid_validated + literature_only} ({(biogrid_validated + literature_only)/total_predictions*100:.1f}%)")
+from figure_data import FigureData, save_figure
+from figure_data import PREDICTIONS_CSV, BIOGRID_VALIDATED_CSV, FIGURE_FORMATS
+
+# Results tables this panel reads (used by build_figures.py to detect stale panels)
+INPUTS = [PREDICTIONS_CSV, BIOGRID_VALIDATED_CSV]
+OUTPUT = 'figure2_panel_b_venn'
+
+
+def pair_keys(protein_a, protein_b):
+    """Order-independent 'A|B' keys for two aligned columns of protein IDs"""
+    a = protein_a.fillna('').astype(str).to_numpy(dtype=object)
+    b = protein_b.fillna('').astype(str).to_numpy(dtype=object)
+    low = pd.Series(np.where(a <= b, a, b), index=protein_a.index)
+    high = pd.Series(np.where(a <= b, b, a), index=protein_a.index)
+    return low + '|' + high
+
+
+def literature_validated(validation_details):
+    """True where Validation_Details marks a prediction as experimentally validated"""
+    details = validation_details.dropna().map(json.loads)
+    validated = details.map(lambda d: bool(d.get('validation_summary', {}).get('is_validated')))
+    return validated.reindex(validation_details.index, fill_value=False).astype(bool)
+
+
+def compute_venn_counts(figure_data):
+    """Exact BioGRID / literature overlap over all predictions, via canonical pair keys"""
+    predictions = figure_data.predictions
+    biogrid = figure_data.biogrid_validated
+
+    # Match on UniProt pairs when the BioGRID output has them (MITAB), else on gene symbols (tab3)
+    if {'bait_uniprot', 'prey_uniprot'} <= set(biogrid.columns):
+        our_keys = pair_keys(predictions['Bait_UniProt'], predictions['Prey_UniProt'])
+        biogrid_keys = pair_keys(biogrid['bait_uniprot'], biogrid['prey_uniprot'])
+    else:
+        our_keys = pair_keys(predictions['Bait_Gene'], predictions['Prey_Gene'])
+        biogrid_keys = pair_keys(biogrid['bait_gene'], biogrid['prey_gene'])
+
+    in_biogrid = our_keys.isin(pd.Index(biogrid_keys.unique()))
+    in_literature = literature_validated(predictions['Validation_Details'])
+
+    return {
+        'total_predictions': len(predictions),
+        'biogrid_validated': int(in_biogrid.sum()),
+        'literature_validated': int(in_literature.sum()),
+        'biogrid_only': int((in_biogrid & ~in_literature).sum()),
+        'literature_only': int((in_literature & ~in_biogrid).sum()),
+        'both_sources': int((in_biogrid & in_literature).sum()),
+        'novel_predictions': int((~in_biogrid & ~in_literature).sum()),
+    }
+
+
+def render(figure_data, formats=FIGURE_FORMATS):
+    """Figure 2B: overlap of BioGRID and literature validations"""
+    counts = compute_venn_counts(figure_data)
+    total_predictions = counts['total_predictions']
+    biogrid_validated = counts['biogrid_validated']
+    literature_validated_count = counts['literature_validated']
+    biogrid_only = counts['biogrid_only']
+    literature_only = counts['literature_only']
+    both_sources = counts['both_sources']
+    novel_predictions = counts['novel_predictions']
+    total_validated = biogrid_validated + literature_only
+
+    print(f"BioGRID-only validated: {biogrid_only}")
+    print(f"Literature-only validated: {literature_only}")
+    print(f"Both sources: {both_sources}")
+    print(f"Novel predictions: {novel_predictions}")
+    print(f"Total validated (any source): {total_validated}")
+
+    # Create Venn diagram
+    fig, ax = plt.subplots(figsize=(10, 8))
+
+    # Venn diagram
+    venn = venn2(subsets=(biogrid_only, literature_only, both_sources),
+                 set_labels=('BioGRID Experimental\nData', 'Literature-Curated\nValidations'),
+                 ax=ax, alpha=0.7)
+
+    # Color the circles (regions can be missing when a count is zero)
+    for region, color in [('10', '#3498db'), ('01', '#e74c3c'), ('11', '#9b59b6')]:
+        patch = venn.get_patch_by_id(region)
+        if patch is not None:
+            patch.set_color(color)
+
+    # Add circles around patches
+    venn_circles = venn2_circles(subsets=(biogrid_only, literature_only, both_sources), ax=ax)
+    for circle in venn_circles:
+        circle.set_linewidth(2)
+        circle.set_edgecolor('black')
+
+    # Customize labels with larger font
+    for text in venn.set_labels:
+        if text:
+            text.set_fontsize(14)
+            text.set_fontweight('bold')
+
+    for text in venn.subset_labels:
+        if text:
+            text.set_fontsize(16)
+            text.set_fontweight('bold')
+
+    # Add title
+    ax.set_title(f'Experimental Validation of Predicted Interactions\n(n={total_predictions} total predictions)',
+                 fontsize=16, fontweight='bold', pad=20)
+
+    # Add text box with novel predictions
+    textstr = f'Novel Predictions\n(no validation):\n{novel_predictions} ({novel_predictions/total_predictions*100:.1f}%)'
+    props = dict(boxstyle='round', facecolor='wheat', alpha=0.8, edgecolor='black', linewidth=2)
+    ax.text(0.02, 0.98, textstr, transform=ax.transAxes, fontsize=13,
+            verticalalignment='top', bbox=props, fontweight='bold')
+
+    # Add legend explaining validation sources
+    legend_text = (
+        f'Total Predictions: {total_predictions}\n'
+        f'Validated by BioGRID: {biogrid_validated} ({biogrid_validated/total_predictions*100:.1f}%)\n'
+        f'Validated by Literature: {literature_validated_count} ({literature_validated_count/total_predictions*100:.1f}%)\n'
+        f'Validated by Both: {both_sources} ({both_sources/total_predictions*100:.1f}%)\n'
+        f'Total Validated: {total_validated} ({total_validated/total_predictions*100:.1f}%)'
+    )
+    props2 = dict(boxstyle='round', facecolor='lightblue', alpha=0.3, edgecolor='gray', linewidth=1)
+    ax.text(0.02, 0.45, legend_text, transform=ax.transAxes, fontsize=11,
+            verticalalignment='top', bbox=props2, family='monospace')
+
+    fig.tight_layout()
+    save_figure(fig, OUTPUT, formats)
+
+    print("\n=== Venn Diagram Summary ===")
+    print(f"BioGRID-only: {biogrid_only} interactions")
+    print(f"Literature-only: {literature_only} interactions")
+    print(f"Both sources: {both_sources} interactions")
+    print(f"Novel (no validation): {novel_predictions} interactions")
+    print(f"Total validated: {total_validated} ({total_validated/total_predictions*100:.1f}%)")
+
+
+if __name__ == '__main__':
+    render(FigureData())
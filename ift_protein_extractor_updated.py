@@ -2,20 +2,45 @@
 """
 IFT Protein Extraction Script - Updated with Working API
 Extracts all IFT proteins and their interactors from ciliaaf3predictions database
+
+Set STAGE_TRACE=<file.jsonl> to record per-protein request, JSON parsing and
+rate-limit timings (see scripts/stage_trace.py).
+
+With --shards, the precomputed per-bait payloads written by
+scripts/export_interaction_shards.mjs are loaded in bulk (from the deployment's
+/interaction_shards/ or a local directory) instead of querying the API once per
+bait with a rate-limit pause; baits without a shard still use the API. Shards
+are only used while their data_version matches the database version reported
+by <base url>/api/data-version; otherwise every bait uses the API.
+
+Usage:
+    python ift_protein_extractor_updated.py
+    python ift_protein_extractor_updated.py --shards                                # deployment shards
+    python ift_protein_extractor_updated.py --shards public/interaction_shards      # local export
 """
 
+import sys
 import urllib.request
 import urllib.parse
 import urllib.error
 import json
 import time
+from pathlib import Path
 from typing import List, Dict, Set
 from datetime import datetime
 import csv
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'scripts'))
+from stage_trace import StageTrace, open_trace
 
 class IFTExtractor:
-    def __init__(self, base_url="https://ciliaaf3predictions.vercel.app"):
+    def __init__(self, base_url="https://ciliaaf3predictions.vercel.app", trace=None, shards=None):
         self.base_url = base_url
+        self.trace = trace if trace is not None else StageTrace()
+        self.shards = shards
+        self.shard_payloads = {}
         self.all_interactions = []
         self.processed_proteins = set()
         self.failed_proteins = set()
@@ -120,67 +145,136 @@ class IFTExtractor:
             'A8ILC9': {'gene': 'FAP163', 'complex': 'Motor'},
         }
     
+    def normalize_interaction(self, interaction: Dict, uniprot_id: str, protein_info: Dict) -> Dict:
+        """Process an interaction from the API (or a shard) and normalize the data"""
+        return {
+            'id': interaction.get('id'),
+            'bait_uniprot': interaction.get('bait_uniprot'),
+            'bait_gene': interaction.get('bait_gene'),
+            'bait_complex': protein_info.get('complex', ''),
+            'bait_organism': interaction.get('bait_organism'),
+            'prey_uniprot': interaction.get('prey_uniprot'),
+            'prey_gene': interaction.get('prey_gene'),
+            'prey_organism': interaction.get('prey_organism'),
+
+            # Confidence and scoring metrics
+            'confidence': interaction.get('confidence'),
+            'iptm': interaction.get('iptm'),
+            'interface_plddt': interaction.get('interface_plddt'),
+            'contacts_pae_lt_3': interaction.get('contacts_pae_lt_3'),
+            'contacts_pae_lt_6': interaction.get('contacts_pae_lt_6'),
+
+            # ipSAE scoring (v4 analysis)
+            'ipsae': interaction.get('ipsae'),
+            'ipsae_confidence': interaction.get('ipsae_confidence'),
+            'ipsae_pae_cutoff': interaction.get('ipsae_pae_cutoff'),
+
+            # Version and source information
+            'analysis_version': interaction.get('analysis_version'),
+            'alphafold_version': interaction.get('alphafold_version'),
+            'source_path': interaction.get('source_path'),
+
+            # Experimental validation
+            'experimental_validation': interaction.get('experimental_validation'),
+            'validated': interaction.get('experimental_validation') is not None,
+
+            # Query metadata
+            'query_uniprot': uniprot_id,
+            'query_gene': protein_info.get('gene', ''),
+            'query_complex': protein_info.get('complex', ''),
+            'extraction_timestamp': datetime.now().isoformat()
+        }
+
+    def live_data_version(self):
+        """Database version reported by the deployment (/api/data-version), or None"""
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/api/data-version", timeout=15) as response:
+                return json.loads(response.read().decode('utf-8')).get('data_version')
+        except Exception as e:
+            print(f"Could not fetch the database version from {self.base_url}: {e}")
+            return None
+
+    def load_shards(self, uniprot_ids):
+        """
+        Bulk-load precomputed /api/interactions payloads for the given baits
+        from self.shards (a URL or a local directory with index.json)
+        """
+        source = str(self.shards).rstrip('/')
+        is_url = source.startswith(('http://', 'https://'))
+
+        def read(name):
+            if is_url:
+                with urllib.request.urlopen(f"{source}/{name}", timeout=15) as response:
+                    return json.loads(response.read().decode('utf-8'))
+            with open(Path(source) / name) as f:
+                return json.load(f)
+
+        try:
+            index = read('index.json')
+        except Exception as e:
+            print(f"Could not load shard index from {source}: {e}")
+            return
+
+        # Stale shards (database changed since the export) are not used at all
+        live_version = self.live_data_version()
+        if not index.get('data_version') or index['data_version'] != live_version:
+            print(f"⚠️  Shards in {source} do not match the database "
+                  f"(exported: {index.get('data_version')}, live: {live_version}); using the API")
+            return
+
+        # A shard that fails to load is left out, so that bait falls back to the API
+        def read_shard(uniprot_id):
+            try:
+                return read(index['shards'][uniprot_id]['file'])
+            except Exception as e:
+                print(f"  Could not load shard for {uniprot_id}, using the API: {e}")
+                return None
+
+        wanted = [uniprot_id for uniprot_id in uniprot_ids if uniprot_id in index.get('shards', {})]
+        with ThreadPoolExecutor(max_workers=8 if is_url else 1) as pool:
+            for uniprot_id, payload in zip(wanted, pool.map(read_shard, wanted)):
+                if payload is not None:
+                    self.shard_payloads[uniprot_id] = payload
+        print(f"Loaded {len(self.shard_payloads)}/{len(uniprot_ids)} bait shards from {source} "
+              f"(generated {index.get('generated_at', 'unknown')})")
+    
     def query_protein(self, uniprot_id: str, protein_info: Dict) -> List[Dict]:
         """
         Query a single protein and get all its interactions
         """
         print(f"Querying {uniprot_id} ({protein_info.get('gene', 'Unknown')})")
         
+        # Precomputed shard: same payload as the API, no request or rate limit
+        if uniprot_id in self.shard_payloads:
+            data = self.shard_payloads[uniprot_id]
+            interactions = [self.normalize_interaction(interaction, uniprot_id, protein_info)
+                            for interaction in data.get('interactions', [])]
+            self.processed_proteins.add(uniprot_id)
+            print(f"  Found {len(interactions)} interactions (shard)")
+            return interactions
+        
         # Use the discovered working API endpoint
         api_url = f"{self.base_url}/api/interactions/{uniprot_id}"
         
         try:
-            with urllib.request.urlopen(api_url, timeout=15) as response:
+            with self.trace.stage('http_request'):
+                response = urllib.request.urlopen(api_url, timeout=15)
+            with response:
                 if response.getcode() == 200:
-                    data = json.loads(response.read().decode('utf-8'))
+                    with self.trace.stage('http_read'):
+                        content = response.read()
+                    with self.trace.stage('parse_json'):
+                        data = json.loads(content.decode('utf-8'))
                     
-                    interactions = []
-                    for interaction in data.get('interactions', []):
-                        # Process each interaction and normalize the data
-                        processed_interaction = {
-                            'id': interaction.get('id'),
-                            'bait_uniprot': interaction.get('bait_uniprot'),
-                            'bait_gene': interaction.get('bait_gene'),
-                            'bait_complex': protein_info.get('complex', ''),
-                            'bait_organism': interaction.get('bait_organism'),
-                            'prey_uniprot': interaction.get('prey_uniprot'),
-                            'prey_gene': interaction.get('prey_gene'),
-                            'prey_organism': interaction.get('prey_organism'),
-                            
-                            # Confidence and scoring metrics
-                            'confidence': interaction.get('confidence'),
-                            'iptm': interaction.get('iptm'),
-                            'interface_plddt': interaction.get('interface_plddt'),
-                            'contacts_pae_lt_3': interaction.get('contacts_pae_lt_3'),
-                            'contacts_pae_lt_6': interaction.get('contacts_pae_lt_6'),
-                            
-                            # ipSAE scoring (v4 analysis)
-                            'ipsae': interaction.get('ipsae'),
-                            'ipsae_confidence': interaction.get('ipsae_confidence'),
-                            'ipsae_pae_cutoff': interaction.get('ipsae_pae_cutoff'),
-                            
-                            # Version and source information
-                            'analysis_version': interaction.get('analysis_version'),
-                            'alphafold_version': interaction.get('alphafold_version'),
-                            'source_path': interaction.get('source_path'),
-                            
-                            # Experimental validation
-                            'experimental_validation': interaction.get('experimental_validation'),
-                            'validated': interaction.get('experimental_validation') is not None,
-                            
-                            # Query metadata
-                            'query_uniprot': uniprot_id,
-                            'query_gene': protein_info.get('gene', ''),
-                            'query_complex': protein_info.get('complex', ''),
-                            'extraction_timestamp': datetime.now().isoformat()
-                        }
-                        interactions.append(processed_interaction)
+                    interactions = [self.normalize_interaction(interaction, uniprot_id, protein_info)
+                                    for interaction in data.get('interactions', [])]
                     
                     self.processed_proteins.add(uniprot_id)
                     print(f"  Found {len(interactions)} interactions")
                     
                     # Rate limiting
-                    time.sleep(1)
+                    with self.trace.stage('rate_limit'):
+                        time.sleep(1)
                     
                     return interactions
                 else:
@@ -201,22 +295,29 @@ class IFTExtractor:
         
         for i, (uniprot_id, protein_info) in enumerate(protein_dict.items(), 1):
             print(f"\n[{i}/{len(protein_dict)}] Processing {protein_info.get('gene', uniprot_id)}")
-            interactions = self.query_protein(uniprot_id, protein_info)
+            with self.trace.item(uniprot_id, species=species_name) as item:
+                interactions = self.query_protein(uniprot_id, protein_info)
+                item['status'] = 'failed' if uniprot_id in self.failed_proteins else 'ok'
+                item['interactions'] = len(interactions)
             self.all_interactions.extend(interactions)
     
     def extract_all_ift_and_bbsome_proteins(self):
         """Main extraction function for IFT and BBSome proteins"""
+        human_ift = self.get_human_ift_proteins()
+        bbsome = self.get_bbsome_proteins()
+        chlamydomonas_ift = self.get_chlamydomonas_ift_proteins()
+        
+        if self.shards:
+            with self.trace.stage('load_shards'):
+                self.load_shards([*human_ift, *bbsome, *chlamydomonas_ift])
         
         # Extract human IFT proteins
-        human_ift = self.get_human_ift_proteins()
         self.extract_proteins(human_ift, "Human IFT")
         
         # Extract BBSome proteins  
-        bbsome = self.get_bbsome_proteins()
         self.extract_proteins(bbsome, "BBSome")
         
         # Extract Chlamydomonas IFT proteins
-        chlamydomonas_ift = self.get_chlamydomonas_ift_proteins()
         self.extract_proteins(chlamydomonas_ift, "Chlamydomonas IFT")
         
         return self.all_interactions
@@ -338,16 +439,27 @@ class IFTExtractor:
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Extract IFT and BBSome protein interactions')
+    parser.add_argument('--shards', nargs='?', const='', default=None, metavar='SOURCE',
+                        help='Load precomputed bait shards in bulk (URL or directory; '
+                             'default: <base url>/interaction_shards)')
+    args = parser.parse_args()
+    
     print("IFT and BBSome Protein Interaction Extractor")
     print("="*60)
     
-    extractor = IFTExtractor()
+    trace = open_trace(script='ift_protein_extractor_updated.py')
+    extractor = IFTExtractor(trace=trace)
+    if args.shards is not None:
+        extractor.shards = args.shards or f"{extractor.base_url}/interaction_shards"
     
     # Extract all proteins and their interactions
     interactions = extractor.extract_all_ift_and_bbsome_proteins()
     
     # Save results
-    extractor.save_results()
+    with trace.stage('save_results'):
+        extractor.save_results()
+    trace.close()
     
     print(f"\nExtraction complete! Found {len(interactions)} total interactions.")
 
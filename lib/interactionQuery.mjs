@@ -0,0 +1,244 @@
+/**
+ * Interaction Queries
+ * ===================
+ *
+ * SQL behind /api/interactions/[id] and /api/baits, shared by the routes and
+ * scripts/export_interaction_shards.mjs so that precomputed shards contain
+ * exactly what the routes would return from the database.
+ */
+
+/**
+ * Split an optional organism prefix off a search term
+ * Supports both "Hs:BBS7" (with colon) and "HsBBS7" (without colon)
+ */
+export function parseSearchTerm(id) {
+  let searchTerm = id;
+  let organismCode = null;
+
+  // Try matching with colon first (e.g., "Hs:BBS7" or "Cr:IFT144")
+  const colonMatch = searchTerm.match(/^([A-Z][a-z]):(.+)$/);
+  if (colonMatch) {
+    organismCode = colonMatch[1];
+    searchTerm = colonMatch[2];
+  } else {
+    // Try matching without colon (e.g., "HsBBS7" or "CrIFT144")
+    // Only match known organism codes to avoid false positives
+    const noColonMatch = searchTerm.match(/^(Hs|Cr|Mm|Dm|Ce|Sc|Dr|Xl|Rn)(.+)$/i);
+    if (noColonMatch) {
+      organismCode = noColonMatch[1].charAt(0).toUpperCase() + noColonMatch[1].charAt(1).toLowerCase();
+      searchTerm = noColonMatch[2];
+    }
+  }
+
+  return { searchTerm, organismCode };
+}
+
+/**
+ * Query and parameters for /api/interactions/[id]
+ * filterMode: 'v3' or 'ipsae'; confidenceLevels: e.g. ['High', 'AF2']
+ */
+export function buildInteractionQuery(id, confidenceLevels = [], filterMode = 'v3') {
+  const { searchTerm, organismCode } = parseSearchTerm(id);
+
+  let query = `
+    SELECT
+      i.id,
+      i.iptm,
+      i.confidence,
+      i.alphafold_version,
+      i.source_path,
+      i.contacts_pae_lt_3,
+      i.contacts_pae_lt_6,
+      i.interface_plddt,
+      i.ipsae,
+      i.ipsae_confidence,
+      i.analysis_version,
+      i.experimental_validation,
+      bait.uniprot_id as bait_uniprot,
+      bait.gene_name as bait_gene,
+      bait.organism as bait_organism,
+      bait.organism_code as bait_organism_code,
+      bait.common_name as bait_common_name,
+      prey.uniprot_id as prey_uniprot,
+      prey.gene_name as prey_gene,
+      prey.organism as prey_organism,
+      prey.organism_code as prey_organism_code,
+      prey.common_name as prey_common_name
+    FROM interactions i
+    JOIN proteins bait ON i.bait_protein_id = bait.id
+    JOIN proteins prey ON i.prey_protein_id = prey.id
+    WHERE i.id IN (
+      SELECT DISTINCT i2.id
+      FROM interactions i2
+      JOIN proteins bait2 ON i2.bait_protein_id = bait2.id
+      JOIN proteins prey2 ON i2.prey_protein_id = prey2.id
+      LEFT JOIN protein_aliases bait_aliases ON bait2.id = bait_aliases.protein_id
+      LEFT JOIN protein_aliases prey_aliases ON prey2.id = prey_aliases.protein_id
+      WHERE (
+        bait2.uniprot_id = $1 OR prey2.uniprot_id = $1 OR
+        bait2.uniprot_id ILIKE '%' || $1 || '%' OR prey2.uniprot_id ILIKE '%' || $1 || '%' OR
+        bait2.gene_name ILIKE '%' || $1 || '%' OR prey2.gene_name ILIKE '%' || $1 || '%' OR
+        bait2.common_name ILIKE '%' || $1 || '%' OR prey2.common_name ILIKE '%' || $1 || '%' OR
+        bait_aliases.alias_name ILIKE '%' || $1 || '%' OR prey_aliases.alias_name ILIKE '%' || $1 || '%' OR
+        i2.source_path ILIKE '%' || $1 || '%'
+      )
+      ${organismCode ? `AND ((bait2.organism_code = $${organismCode ? 2 : 1}) OR (prey2.organism_code = $${organismCode ? 2 : 1}))` : ''}
+    )
+  `;
+
+  let queryParams = [searchTerm];
+  if (organismCode) {
+    queryParams.push(organismCode);
+  }
+
+  // Apply filtering based on mode
+  if (filterMode === 'ipsae') {
+    // ipSAE mode: STRICT - only show v4 data with ipSAE scores
+    query += ` AND i.ipsae IS NOT NULL`;
+
+    if (confidenceLevels.length > 0) {
+      const confidenceParamNum = queryParams.length + 1;
+      query += ` AND i.ipsae_confidence = ANY($${confidenceParamNum})`;
+      queryParams.push(confidenceLevels);
+    }
+  } else {
+    // v3 mode: Interface quality filtering - all data
+    if (confidenceLevels.length > 0) {
+      // Check if "AF2" is in the confidence filter
+      const includeAF2 = confidenceLevels.includes('AF2');
+      // Remove "AF2" from the array (it's not a database enum value)
+      const dbConfidenceLevels = confidenceLevels.filter((c) => c !== 'AF2');
+
+      if (dbConfidenceLevels.length > 0 && includeAF2) {
+        // Both AF3 confidence levels AND AF2 requested
+        const confidenceParamNum = queryParams.length + 1;
+        query += ` AND (i.confidence = ANY($${confidenceParamNum}) OR (i.alphafold_version = 'AF2' AND i.confidence IS NULL))`;
+        queryParams.push(dbConfidenceLevels);
+      } else if (dbConfidenceLevels.length > 0) {
+        // Only AF3 confidence levels (no AF2)
+        const confidenceParamNum = queryParams.length + 1;
+        query += ` AND i.confidence = ANY($${confidenceParamNum})`;
+        queryParams.push(dbConfidenceLevels);
+      } else if (includeAF2) {
+        // Only AF2 requested
+        query += ` AND i.alphafold_version = 'AF2' AND i.confidence IS NULL`;
+      }
+    }
+  }
+
+  // Different sorting logic based on mode
+  if (filterMode === 'ipsae') {
+    // ipSAE mode: Sort by ipSAE confidence tier, then ipSAE score
+    query += ` ORDER BY
+      CASE i.ipsae_confidence
+        WHEN 'High' THEN 1
+        WHEN 'Medium' THEN 2
+        WHEN 'Low' THEN 3
+        ELSE 4
+      END,
+      i.ipsae DESC NULLS LAST,
+      i.iptm DESC`;
+  } else {
+    // v3 mode: Interface quality sorting
+    query += ` ORDER BY
+      -- AF3 first, AF2 last
+      CASE WHEN i.alphafold_version = 'AF3' THEN 1 ELSE 2 END,
+      -- New confidence classification for AF3
+      CASE
+        -- High: iPTM ≥ 0.7 OR (contacts ≥ 40 AND ipLDDT ≥ 80) OR (contacts ≥ 30 AND iPTM ≥ 0.5 AND ipLDDT ≥ 80)
+        -- BUT exclude if iPTM < 0.75 AND contacts < 5
+        WHEN i.alphafold_version = 'AF3' AND (
+          i.iptm >= 0.7 OR
+          (i.contacts_pae_lt_3 >= 40 AND i.interface_plddt >= 80) OR
+          (i.contacts_pae_lt_3 >= 30 AND i.iptm >= 0.5 AND i.interface_plddt >= 80)
+        ) AND NOT (i.iptm < 0.75 AND COALESCE(i.contacts_pae_lt_3, 0) < 5) THEN 1
+        -- Medium: iPTM ≥ 0.6 OR (contacts ≥ 20 AND ipLDDT ≥ 75) OR (contacts ≥ 15 AND iPTM ≥ 0.45)
+        WHEN i.alphafold_version = 'AF3' AND (
+          i.iptm >= 0.6 OR
+          (i.contacts_pae_lt_3 >= 20 AND i.interface_plddt >= 75) OR
+          (i.contacts_pae_lt_3 >= 15 AND i.iptm >= 0.45)
+        ) THEN 2
+        -- Low: Everything else
+        WHEN i.alphafold_version = 'AF3' THEN 3
+        -- AF2: No confidence tiers, just sort by iPTM
+        ELSE 4
+      END,
+      -- Within each tier, sort by contacts (for AF3) and iPTM
+      COALESCE(i.contacts_pae_lt_3, 0) DESC,
+      i.iptm DESC`;
+  }
+
+  return { query, queryParams };
+}
+
+/**
+ * Same rows as the v3 confidence filter in buildInteractionQuery, applied to
+ * an unfiltered v3 result (filtering does not change the v3 ordering)
+ */
+export function filterV3Confidence(rows, confidenceLevels) {
+  if (confidenceLevels.length === 0) return rows;
+
+  const includeAF2 = confidenceLevels.includes('AF2');
+  const dbConfidenceLevels = confidenceLevels.filter((c) => c !== 'AF2');
+  return rows.filter((row) =>
+    dbConfidenceLevels.includes(row.confidence) ||
+    (includeAF2 && row.alphafold_version === 'AF2' && row.confidence === null)
+  );
+}
+
+/**
+ * Alias table check reported in the /api/interactions debug field
+ */
+export async function fetchDebugInfo(client) {
+  let debugInfo = {};
+  try {
+    const tableCheck = await client.query("SELECT COUNT(*) FROM protein_aliases");
+    debugInfo.aliasCount = tableCheck.rows[0].count;
+  } catch (e) {
+    debugInfo.aliasTableError = e.message;
+  }
+  return debugInfo;
+}
+
+/**
+ * All bait proteins with interaction counts (/api/baits)
+ */
+export const BAITS_QUERY = `
+      SELECT DISTINCT
+        bait.uniprot_id,
+        bait.gene_name,
+        bait.organism,
+        bait.organism_code,
+        COUNT(i.id) as interaction_count
+      FROM interactions i
+      JOIN proteins bait ON i.bait_protein_id = bait.id
+      GROUP BY bait.uniprot_id, bait.gene_name, bait.organism, bait.organism_code
+      HAVING COUNT(i.id) > 0
+      ORDER BY bait.gene_name ASC, bait.uniprot_id ASC
+    `;
+
+/**
+ * Content version of everything the interaction and bait responses read:
+ * interactions (including experimental_validation), proteins and aliases.
+ * Any insert, update or delete changes it; hashing ~1k rows takes milliseconds,
+ * far less than the search query itself.
+ */
+export const DATA_VERSION_QUERY = `
+      SELECT md5(
+        (SELECT COALESCE(string_agg(md5(i::text), '' ORDER BY i.id), '') FROM interactions i) ||
+        (SELECT COALESCE(string_agg(md5(p::text), '' ORDER BY p.id), '') FROM proteins p) ||
+        (SELECT COALESCE(string_agg(md5(a::text), '' ORDER BY md5(a::text)), '') FROM protein_aliases a)
+      ) AS version
+    `;
+
+/**
+ * Current data version, or null if it cannot be determined
+ */
+export async function fetchDataVersion(client) {
+  try {
+    const { rows } = await client.query(DATA_VERSION_QUERY);
+    return rows[0].version;
+  } catch (e) {
+    return null;
+  }
+}
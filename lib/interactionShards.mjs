@@ -0,0 +1,115 @@
+/**
+ * Precomputed Interaction Shards
+ * ==============================
+ *
+ * Reads the static payloads written by scripts/export_interaction_shards.mjs
+ * to public/interaction_shards/:
+ *
+ * - index.json       {generated_at, data_version, count, shards: {UNIPROT: {file, gene_name, interactions, sha256}}}
+ * - baits.json       /api/baits response
+ * - <UNIPROT>.json   /api/interactions/<UNIPROT> response (v3 mode, no confidence filter)
+ *
+ * Shards are only served while the database is unchanged since the export:
+ * index.json records the data version (DATA_VERSION_QUERY) at export time and
+ * readers compare it with the live version. The live version is fetched at
+ * most once per VERSION_TTL_MS per process (through the pool, without holding
+ * a connection), so a shard hit is a file read; a database write is noticed
+ * within that window. Readers return null when no shard exists or the shards
+ * are stale, and the routes fall back to SQL.
+ */
+
+import { readFile, stat } from 'fs/promises';
+import path from 'path';
+import { fetchDataVersion } from './interactionQuery.mjs';
+
+export const SHARD_DIR = path.join(process.cwd(), 'public', 'interaction_shards');
+
+// How long a fetched database version is trusted before it is checked again
+export const VERSION_TTL_MS = 60 * 1000;
+
+// index.json, reloaded when the export rewrites it
+let shardIndex = null;
+let shardIndexMtime = 0;
+let warnedStaleVersion = null;
+
+// Live database version, shared by concurrent requests while it is fetched
+let liveVersion = null;
+let liveVersionAt = 0;
+let liveVersionPending = null;
+
+async function readJson(filePath) {
+  try {
+    return JSON.parse(await readFile(filePath, 'utf8'));
+  } catch (error) {
+    if (error.code === 'ENOENT') return null;
+    throw error;
+  }
+}
+
+export async function loadShardIndex() {
+  let mtime;
+  try {
+    mtime = (await stat(path.join(SHARD_DIR, 'index.json'))).mtimeMs;
+  } catch {
+    return null;
+  }
+  if (!shardIndex || mtime !== shardIndexMtime) {
+    shardIndex = await readJson(path.join(SHARD_DIR, 'index.json'));
+    shardIndexMtime = mtime;
+  }
+  return shardIndex;
+}
+
+/**
+ * Database version, cached for VERSION_TTL_MS (null if it cannot be determined)
+ * db: anything with query(), e.g. the @vercel/postgres pool
+ */
+export async function currentDataVersion(db) {
+  if (Date.now() - liveVersionAt < VERSION_TTL_MS) return liveVersion;
+  if (!liveVersionPending) {
+    liveVersionPending = fetchDataVersion(db)
+      .then((version) => {
+        liveVersion = version;
+        liveVersionAt = Date.now();
+        return version;
+      })
+      .finally(() => {
+        liveVersionPending = null;
+      });
+  }
+  return liveVersionPending;
+}
+
+/**
+ * True if the shards were exported from the database as it is now
+ */
+async function shardsCurrent(index, db) {
+  if (!index.data_version) return false;
+  const version = await currentDataVersion(db);
+  if (version === index.data_version) return true;
+  if (warnedStaleVersion !== index.data_version) {
+    console.warn('Interaction shards are stale (database changed since export); serving from SQL. ' +
+      'Re-run scripts/export_interaction_shards.mjs');
+    warnedStaleVersion = index.data_version;
+  }
+  return false;
+}
+
+/**
+ * Precomputed /api/interactions payload for a bait UniProt ID, or null
+ */
+export async function readInteractionShard(id, db) {
+  const index = await loadShardIndex();
+  const entry = index?.shards?.[id];
+  if (!entry || !(await shardsCurrent(index, db))) return null;
+  return readJson(path.join(SHARD_DIR, entry.file));
+}
+
+/**
+ * Precomputed /api/baits payload, or null
+ */
+export async function readBaitsShard(db) {
+  const index = await loadShardIndex();
+  if (!index || !(await shardsCurrent(index, db))) return null;
+  return readJson(path.join(SHARD_DIR, 'baits.json'));
+}
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Compact atom store for AlphaFold3 model CIFs.
+
+Each model's mmCIF atom_site table is parsed once into a per-structure
+directory of NumPy arrays under data/structures/atoms/<cif stem>/:
+
+- coords.npy      float32 (n_atoms, 3) Cartesian coordinates
+- residue.npy     int32   label_seq_id
+- chain.npy       uint8   index into meta['chains'] (label_asym_id)
+- element.npy     uint8   index into meta['elements']
+- atom_name.npy   uint8   index into meta['atom_names']
+- b_factor.npy    float32 B_iso_or_equiv (per-atom pLDDT for AF3 models)
+- meta.json       chains, code tables, one-letter sequences per chain and the
+                  source CIF path, size and mtime
+
+Arrays are plain .npy files, so AtomStore opens them memory-mapped: loading a
+structure costs a few file opens instead of a text parse, and only the pages
+an analysis touches are read. A store is rebuilt when the source CIF's size or
+mtime changes.
+
+AtomStore implements the parts of interface_analysis.CIFParser used by the
+contact extractor (parse_atoms, get_sequences, calculate_min_distance), so
+extract_contacts_for_web.py --atom-store reads structures from the store;
+min_distances() validates all PAE candidates of a structure in one vectorized
+pass. Other analyses can use the arrays directly. Coordinates are float32, so
+distances can differ from CIF-text parsing in the last rounded digit (0.01 A).
+
+Only polymer atoms are stored: ligands, ions and waters have no label_seq_id
+('.') and are skipped (their count is kept in meta['non_polymer_atoms']).
+
+Requirements:
+    pip install numpy
+
+Usage:
+    # Convert every found structure in cif_manifest.json
+    python3 scripts/atom_store.py --batch
+
+    # Convert specific CIF files, rebuilding existing stores
+    python3 scripts/atom_store.py path/to/x_model.cif --force
+"""
+
+import os
+import sys
+import json
+import argparse
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+STORE_DIR = Path("data/structures/atoms")
+META = "meta.json"
+ARRAYS = ('coords', 'residue', 'chain', 'element', 'atom_name', 'b_factor')
+DEFAULT_WORKERS = 4
+
+THREE_TO_ONE = {
+    'ALA': 'A', 'ARG': 'R', 'ASN': 'N', 'ASP': 'D', 'CYS': 'C', 'GLN': 'Q', 'GLU': 'E', 'GLY': 'G',
+    'HIS': 'H', 'ILE': 'I', 'LEU': 'L', 'LYS': 'K', 'MET': 'M', 'PHE': 'F', 'PRO': 'P', 'SER': 'S',
+    'THR': 'T', 'TRP': 'W', 'TYR': 'Y', 'VAL': 'V', 'SEC': 'U', 'PYL': 'O',
+}
+
+
+def store_path(cif_path, store_dir=STORE_DIR):
+    """Store directory for a model CIF"""
+    return Path(store_dir) / Path(cif_path).stem
+
+
+def _source_stat(cif_path):
+    stat = os.stat(cif_path)
+    return {'path': str(cif_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def is_current(cif_path, store_dir=STORE_DIR):
+    """Whether a store exists and was built from the CIF as it is now"""
+    meta_file = store_path(cif_path, store_dir) / META
+    if not meta_file.exists():
+        return False
+    with open(meta_file) as f:
+        source = json.load(f).get('source', {})
+    stat = _source_stat(cif_path)
+    return source.get('size') == stat['size'] and source.get('mtime_ns') == stat['mtime_ns']
+
+
+def read_atom_site(cif_path):
+    """Columns of the mmCIF atom_site loop as lists of strings"""
+    columns, rows = [], []
+    with open(cif_path) as f:
+        for line in f:
+            if line.startswith('_atom_site.'):
+                columns.append(line.split('.', 1)[1].strip())
+            elif columns and line.startswith(('ATOM', 'HETATM')):
+                rows.append(line.split())
+            elif rows and line.startswith(('#', 'loop_', '_')):
+                break
+    if not rows:
+        return {}
+    values = list(zip(*rows))
+    # AF3 quotes atom names containing primes, e.g. "O5'"
+    return {column: [v.strip('"\'') for v in values[i]] if column == 'label_atom_id' else values[i]
+            for i, column in enumerate(columns)}
+
+
+def _codes(values):
+    """uint8 codes and the code table for a column of strings"""
+    table, codes = np.unique(np.asarray(values), return_inverse=True)
+    if len(table) > 255:
+        raise ValueError(f"More than 255 distinct values ({len(table)}) for a uint8 code column")
+    return codes.astype(np.uint8), table.tolist()
+
+
+def convert_cif(cif_path, store_dir=STORE_DIR, force=False):
+    """Parse a model CIF into its atom store (skipped if current); returns the store path"""
+    path = store_path(cif_path, store_dir)
+    if not force and is_current(cif_path, store_dir):
+        return path
+
+    site = read_atom_site(cif_path)
+    if not site:
+        raise ValueError(f"No atom_site records in {cif_path}")
+
+    # Non-polymer atoms (ligands, ions) have no residue number
+    polymer = [i for i, seq_id in enumerate(site['label_seq_id']) if seq_id not in ('.', '?')]
+    non_polymer_atoms = len(site['label_seq_id']) - len(polymer)
+    if non_polymer_atoms:
+        site = {column: [values[i] for i in polymer] for column, values in site.items()}
+    if not polymer:
+        raise ValueError(f"No polymer atoms in {cif_path}")
+
+    # Chain codes in order of first appearance, so chain index 0 is the first chain
+    chain_ids = site['label_asym_id']
+    chains = list(dict.fromkeys(chain_ids))
+    chain_index = {chain: i for i, chain in enumerate(chains)}
+    chain = np.fromiter((chain_index[c] for c in chain_ids), dtype=np.uint8, count=len(chain_ids))
+    residue = np.asarray(site['label_seq_id'], dtype=np.int32)
+    element, elements = _codes(site['type_symbol'])
+    atom_name, atom_names = _codes(site['label_atom_id'])
+    coords = np.column_stack([np.asarray(site[axis], dtype=np.float32)
+                              for axis in ('Cartn_x', 'Cartn_y', 'Cartn_z')])
+    b_factor = np.asarray(site['B_iso_or_equiv'], dtype=np.float32)
+
+    # One-letter sequence per chain from the first atom of each residue
+    sequences = {}
+    comps = site['label_comp_id']
+    previous = None
+    for i, key in enumerate(zip(chain_ids, site['label_seq_id'])):
+        if key != previous:
+            sequences[key[0]] = sequences.get(key[0], '') + THREE_TO_ONE.get(comps[i], 'X')
+            previous = key
+
+    path.mkdir(parents=True, exist_ok=True)
+    (path / META).unlink(missing_ok=True)
+    arrays = {'coords': coords, 'residue': residue, 'chain': chain, 'element': element,
+              'atom_name': atom_name, 'b_factor': b_factor}
+    for name, array in arrays.items():
+        np.save(path / f"{name}.npy", array)
+    meta = {
+        'n_atoms': len(coords),
+        'chains': chains,
+        'elements': elements,
+        'atom_names': atom_names,
+        'sequences': sequences,
+        'non_polymer_atoms': non_polymer_atoms,
+        'source': _source_stat(cif_path),
+    }
+    # meta.json is written last: a store without it is incomplete and gets rebuilt
+    with open(path / META, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+class AtomStore:
+    """Memory-mapped atoms of one structure; drop-in for the CIFParser methods the extractor uses"""
+
+    def __init__(self, path, mmap=True):
+        self.path = Path(path)
+        with open(self.path / META) as f:
+            self.meta = json.load(f)
+        mode = 'r' if mmap else None
+        for name in ARRAYS:
+            setattr(self, name, np.load(self.path / f"{name}.npy", mmap_mode=mode))
+        self.chains = self.meta['chains']
+        self._residues = None
+        self._padded = None
+
+    @classmethod
+    def for_cif(cls, cif_path, store_dir=STORE_DIR):
+        """Open the store for a CIF, converting it first if missing or stale"""
+        return cls(convert_cif(cif_path, store_dir))
+
+    def __len__(self):
+        return self.meta['n_atoms']
+
+    def residue_atoms(self):
+        """(chain, label_seq_id) -> (start, stop) atom range; atoms of a residue are contiguous"""
+        if self._residues is None:
+            chain, residue = np.asarray(self.chain), np.asarray(self.residue)
+            starts = np.flatnonzero(np.r_[True, (chain[1:] != chain[:-1]) | (residue[1:] != residue[:-1])])
+            stops = np.r_[starts[1:], len(chain)]
+            self._residues = {(self.chains[c], r): (s, e) for c, r, s, e in
+                              zip(chain[starts].tolist(), residue[starts].tolist(), starts.tolist(), stops.tolist())}
+        return self._residues
+
+    def _residue_blocks(self):
+        """Residue row per (chain, label_seq_id), plus coordinates padded to (n_residues, max_atoms, 3) and a validity mask"""
+        if self._padded is None:
+            residues = self.residue_atoms()
+            row = {key: i for i, key in enumerate(residues)}
+            sizes = np.array([stop - start for start, stop in residues.values()])
+            coords = np.asarray(self.coords, dtype=np.float64)
+            padded = np.zeros((len(residues), sizes.max(), 3))
+            valid = np.arange(sizes.max())[None, :] < sizes[:, None]
+            padded[valid] = coords[np.concatenate([np.arange(start, stop) for start, stop in residues.values()])]
+            self._padded = (row, padded, valid)
+        return self._padded
+
+    def min_distances(self, pairs, chunk_size=4096):
+        """
+        Minimum atom-atom distances for many residue pairs at once.
+
+        pairs: sequence of (chain1, res1, chain2, res2); returns a float64 array
+        (inf where either residue is absent).
+        """
+        row, padded, valid = self._residue_blocks()
+        missing = len(padded)
+        rows1 = np.array([row.get((c1, r1), missing) for c1, r1, _, _ in pairs], dtype=np.int64)
+        rows2 = np.array([row.get((c2, r2), missing) for _, _, c2, r2 in pairs], dtype=np.int64)
+        # An extra all-invalid residue row stands in for absent residues
+        padded = np.concatenate([padded, np.zeros((1,) + padded.shape[1:])])
+        valid = np.concatenate([valid, np.zeros((1, valid.shape[1]), dtype=bool)])
+
+        distances = np.empty(len(pairs))
+        for start in range(0, len(pairs), chunk_size):
+            r1, r2 = rows1[start:start + chunk_size], rows2[start:start + chunk_size]
+            diff = padded[r1][:, :, None, :] - padded[r2][:, None, :, :]
+            squared = np.einsum('nijk,nijk->nij', diff, diff)
+            squared[~(valid[r1][:, :, None] & valid[r2][:, None, :])] = np.inf
+            distances[start:start + chunk_size] = np.sqrt(squared.min(axis=(1, 2)))
+        return distances
+
+    def chain_atoms(self, chain_id):
+        """Boolean mask of the atoms in a chain"""
+        return np.asarray(self.chain) == self.chains.index(chain_id)
+
+    # CIFParser interface
+
+    def parse_atoms(self):
+        print(f"  Loaded {len(self)} atoms from atom store")
+        return len(self) > 0
+
+    def get_sequences(self):
+        sequences = dict(self.meta['sequences'])
+        print(f"  Extracted sequences for chains: {list(sequences.keys())}")
+        return sequences
+
+    def calculate_min_distance(self, chain1, res1, chain2, res2):
+        """Minimum atom-atom distance between two residues (inf if either is absent)"""
+        residues = self.residue_atoms()
+        span1, span2 = residues.get((chain1, res1)), residues.get((chain2, res2))
+        if span1 is None or span2 is None:
+            return float('inf')
+        a = np.asarray(self.coords[span1[0]:span1[1]], dtype=np.float64)
+        b = np.asarray(self.coords[span2[0]:span2[1]], dtype=np.float64)
+        return float(np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1).min()))
+
+
+def _convert(args):
+    cif_path, store_dir, force = args
+    try:
+        return cif_path, convert_cif(cif_path, store_dir, force), None
+    except (OSError, ValueError) as e:
+        return cif_path, None, str(e)
+
+
+def manifest_cif_paths(manifest_file="cif_manifest.json"):
+    """CIF paths of found entries in the CIF manifest (each once; several entries can share a CIF)"""
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    entries = manifest.get('entries', manifest.get('mappings', {}))
+    return list(dict.fromkeys(entry['cif_path'] for entry in entries.values()
+                              if entry.get('cif_path') and entry.get('status', 'found') == 'found'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert model CIFs into memory-mappable atom stores')
+    parser.add_argument('cif_files', nargs='*', help='CIF files to convert')
+    parser.add_argument('--batch', action='store_true', help='Convert all found structures in cif_manifest.json')
+    parser.add_argument('--manifest', default='cif_manifest.json', help='CIF manifest for --batch')
+    parser.add_argument('--store', default=str(STORE_DIR), help=f'Store directory (default: {STORE_DIR})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Parallel conversions')
+    parser.add_argument('--force', action='store_true', help='Rebuild stores even if current')
+    args = parser.parse_args()
+
+    cif_files = list(args.cif_files)
+    if args.batch:
+        cif_files = list(dict.fromkeys(cif_files + manifest_cif_paths(args.manifest)))
+    if not cif_files:
+        parser.error("give CIF files or --batch")
+
+    print(f"Converting {len(cif_files)} structures into {args.store} ({args.workers} workers)")
+    converted = failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = [(path, args.store, args.force) for path in cif_files]
+        for i, (cif_path, path, error) in enumerate(pool.map(_convert, jobs, chunksize=4), 1):
+            if error:
+                failed += 1
+                print(f"  ✗ {cif_path}: {error}")
+            else:
+                converted += 1
+            if i % 50 == 0:
+                print(f"  Processed {i}/{len(cif_files)}")
+
+    print(f"\n✓ {converted} atom stores up to date, {failed} failed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
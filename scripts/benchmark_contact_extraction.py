@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Contact Extraction Benchmark
+============================
+
+Times the WebContactExtractor pipeline on synthetic AlphaFold3-like fixtures so
+speed-ups can be quantified and regressions caught before re-running the full
+manifest.
+
+Fixtures are two-chain predictions of parameterised size: an mmCIF atom_site
+table (5 atoms per residue) and a confidences JSON with token_chain_ids,
+token_res_ids, pae and contact_probs. A window of `interface` residues of each
+chain is packed against the other chain and given low PAE; a second, equally
+sized window gets low PAE but is placed far away, so the distance stage has
+candidates to reject. Fixtures are generated once per (sizes, interface, seed)
+and reused.
+
+Each case is timed per stage:
+- parse: load the confidences JSON, parse the CIF and extract sequences
+- pae_mask: select inter-chain token pairs below the PAE thresholds
+- distance: spatial validation of the PAE candidates
+- serialize: build the web payload and write it with save_to_file
+
+and reports throughput (token pairs/s for PAE masking, candidates/s and
+contacts/s for distances) and peak RSS. Every case runs in a fresh worker
+process so peak RSS is per case.
+
+Usage:
+    # Default size grid (chain lengths 100 to 5,000 residues)
+    python3 scripts/benchmark_contact_extraction.py --report contact_benchmark.json
+
+    # Custom sizes (chain A x chain B) and interface sizes, 3 timed repeats
+    python3 scripts/benchmark_contact_extraction.py --sizes 300x300,2000x1000 --interfaces 20,100 --repeat 3
+
+    # Parse stage reading the atom store instead of CIF text (see atom_store.py)
+    python3 scripts/benchmark_contact_extraction.py --atom-store --compare contact_benchmark.json
+
+    # Compare against an earlier report (exit status 1 on regressions)
+    python3 scripts/benchmark_contact_extraction.py --compare contact_benchmark.json
+
+Requirements:
+    - numpy
+    - interface_analysis.py (see extract_contacts_for_web.py)
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+import contextlib
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+
+from extract_contacts_for_web import WebContactExtractor, CIFParser
+from stage_trace import peak_rss_mb
+from atom_store import AtomStore, convert_cif
+
+DEFAULT_SIZES = ['100x100', '300x300', '1000x500', '2000x1000', '5000x300']
+DEFAULT_INTERFACES = [20, 100]
+DEFAULT_FIXTURES_DIR = Path(tempfile.gettempdir()) / 'contact_extraction_fixtures'
+DEFAULT_THRESHOLD = 0.20  # relative slow-down that counts as a regression
+MIN_DELTA_S = 0.005  # stage slow-downs below this are timer noise, whatever their relative size
+
+STAGES = ('parse', 'pae_mask', 'distance', 'serialize')
+
+RESIDUES = ['ALA', 'ARG', 'ASN', 'ASP', 'CYS', 'GLN', 'GLU', 'GLY', 'HIS', 'ILE',
+            'LEU', 'LYS', 'MET', 'PHE', 'PRO', 'SER', 'THR', 'TRP', 'TYR', 'VAL']
+ATOMS = [('N', 'N'), ('CA', 'C'), ('C', 'C'), ('O', 'O'), ('CB', 'C')]
+ATOM_SITE_COLUMNS = [
+    'group_PDB', 'id', 'type_symbol', 'label_atom_id', 'label_alt_id', 'label_comp_id',
+    'label_asym_id', 'label_entity_id', 'label_seq_id', 'pdbx_PDB_ins_code', 'Cartn_x',
+    'Cartn_y', 'Cartn_z', 'occupancy', 'B_iso_or_equiv', 'auth_seq_id', 'auth_asym_id',
+    'pdbx_PDB_model_num',
+]
+RISE = 3.8            # Angstroms between consecutive residues along a chain
+INTERFACE_GAP = 4.0   # chain separation inside the packed interface
+FAR_GAP = 40.0        # chain separation everywhere else
+
+
+def parse_sizes(text):
+    """'1000x500,300x300' -> [(1000, 500), (300, 300)]"""
+    sizes = []
+    for item in text.split(','):
+        len_a, _, len_b = item.strip().lower().partition('x')
+        sizes.append((int(len_a), int(len_b or len_a)))
+    return sizes
+
+
+def case_name(len_a, len_b, interface):
+    return f"{len_a}x{len_b}-i{interface}"
+
+
+def _windows(length, interface):
+    """Start of the packed and the decoy (low PAE, far apart) interface windows"""
+    packed = max(0, length // 2 - interface // 2)
+    decoy = max(0, min(length - interface, packed + interface * 2))
+    return packed, decoy
+
+
+def write_fixture(directory, len_a, len_b, interface, seed=0):
+    """Write a synthetic AF3-like CIF and confidences JSON; returns their paths"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{case_name(len_a, len_b, interface)}-s{seed}"
+    cif_path = directory / f"{stem}_model.cif"
+    conf_path = directory / f"{stem}_confidences.json"
+    if cif_path.exists() and conf_path.exists():
+        return cif_path, conf_path
+
+    rng = np.random.default_rng(seed)
+    interface = min(interface, len_a, len_b)
+    packed_a, decoy_a = _windows(len_a, interface)
+    packed_b, decoy_b = _windows(len_b, interface)
+
+    # Residue positions: chain A along x; chain B parallel, packed against A only
+    # inside the interface window
+    pos_a = np.zeros((len_a, 3))
+    pos_a[:, 0] = np.arange(len_a) * RISE
+    pos_b = np.zeros((len_b, 3))
+    pos_b[:, 0] = np.arange(len_b) * RISE
+    pos_b[:, 1] = FAR_GAP
+    window = slice(packed_b, packed_b + interface)
+    pos_b[window, 0] = pos_a[packed_a:packed_a + interface, 0]
+    pos_b[window, 1] = INTERFACE_GAP
+
+    with open(cif_path, 'w') as f:
+        f.write(f"data_{stem}\n#\nloop_\n")
+        f.write(''.join(f"_atom_site.{column}\n" for column in ATOM_SITE_COLUMNS))
+        atom_id = 1
+        for chain, positions in (('A', pos_a), ('B', pos_b)):
+            comps = rng.choice(RESIDUES, size=len(positions))
+            jitter = rng.normal(scale=0.8, size=(len(positions), len(ATOMS), 3))
+            for seq_id, (centre, comp) in enumerate(zip(positions, comps), 1):
+                for (atom, element), offset in zip(ATOMS, jitter[seq_id - 1]):
+                    x, y, z = centre + offset
+                    f.write(f"ATOM {atom_id} {element} {atom} . {comp} {chain} {1 if chain == 'A' else 2} "
+                            f"{seq_id} ? {x:.3f} {y:.3f} {z:.3f} 1.00 85.00 {seq_id} {chain} 1\n")
+                    atom_id += 1
+        f.write("#\n")
+
+    # PAE: low within chains, high between chains except the packed and decoy windows
+    n_tokens = len_a + len_b
+    pae = rng.uniform(15.0, 30.0, size=(n_tokens, n_tokens))
+    pae[:len_a, :len_a] = rng.uniform(0.5, 5.0, size=(len_a, len_a))
+    pae[len_a:, len_a:] = rng.uniform(0.5, 5.0, size=(len_b, len_b))
+    for start_a, start_b in ((packed_a, packed_b), (decoy_a, decoy_b)):
+        rows = slice(start_a, start_a + interface)
+        cols = slice(len_a + start_b, len_a + start_b + interface)
+        block = rng.uniform(1.0, 12.0, size=(interface, interface))
+        pae[rows, cols] = block
+        pae[cols, rows] = block.T
+    contact_probs = np.clip(1.0 - pae / 30.0, 0.0, 1.0)
+
+    # Written row by row: json.dump of a full nested list needs several times the matrix in memory
+    with open(conf_path, 'w') as f:
+        f.write('{"atom_chain_ids": ' + json.dumps(['A'] * len_a * len(ATOMS) + ['B'] * len_b * len(ATOMS)))
+        f.write(', "token_chain_ids": ' + json.dumps(['A'] * len_a + ['B'] * len_b))
+        f.write(', "token_res_ids": ' + json.dumps(list(range(1, len_a + 1)) + list(range(1, len_b + 1))))
+        for key, matrix in (('contact_probs', contact_probs), ('pae', pae)):
+            f.write(f', "{key}": [')
+            for i, row in enumerate(np.round(matrix, 2)):
+                f.write((',' if i else '') + json.dumps(row.tolist()))
+            f.write(']')
+        f.write('}')
+
+    return cif_path, conf_path
+
+
+def run_case(cif_path, conf_path, repeat=1, atom_store=None):
+    """Time each pipeline stage on one fixture; runs in its own worker process"""
+    baseline_rss = peak_rss_mb()
+    timings = {stage: [] for stage in STAGES}
+    stage_rss = {}
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        extractor = WebContactExtractor(output_dir=output_dir)
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with open(conf_path) as f:
+                conf_data = json.load(f)
+            cif_parser = AtomStore.for_cif(cif_path, atom_store) if atom_store else CIFParser(str(cif_path))
+            with contextlib.redirect_stdout(io.StringIO()):
+                cif_parser.parse_atoms()
+                sequences = cif_parser.get_sequences()
+            chain_boundaries = extractor._chain_boundaries(conf_data['token_chain_ids'])
+            timings['parse'].append(time.perf_counter() - start)
+            stage_rss['parse'] = peak_rss_mb()
+
+            start = time.perf_counter()
+            candidates = extractor._mask_pae(chain_boundaries, conf_data['pae'])
+            timings['pae_mask'].append(time.perf_counter() - start)
+            stage_rss['pae_mask'] = peak_rss_mb()
+
+            start = time.perf_counter()
+            contacts = extractor._validate_distances(candidates, cif_parser, sequences)
+            timings['distance'].append(time.perf_counter() - start)
+            stage_rss['distance'] = peak_rss_mb()
+
+            start = time.perf_counter()
+            output_file = extractor.save_to_file(0, extractor._build_result(chain_boundaries, contacts))
+            timings['serialize'].append(time.perf_counter() - start)
+            stage_rss['serialize'] = peak_rss_mb()
+
+            output_bytes = output_file.stat().st_size
+            del conf_data, cif_parser
+
+    lengths = [len(indices) for indices in chain_boundaries.values()]
+    token_pairs = sum(a * b for i, a in enumerate(lengths) for b in lengths[i + 1:])
+    return {
+        'tokens': sum(lengths),
+        'token_pairs': token_pairs,
+        'candidates': len(candidates),
+        'contacts': len(contacts),
+        'input_bytes': os.path.getsize(cif_path) + os.path.getsize(conf_path),
+        'output_bytes': output_bytes,
+        'stage_s': {stage: statistics.median(values) for stage, values in timings.items()},
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'stage_peak_rss_mb': {stage: round(value, 1) for stage, value in stage_rss.items()},
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def throughput(stats):
+    """Per-stage rates derived from the stage timings"""
+    seconds = stats['stage_s']
+
+    def rate(count, stage):
+        return round(count / seconds[stage], 1) if seconds[stage] else None
+
+    return {
+        'parse_mb_per_s': rate(stats['input_bytes'] / 1e6, 'parse'),
+        'token_pairs_per_s': rate(stats['token_pairs'], 'pae_mask'),
+        'candidates_per_s': rate(stats['candidates'], 'distance'),
+        'contacts_per_s': rate(stats['contacts'], 'distance'),
+        'serialize_contacts_per_s': rate(stats['contacts'], 'serialize'),
+    }
+
+
+def run_benchmark(cases, fixtures_dir, repeat, seed, atom_store=False):
+    """Generate fixtures and run every case in a fresh process; returns case results"""
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for len_a, len_b, interface in cases:
+        name = case_name(len_a, len_b, interface)
+        print(f"  {name}: preparing fixture...", flush=True)
+        cif_path, conf_path = write_fixture(fixtures_dir, len_a, len_b, interface, seed)
+        store_dir = None
+        if atom_store:
+            # Converted before timing: the parse stage measures loading an existing store
+            store_dir = Path(fixtures_dir) / 'atoms'
+            convert_cif(cif_path, store_dir)
+
+        with context.Pool(processes=1, maxtasksperchild=1) as pool:
+            stats = pool.apply(run_case, (cif_path, conf_path, repeat, store_dir))
+        stats.update({'case': name, 'len_a': len_a, 'len_b': len_b, 'interface': interface,
+                      'total_s': sum(stats['stage_s'].values())})
+        stats['throughput'] = throughput(stats)
+        results.append(stats)
+
+        timing = ', '.join(f"{stage} {stats['stage_s'][stage]:.3f}s" for stage in STAGES)
+        print(f"    {timing}; {stats['contacts']:,} contacts, peak RSS {stats['peak_rss_mb']:,.0f} MB")
+    return results
+
+
+def print_table(results):
+    print(f"{'Case':<18} {'Pairs':>11} {'Contacts':>8} " + ' '.join(f"{stage + ' s':>11}" for stage in STAGES) +
+          f" {'Pairs/s':>11} {'Contacts/s':>11} {'Peak MB':>8}")
+    for r in results:
+        print(f"{r['case']:<18} {r['token_pairs']:>11,} {r['contacts']:>8,} " +
+              ' '.join(f"{r['stage_s'][stage]:>11.3f}" for stage in STAGES) +
+              f" {r['throughput']['token_pairs_per_s'] or 0:>11,.0f}"
+              f" {r['throughput']['contacts_per_s'] or 0:>11,.0f} {r['peak_rss_mb']:>8,.0f}")
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Print per-case stage and memory changes; returns the list of regressions"""
+    regressions = []
+    old_cases = {case['case']: case for case in baseline['cases']}
+    print(f"Baseline: {baseline['generated_at']}")
+    print(f"{'Case':<18} {'Metric':<12} {'Baseline':>10} {'Current':>10} {'Change':>9}")
+    for case in current['cases']:
+        old = old_cases.get(case['case'])
+        if old is None:
+            continue
+        metrics = [(stage, old['stage_s'][stage], case['stage_s'][stage]) for stage in STAGES]
+        metrics.append(('peak_rss_mb', old['peak_rss_mb'], case['peak_rss_mb']))
+        for metric, before, after in metrics:
+            change = (after - before) / before if before else 0.0
+            flag = ''
+            noise = metric in STAGES and after - before < MIN_DELTA_S
+            if change > threshold and not noise:
+                regressions.append((case['case'], metric, before, after))
+                flag = '  ⚠️ regression'
+            print(f"{case['case']:<18} {metric:<12} {before:>10.3f} {after:>10.3f} {change * 100:>+8.1f}%{flag}")
+        if old['contacts'] != case['contacts']:
+            print(f"{case['case']:<18} contacts changed: {old['contacts']:,} -> {case['contacts']:,}")
+    print(f"\n{len(regressions)} regression(s) beyond {threshold * 100:.0f}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the contact extraction pipeline on synthetic AF3 fixtures',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES),
+                        help='Chain length pairs, e.g. 100x100,1000x500 (default: %(default)s)')
+    parser.add_argument('--interfaces', default=','.join(map(str, DEFAULT_INTERFACES)),
+                        help='Interface window sizes in residues (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed repeats per case (median is reported)')
+    parser.add_argument('--seed', type=int, default=0, help='Fixture random seed')
+    parser.add_argument('--fixtures-dir', default=str(DEFAULT_FIXTURES_DIR), help='Where fixtures are cached')
+    parser.add_argument('--atom-store', action='store_true',
+                        help='Parse stage loads atoms from the atom store instead of CIF text')
+    parser.add_argument('--report', help='Write the JSON report to this path')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against a saved report')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slow-down that counts as a regression (default: %(default)s)')
+    args = parser.parse_args()
+
+    interfaces = [int(value) for value in args.interfaces.split(',')]
+    cases = [(len_a, len_b, interface) for len_a, len_b in parse_sizes(args.sizes)
+             for interface in interfaces if interface <= min(len_a, len_b)]
+
+    print("=" * 80)
+    print("CONTACT EXTRACTION BENCHMARK")
+    print("=" * 80)
+    print(f"Cases: {len(cases)}, repeats: {args.repeat}, fixtures: {args.fixtures_dir}")
+    print()
+
+    results = run_benchmark(cases, args.fixtures_dir, args.repeat, args.seed, args.atom_store)
+    print()
+    print_table(results)
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'config': {'sizes': args.sizes, 'interfaces': interfaces, 'repeat': args.repeat, 'seed': args.seed,
+                   'atom_store': args.atom_store},
+        'cases': results,
+    }
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved benchmark report to {args.report}")
+
+    if args.compare:
+        print()
+        with open(args.compare) as f:
+            regressions = compare_reports(json.load(f), report, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,12 @@ Usage:
     export POSTGRES_URL="postgresql://..."
     python3 scripts/collect_cif_paths.py
 
+    # Record per-stage timings (database query, NFS lookups) to a JSONL trace
+    python3 scripts/collect_cif_paths.py --trace cif_collection_trace.jsonl
+
+    # Minified mapping with pre-compressed .gz/.br siblings (see static_assets.py)
+    python3 scripts/collect_cif_paths.py --minify --compress gz,br
+
 Requirements:
     pip install psycopg2-binary
 """
@@ -19,12 +25,16 @@ Requirements:
 import os
 import sys
 import json
+import argparse
 import psycopg2
 from pathlib import Path
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 from datetime import datetime
 
+from stage_trace import open_trace
+from static_assets import write_json_asset, parse_compress
+
 # Base directory for AlphaPulldown predictions
 AF3_BASE_DIR = Path("/emcc/au14762/elo_lab/AlphaPulldown/AF3_APD")
 
@@ -191,6 +201,19 @@ def find_cif_file(bait_uniprot: str, bait_gene: Optional[str],
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description='Map database interactions to AlphaPulldown CIF files')
+    parser.add_argument('--trace', type=str,
+                        help='Write per-stage timings to this JSONL file (or set STAGE_TRACE)')
+    parser.add_argument('--minify', action='store_true', help='Write minified JSON instead of pretty-printed')
+    parser.add_argument('--compress', type=str, default='',
+                        help='Also write pre-compressed siblings, e.g. gz,br')
+    args = parser.parse_args()
+    try:
+        compress = parse_compress(args.compress)
+    except ValueError as e:
+        parser.error(str(e))
+    trace = open_trace(args.trace, 'collect_cif_paths.py')
+
     print("="*80)
     print("CIF PATH COLLECTION SCRIPT")
     print("="*80)
@@ -204,11 +227,12 @@ def main():
     print(f"Base directory: {AF3_BASE_DIR}")
     print()
 
-    # Connect to database
-    conn = connect_to_database()
+    with trace.stage('query_database'):
+        # Connect to database
+        conn = connect_to_database()
 
-    # Get all interactions
-    interactions = get_all_interactions(conn)
+        # Get all interactions
+        interactions = get_all_interactions(conn)
 
     # Close database connection
     conn.close()
@@ -236,8 +260,11 @@ def main():
             # Try to construct from UniProt IDs
             directory_name = f"{bait_uniprot.lower()}_and_{prey_uniprot.lower()}"
 
-        # Find CIF file
-        result = find_cif_file(bait_uniprot, bait_gene, prey_uniprot, directory_name)
+        # Find CIF file (directory lookups and globs on NFS)
+        with trace.item(interaction_id) as item:
+            with trace.stage('find_cif'):
+                result = find_cif_file(bait_uniprot, bait_gene, prey_uniprot, directory_name)
+            item['status'] = 'found' if result else 'missing'
 
         if result:
             mapping[interaction_id] = result
@@ -273,8 +300,8 @@ def main():
         'mappings': mapping
     }
 
-    with open(output_file, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    with trace.stage('write_mapping'):
+        write_json_asset(output_file, output_data, args.minify, compress)
 
     print(f"✓ Saved mapping to: {output_file}")
     print()
@@ -304,6 +331,7 @@ def main():
     print("="*80)
     print("COMPLETE")
     print("="*80)
+    trace.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Residue-Level Contact Hotspots
+==============================
+
+Aggregates every public/contacts_data/<id>.json (one interaction each, chains
+A/B) into per-protein residue arrays and a reverse index from (protein,
+residue) to interactions, so questions like "which IFT46 residues are
+contacted across all partners" or colouring a structure by interface usage
+read one small file instead of looping over all contact files.
+
+Chains are mapped to proteins through the interaction directory in the slim
+manifest index (<chain A>_and_<chain B>, see manifest_index.py).
+
+Output: public/contact_hotspots/
+- index.json         {proteins: {UNIPROT: {gene, file, length, partners, ...}},
+                      genes: {GENE: [UNIPROT, ...]}}
+- <UNIPROT>.json
+    contacts         contacts per residue, summed over partners  } dense arrays
+    best_pae         lowest PAE of any contact (null if none)    } indexed by
+    partner_count    number of partners contacting the residue   } residue - 1
+    per_partner      {PARTNER: {gene, interactions, residues: {residue: [contacts, best_pae]}}}
+    residue_interactions  {residue: [interaction ids]} (reverse index)
+
+Reciprocal predictions of the same pair (A->B and B->A) are separate
+interactions; per partner, a residue's count is the maximum over them, so a
+pair predicted both ways is not counted twice.
+
+Usage:
+    # Rebuild after extract_contacts_for_web.py
+    python3 scripts/contact_hotspots.py
+
+    # Top interface residues of a protein (UniProt ID or gene name)
+    python3 scripts/contact_hotspots.py --show IFT46 --top 15
+
+In code:
+    hotspots = HotspotIndex()
+    hotspots.residue('Q9NQC8', 150)   # contacts, best PAE, partners, interactions
+"""
+
+import json
+import shutil
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+from manifest_index import ManifestIndex
+from static_assets import write_json_asset, parse_compress
+
+CONTACTS_DIR = Path("public/contacts_data")
+HOTSPOT_DIR = Path("public/contact_hotspots")
+INDEX_JSON = "index.json"
+
+
+def chain_proteins(entry):
+    """{'A': (uniprot, gene), 'B': (uniprot, gene)} from a slim manifest entry"""
+    genes = {(entry.get('bait_uniprot') or '').upper(): entry.get('bait_gene'),
+             (entry.get('prey_uniprot') or '').upper(): entry.get('prey_gene')}
+    proteins = {}
+    for chain, name in zip('AB', entry['interaction_directory'].split('_and_')):
+        uniprot = name.upper()
+        proteins[chain] = (uniprot, genes.get(uniprot) or uniprot)
+    return proteins
+
+
+class _ProteinHotspots:
+    """Accumulates residue contacts of one protein, per partner"""
+
+    def __init__(self, uniprot, gene):
+        self.uniprot = uniprot
+        self.gene = gene
+        self.length = 0
+        # partner -> {'gene', 'interactions', 'contacts': {interaction: {resi: n}}, 'best_pae': {resi: pae}}
+        self.partners = {}
+        self.residue_interactions = {}
+
+    def add(self, interaction_id, length, partner, partner_gene, resi, pae):
+        self.length = max(self.length, length)
+        record = self.partners.setdefault(partner, {'gene': partner_gene, 'interactions': [],
+                                                    'contacts': {}, 'best_pae': {}})
+        if interaction_id not in record['interactions']:
+            record['interactions'].append(interaction_id)
+        counts = record['contacts'].setdefault(interaction_id, {})
+        counts[resi] = counts.get(resi, 0) + 1
+        if pae is not None and pae < record['best_pae'].get(resi, float('inf')):
+            record['best_pae'][resi] = pae
+        interactions = self.residue_interactions.setdefault(resi, [])
+        if interaction_id not in interactions:
+            interactions.append(interaction_id)
+
+    def to_json(self):
+        length = self.length
+        contacts = [0] * length
+        best_pae = [None] * length
+        partner_count = [0] * length
+        per_partner = {}
+
+        for partner, record in self.partners.items():
+            partner_contacts = {}
+            for counts in record['contacts'].values():
+                for resi, n in counts.items():
+                    partner_contacts[resi] = max(partner_contacts.get(resi, 0), n)
+            residues = {}
+            for resi in sorted(partner_contacts):
+                n, pae = partner_contacts[resi], record['best_pae'].get(resi)
+                contacts[resi - 1] += n
+                partner_count[resi - 1] += 1
+                if pae is not None and (best_pae[resi - 1] is None or pae < best_pae[resi - 1]):
+                    best_pae[resi - 1] = pae
+                residues[str(resi)] = [n, pae]
+            per_partner[partner] = {'gene': record['gene'], 'interactions': sorted(record['interactions']),
+                                    'residues': residues}
+
+        partners = sorted(per_partner, key=lambda p: -sum(n for n, _ in per_partner[p]['residues'].values()))
+        return {
+            'uniprot': self.uniprot,
+            'gene': self.gene,
+            'length': length,
+            'partners': [{'uniprot': p, 'gene': per_partner[p]['gene'],
+                          'interactions': per_partner[p]['interactions']} for p in partners],
+            'contacts': contacts,
+            'best_pae': best_pae,
+            'partner_count': partner_count,
+            'per_partner': {p: per_partner[p] for p in partners},
+            'residue_interactions': {str(resi): sorted(ids) for resi, ids in sorted(self.residue_interactions.items())},
+        }
+
+
+def build_hotspots(contacts_dir=CONTACTS_DIR, output_dir=HOTSPOT_DIR, manifest_index=None, compress=()):
+    """Aggregate all contact files into per-protein hotspot files; returns index.json contents"""
+    manifest_index = manifest_index or ManifestIndex()
+    proteins = {}
+    n_files = n_contacts = 0
+    skipped = []
+
+    for path in sorted(Path(contacts_dir).glob('*.json'), key=lambda p: (len(p.stem), p.stem)):
+        entry = manifest_index.get(path.stem)
+        if not entry or not entry.get('interaction_directory'):
+            skipped.append(path.stem)
+            continue
+        with open(path) as f:
+            data = json.load(f)['data']
+        interaction_id = int(path.stem)
+        chains = chain_proteins(entry)
+        lengths = data.get('chain_lengths', {})
+
+        for contact in data['contacts']:
+            for side, other in (('1', '2'), ('2', '1')):
+                chain, partner_chain = contact['chain' + side], contact['chain' + other]
+                if chain not in chains or partner_chain not in chains:
+                    continue
+                uniprot, gene = chains[chain]
+                partner, partner_gene = chains[partner_chain]
+                resi = contact['resi' + side]
+                length = lengths.get(chain, resi)
+                if not 1 <= resi <= length:
+                    continue
+                if uniprot not in proteins:
+                    proteins[uniprot] = _ProteinHotspots(uniprot, gene)
+                proteins[uniprot].add(interaction_id, length, partner, partner_gene, resi, contact.get('pae'))
+        n_files += 1
+        n_contacts += len(data['contacts'])
+
+    # Rebuilt from scratch so proteins without contacts any more do not linger
+    output_dir = Path(output_dir)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    output_dir.mkdir(parents=True)
+
+    index = {
+        'generated_at': datetime.now().isoformat(),
+        'source': str(contacts_dir),
+        'interactions': n_files,
+        'contacts': n_contacts,
+        'proteins': {},
+        'genes': {},
+    }
+    for uniprot in sorted(proteins):
+        hotspots = proteins[uniprot].to_json()
+        file = f"{uniprot}.json"
+        write_json_asset(output_dir / file, hotspots, minify=True, compress=compress)
+        index['proteins'][uniprot] = {
+            'gene': hotspots['gene'],
+            'file': file,
+            'length': hotspots['length'],
+            'partners': len(hotspots['partners']),
+            'contacted_residues': sum(1 for n in hotspots['contacts'] if n),
+            'max_contacts': max(hotspots['contacts'], default=0),
+        }
+        index['genes'].setdefault(hotspots['gene'], []).append(uniprot)
+    write_json_asset(output_dir / INDEX_JSON, index, minify=True, compress=compress)
+
+    if skipped:
+        print(f"⚠️  {len(skipped)} contact files without a manifest index entry skipped "
+              f"(e.g. {', '.join(skipped[:5])})")
+    return index
+
+
+class HotspotIndex:
+    """Reader for the hotspot files; protein files are loaded on first use"""
+
+    def __init__(self, hotspot_dir=HOTSPOT_DIR):
+        self.hotspot_dir = Path(hotspot_dir)
+        with open(self.hotspot_dir / INDEX_JSON) as f:
+            self.index = json.load(f)
+        self._proteins = {}
+
+    def resolve(self, protein):
+        """UniProt IDs for a UniProt ID or gene name"""
+        if protein.upper() in self.index['proteins']:
+            return [protein.upper()]
+        return self.index['genes'].get(protein, [])
+
+    def protein(self, uniprot):
+        """Hotspot arrays of a protein, or None"""
+        if uniprot not in self._proteins:
+            info = self.index['proteins'].get(uniprot)
+            if info is None:
+                return None
+            with open(self.hotspot_dir / info['file']) as f:
+                self._proteins[uniprot] = json.load(f)
+        return self._proteins[uniprot]
+
+    def residue(self, uniprot, resi):
+        """Contacts, best PAE, contacting partners and interactions of one residue (1-based)"""
+        hotspots = self.protein(uniprot)
+        if hotspots is None or not 1 <= resi <= hotspots['length']:
+            return None
+        i = resi - 1
+        return {
+            'contacts': hotspots['contacts'][i],
+            'best_pae': hotspots['best_pae'][i],
+            'partners': [p for p, record in hotspots['per_partner'].items() if str(resi) in record['residues']],
+            'interactions': hotspots['residue_interactions'].get(str(resi), []),
+        }
+
+    def top_residues(self, uniprot, top=10):
+        """Residues with the most contacts: [(resi, contacts, partner_count, best_pae)]"""
+        hotspots = self.protein(uniprot)
+        if hotspots is None:
+            return []
+        ranked = sorted((i for i, n in enumerate(hotspots['contacts']) if n),
+                        key=lambda i: (-hotspots['partner_count'][i], -hotspots['contacts'][i], i))
+        return [(i + 1, hotspots['contacts'][i], hotspots['partner_count'][i], hotspots['best_pae'][i])
+                for i in ranked[:top]]
+
+
+def show(hotspot_index, protein, top):
+    uniprots = hotspot_index.resolve(protein)
+    if not uniprots:
+        print(f"✗ No hotspots for {protein}")
+        return
+    for uniprot in uniprots:
+        hotspots = hotspot_index.protein(uniprot)
+        partners = ', '.join(p['gene'] for p in hotspots['partners'])
+        print(f"{hotspots['gene']} ({uniprot}, {hotspots['length']} aa): {len(hotspots['partners'])} partners ({partners})")
+        print(f"  {'Residue':>7} {'Contacts':>9} {'Partners':>9} {'Best PAE':>9}")
+        for resi, contacts, partner_count, best_pae in hotspot_index.top_residues(uniprot, top):
+            print(f"  {resi:>7} {contacts:>9} {partner_count:>9} {best_pae:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Aggregate contact files into per-protein residue hotspots')
+    parser.add_argument('--contacts-dir', default=str(CONTACTS_DIR), help='Contact JSON directory')
+    parser.add_argument('--output', default=str(HOTSPOT_DIR), help=f'Hotspot directory (default: {HOTSPOT_DIR})')
+    parser.add_argument('--compress', type=str, default='', help='Also write pre-compressed siblings, e.g. gz,br')
+    parser.add_argument('--show', metavar='PROTEIN', help='Print the top residues of a protein instead of building')
+    parser.add_argument('--top', type=int, default=10, help='Residues to print with --show')
+    args = parser.parse_args()
+
+    if args.show:
+        show(HotspotIndex(args.output), args.show, args.top)
+        return
+
+    try:
+        compress = parse_compress(args.compress)
+    except ValueError as e:
+        parser.error(str(e))
+
+    index = build_hotspots(args.contacts_dir, args.output, compress=compress)
+    size = sum(path.stat().st_size for path in Path(args.output).glob('*.json'))
+    print(f"✓ Aggregated {index['contacts']} contacts from {index['interactions']} interactions into "
+          f"{len(index['proteins'])} proteins ({size / 1e6:.2f} MB) in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,14 @@ Convert Sang et al., 2011 Table S1 from Excel to CSV format
 import pandas as pd
 import sys
 
+from excel_cache import load_sheet
+
 input_file = "experimental_data/raw/Sang_Cell_2011/1-s2.0-S0092867411004776-mmc1.xls"
 output_file = "experimental_data/raw/Sang_Cell_2011/sang_2011_table_s1.csv"
 
 print(f"Converting {input_file} to CSV...")
 
-df = pd.read_excel(input_file, sheet_name='Table S1', header=1)
+df = load_sheet(input_file, sheet_name='Table S1', header=1)
 df.columns = df.columns.str.strip()
 
 df_filtered = df[df['Bait'] != 'GFP']
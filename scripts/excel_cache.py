@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Excel ingestion cache for experimental_data/raw supplementary tables.
+
+Each raw workbook is parsed once into one Parquet file per sheet under
+experimental_data/cache/excel/<workbook sha1>/ (<sha1>-header<n>/ when the
+column names are on row n), with a manifest.json listing the sheets, their
+files and shapes. The cache is keyed by workbook contents, so
+a re-downloaded or edited workbook is re-parsed and renamed copies reuse it.
+
+Parquet columns hold a single type, but spreadsheet columns often mix text and
+numbers (e.g. IDs like 1203 next to 'A8JH98'). Such columns are stored as text
+with a companion column of per-cell type codes, and non-string column names
+are recorded in the manifest; load_sheet() restores both, so it returns the
+same frame as pd.read_excel().
+
+- .xlsx workbooks are parsed by pandas with openpyxl in read-only (streaming) mode
+- legacy .xls workbooks are read with pandas/xlrd (no streaming reader exists)
+- files that are really CSV despite their extension (e.g. the Lacey 2024 table)
+  are ingested as a single sheet
+
+Later analyses call load_sheet() instead of pd.read_excel(); sample_sheet()
+reads only the first rows of a sheet for inspection.
+
+Requirements:
+    pip install pandas openpyxl pyarrow
+    pip install xlrd   # only for legacy .xls files
+
+Usage:
+    # Ingest every workbook in experimental_data/raw
+    python3 scripts/excel_cache.py
+
+    # Ingest specific workbooks, re-parsing even if cached
+    python3 scripts/excel_cache.py experimental_data/raw/Mich_NAchury_DecCell_2015_TableS1.xlsx --force
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import warnings
+import numbers
+import datetime
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+RAW_DIR = Path("experimental_data/raw")
+CACHE_DIR = Path("experimental_data/cache/excel")
+MANIFEST = "manifest.json"
+CACHE_VERSION = 2  # caches written by other versions are re-parsed
+WORKBOOK_SUFFIXES = {'.xlsx', '.xlsm', '.xls'}
+SAMPLE_ROWS = 1000
+
+# Leading bytes of the two Excel container formats
+XLSX_MAGIC = b'PK\x03\x04'
+XLS_MAGIC = b'\xd0\xcf\x11\xe0'
+
+
+def workbook_hash(path):
+    """SHA-1 of a workbook's contents (first 12 hex digits)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def workbook_format(path):
+    """'xlsx', 'xls' or 'csv', from the file's leading bytes rather than its extension"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic == XLSX_MAGIC:
+        return 'xlsx'
+    if magic == XLS_MAGIC:
+        return 'xls'
+    return 'csv'
+
+
+def _excel_file(path, fmt):
+    """pd.ExcelFile for a workbook; .xlsx is opened by openpyxl in read-only mode"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # openpyxl "Unknown extension is not supported" noise
+        return pd.ExcelFile(path, engine='openpyxl' if fmt == 'xlsx' else 'xlrd')
+
+
+def read_sheets(path, header=0, max_rows=None):
+    """Parse every sheet of a workbook into DataFrames ({sheet_name: df})"""
+    fmt = workbook_format(path)
+    if fmt == 'csv':
+        return {Path(path).stem: pd.read_csv(path, header=header, nrows=max_rows)}
+    with _excel_file(path, fmt) as xls, warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return {name: xls.parse(name, header=header, nrows=max_rows) for name in xls.sheet_names}
+
+
+# Type codes of cells in mixed-type columns (and of non-string column names);
+# each value is stored as str(value)
+MISSING, TEXT, INT, FLOAT, BOOL, DATETIME, TIME, DATE = -1, 0, 1, 2, 3, 4, 5, 6
+TYPE_PREFIX = '__type__'
+
+
+def _cell_type(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return MISSING
+    if isinstance(value, (bool, np.bool_)):
+        return BOOL
+    if isinstance(value, numbers.Integral):
+        return INT
+    if isinstance(value, numbers.Real):
+        return FLOAT
+    if isinstance(value, datetime.datetime):
+        return DATETIME
+    if isinstance(value, datetime.time):
+        return TIME
+    if isinstance(value, datetime.date):
+        return DATE
+    return TEXT
+
+
+def _restore_cell(value, code):
+    parse = {INT: int, FLOAT: float, BOOL: lambda v: v == 'True',
+             DATETIME: datetime.datetime.fromisoformat, TIME: datetime.time.fromisoformat,
+             DATE: datetime.date.fromisoformat}.get(code)
+    return parse(value) if parse and value is not None else value
+
+
+def _parquet_safe(df):
+    """
+    Make a sheet storable as Parquet: column names become strings, and object
+    columns with mixed cell types are stored as text plus a type code column.
+    Returns the frame, the mixed columns and the original non-string column names.
+    """
+    df = df.copy()
+    names = {str(col): col for col in df.columns if not isinstance(col, str)}
+    df.columns = [str(col) for col in df.columns]
+    mixed = []
+    for col in list(df.columns[df.dtypes.eq(object)]):
+        values = df[col].dropna()
+        if not values.map(lambda v: isinstance(v, str)).all():
+            df[TYPE_PREFIX + col] = df[col].map(_cell_type).astype('int8')
+            df[col] = df[col].map(lambda v: v if v is None or pd.isna(v) else str(v))
+            mixed.append(col)
+    return df, mixed, names
+
+
+def _restore_types(df, sheet):
+    """Undo _parquet_safe() using the sheet's manifest entry"""
+    for col in sheet.get('mixed_columns', []):
+        if col in df.columns:
+            codes = df.pop(TYPE_PREFIX + col)
+            df[col] = pd.Series([_restore_cell(value, code) for value, code in zip(df[col].tolist(), codes.tolist())],
+                                index=df.index, dtype=object)
+    names = sheet.get('column_names', {})
+    if names:
+        df.columns = [_restore_cell(col, names[col]) if col in names else col for col in df.columns]
+    return df
+
+
+def cache_dir(path, header=0):
+    """Cache directory of a workbook's contents, parsed with column names from row `header`"""
+    key = workbook_hash(path)
+    return CACHE_DIR / (key if header == 0 else f'{key}-header{header}')
+
+
+def load_manifest(path, header=0):
+    """Cache manifest of a workbook (None if it has not been ingested for this content)"""
+    manifest_path = cache_dir(path, header) / MANIFEST
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def ingest_workbook(path, header=0, force=False):
+    """Parse a workbook into per-sheet Parquet files once; returns its manifest"""
+    path = Path(path)
+    manifest = load_manifest(path, header)
+    if manifest is not None and manifest.get('version') == CACHE_VERSION and not force:
+        return manifest
+
+    target = cache_dir(path, header)
+    target.mkdir(parents=True, exist_ok=True)
+    manifest = {'version': CACHE_VERSION, 'workbook': str(path), 'format': workbook_format(path),
+                'header': header, 'sheets': []}
+    for i, (name, df) in enumerate(read_sheets(path, header).items()):
+        filename = f'sheet_{i:02d}.parquet'
+        stored, mixed, names = _parquet_safe(df)
+        stored.to_parquet(target / filename, index=False)
+        manifest['sheets'].append({'name': name, 'file': filename,
+                                   'rows': len(df), 'columns': [str(col) for col in df.columns],
+                                   'mixed_columns': mixed,
+                                   'column_names': {key: _cell_type(col) for key, col in names.items()}})
+
+    with open(target / MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"  ✓ Ingested {path.name}: {len(manifest['sheets'])} sheet(s) → {target}")
+    return manifest
+
+
+def sheet_names(path):
+    """Sheet names of a workbook, from the cache if present (no cell parsing either way)"""
+    manifest = load_manifest(path)
+    if manifest is not None:
+        return [sheet['name'] for sheet in manifest['sheets']]
+    fmt = workbook_format(path)
+    if fmt == 'csv':
+        return [Path(path).stem]
+    with _excel_file(path, fmt) as xls:
+        return xls.sheet_names
+
+
+def _find_sheet(manifest, sheet_name):
+    sheets = manifest['sheets']
+    if sheet_name is None:
+        return sheets[0]
+    for sheet in sheets:
+        if sheet['name'] == sheet_name:
+            return sheet
+    raise KeyError(f"Sheet {sheet_name!r} not found in {manifest['workbook']} "
+                   f"(sheets: {', '.join(s['name'] for s in sheets)})")
+
+
+def load_sheet(path, sheet_name=None, header=0, columns=None):
+    """
+    Load one sheet (default: the first) from the columnar cache, ingesting the workbook on first use.
+
+    header: row holding the column names, as in pd.read_excel
+    columns: optional subset of columns to read
+    """
+    manifest = ingest_workbook(path, header)
+    sheet = _find_sheet(manifest, sheet_name)
+    if columns is not None:
+        columns = [str(col) for col in columns]
+        columns += [TYPE_PREFIX + col for col in columns if col in sheet.get('mixed_columns', [])]
+    df = pd.read_parquet(cache_dir(path, header) / sheet['file'], columns=columns)
+    return _restore_types(df, sheet)
+
+
+def sample_sheet(path, sheet_name=None, nrows=SAMPLE_ROWS):
+    """
+    First nrows data rows of a sheet and its total row count (None if unknown).
+
+    Served from the cache when the workbook has been ingested; otherwise only the
+    first rows are parsed.
+    """
+    manifest = load_manifest(path)
+    if manifest is not None and manifest.get('version') == CACHE_VERSION:
+        sheet = _find_sheet(manifest, sheet_name)
+        df = pd.read_parquet(cache_dir(path) / sheet['file']).head(nrows)
+        return _restore_types(df, sheet), sheet['rows']
+
+    fmt = workbook_format(path)
+    if fmt == 'csv':
+        return pd.read_csv(path, nrows=nrows), None
+    with _excel_file(path, fmt) as xls, warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        sheet_name = sheet_name or xls.sheet_names[0]
+        df = xls.parse(sheet_name, nrows=nrows)
+        # Declared sheet dimensions include the header row (read-only .xlsx only)
+        max_row = xls.book[sheet_name].max_row if fmt == 'xlsx' else None
+    return df, max_row - 1 if max_row else None
+
+
+def find_workbooks(raw_dir=RAW_DIR):
+    return sorted(p for p in Path(raw_dir).rglob('*') if p.suffix.lower() in WORKBOOK_SUFFIXES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert raw workbooks into cached per-sheet Parquet files')
+    parser.add_argument('workbooks', nargs='*', help=f'Workbooks to ingest (default: all in {RAW_DIR})')
+    parser.add_argument('--header', type=int, default=0, help='Row holding the column names')
+    parser.add_argument('--force', action='store_true', help='Re-parse even if the workbook is cached')
+    args = parser.parse_args()
+
+    workbooks = [Path(p) for p in args.workbooks] or find_workbooks()
+    if not workbooks:
+        print(f"❌ No workbooks found in {RAW_DIR}")
+        sys.exit(1)
+
+    print(f"Ingesting {len(workbooks)} workbook(s) into {CACHE_DIR}/\n")
+    for path in workbooks:
+        try:
+            manifest = ingest_workbook(path, args.header, args.force)
+        except ImportError as e:
+            print(f"❌ {path.name}: missing dependency ({e}); see Requirements in {os.path.basename(__file__)}")
+            continue
+        for sheet in manifest['sheets']:
+            print(f"     {sheet['name']}: {sheet['rows']} rows × {len(sheet['columns'])} columns")
+
+
+if __name__ == '__main__':
+    main()
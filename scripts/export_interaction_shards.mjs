@@ -0,0 +1,196 @@
+#!/usr/bin/env node
+/**
+ * Export Precomputed Interaction Shards
+ * =====================================
+ *
+ * Precomputes the /api/interactions/<UNIPROT> response (v3 mode, no
+ * confidence filter, including experimental_validation) for every bait and
+ * the /api/baits response as static JSON, so the routes serve hot bait
+ * lookups from files instead of querying the database (the routes apply the
+ * v3 confidence filter in memory and fall back to SQL for ipSAE mode and
+ * non-bait searches).
+ *
+ * Output: public/interaction_shards/
+ *   index.json       {generated_at, data_version, count, shards: {UNIPROT: {file, gene_name, interactions, sha256}}}
+ *   baits.json       /api/baits response
+ *   <UNIPROT>.json   /api/interactions/<UNIPROT> response
+ *
+ * The export is incremental: payloads are compared with the sha256 recorded
+ * in index.json and only changed shards are rewritten; shards of proteins
+ * that are no longer baits are removed.
+ *
+ * index.json records the database version (DATA_VERSION_QUERY) taken before
+ * the export. The routes only serve shards while the live database still has
+ * that version, so any later write (imports, validation scripts, confidence
+ * updates) makes them fall back to SQL until the export is re-run.
+ *
+ * Usage:
+ *   export POSTGRES_URL="postgresql://..."
+ *   node scripts/export_interaction_shards.mjs
+ *   node scripts/export_interaction_shards.mjs --baits Q9NQC8,Q8NEZ3   # only these baits (*)
+ *   node scripts/export_interaction_shards.mjs --force                 # rewrite every shard
+ *
+ * (*) Only while the database version is unchanged since the last export;
+ *     otherwise every bait is exported, since the other shards would be
+ *     stamped with a version they were not built from.
+ */
+
+import { db } from '@vercel/postgres';
+import { readFile, writeFile, rename, mkdir, unlink, access, constants } from 'fs/promises';
+import { createHash } from 'crypto';
+import { join, dirname } from 'path';
+import { fileURLToPath } from 'url';
+import { buildInteractionQuery, fetchDebugInfo, fetchDataVersion, BAITS_QUERY } from '../lib/interactionQuery.mjs';
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const SHARD_DIR = join(dirname(__dirname), 'public', 'interaction_shards');
+
+const POSTGRES_URL = process.env.POSTGRES_URL;
+
+if (!POSTGRES_URL) {
+  console.error('❌ POSTGRES_URL environment variable is not set.');
+  process.exit(1);
+}
+
+function argValue(name) {
+  const i = process.argv.indexOf(name);
+  return i === -1 ? null : process.argv[i + 1];
+}
+
+let onlyBaits = argValue('--baits')?.split(',').map(id => id.trim()).filter(Boolean) || null;
+const force = process.argv.includes('--force');
+
+/**
+ * Check if a file exists
+ */
+async function fileExists(filePath) {
+  try {
+    await access(filePath, constants.F_OK);
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+/**
+ * Write via a temporary file so the routes never read a half-written shard
+ */
+async function writeAtomic(filePath, content) {
+  const tmpPath = join(dirname(filePath), `.${filePath.split('/').pop()}.tmp`);
+  await writeFile(tmpPath, content);
+  await rename(tmpPath, filePath);
+}
+
+async function loadIndex() {
+  try {
+    return JSON.parse(await readFile(join(SHARD_DIR, 'index.json'), 'utf8'));
+  } catch {
+    return { shards: {} };
+  }
+}
+
+/**
+ * Shard file name for a UniProt ID (isoform suffixes like -2 are kept)
+ */
+function shardFile(uniprotId) {
+  return `${uniprotId.replace(/[^A-Za-z0-9_-]/g, '_')}.json`;
+}
+
+async function main() {
+  console.log('📦 Exporting precomputed interaction shards...');
+  console.log();
+
+  await mkdir(SHARD_DIR, { recursive: true });
+  const previous = await loadIndex();
+  const client = await db.connect();
+
+  let written = 0;
+  let unchanged = 0;
+  let removed = 0;
+  const shards = {};
+
+  try {
+    // Taken first: a write during the export leaves the shards marked stale
+    const dataVersion = await fetchDataVersion(client);
+    if (!dataVersion) {
+      throw new Error('Could not determine the database version');
+    }
+    if (onlyBaits && previous.data_version !== dataVersion) {
+      console.log('⚠️  Database changed since the last export, exporting all baits instead of --baits');
+      onlyBaits = null;
+    }
+    const debugInfo = await fetchDebugInfo(client);
+    const { rows: baits } = await client.query(BAITS_QUERY);
+    await writeAtomic(join(SHARD_DIR, 'baits.json'), JSON.stringify({ baits, count: baits.length }));
+    console.log(`Baits: ${baits.length}`);
+
+    for (const bait of baits) {
+      const uniprotId = bait.uniprot_id;
+      const before = previous.shards[uniprotId];
+
+      // Outside --baits, keep the existing shard as is
+      if (onlyBaits && !onlyBaits.includes(uniprotId)) {
+        if (before) shards[uniprotId] = before;
+        continue;
+      }
+
+      const { query, queryParams } = buildInteractionQuery(uniprotId, [], 'v3');
+      const { rows } = await client.query(query, queryParams);
+
+      // Same shape as the /api/interactions/[id] response
+      const content = JSON.stringify({
+        interactions: rows,
+        debug: debugInfo,
+        searchTerm: uniprotId,
+        filterMode: 'v3',
+        confidenceLevels: []
+      });
+      const sha256 = createHash('sha256').update(content).digest('hex');
+      const file = shardFile(uniprotId);
+
+      if (!force && before?.sha256 === sha256 && await fileExists(join(SHARD_DIR, file))) {
+        unchanged++;
+      } else {
+        await writeAtomic(join(SHARD_DIR, file), content);
+        written++;
+        console.log(`  ✓ ${bait.gene_name || uniprotId} (${uniprotId}): ${rows.length} interactions`);
+      }
+
+      shards[uniprotId] = { file, gene_name: bait.gene_name, interactions: rows.length, sha256 };
+    }
+
+    // Proteins that are no longer baits
+    for (const [uniprotId, entry] of Object.entries(previous.shards)) {
+      if (!shards[uniprotId]) {
+        await unlink(join(SHARD_DIR, entry.file)).catch(() => {});
+        removed++;
+        console.log(`  🗑️  ${uniprotId} (no longer a bait)`);
+      }
+    }
+
+    // Index last, so it only ever points at complete shards
+    await writeAtomic(join(SHARD_DIR, 'index.json'), JSON.stringify({
+      generated_at: new Date().toISOString(),
+      data_version: dataVersion,
+      count: Object.keys(shards).length,
+      shards
+    }));
+  } finally {
+    await client.release();
+  }
+
+  console.log();
+  console.log('='.repeat(80));
+  console.log(`✅ Shards saved to: ${SHARD_DIR}`);
+  console.log(`   Written: ${written}, unchanged: ${unchanged}, removed: ${removed}`);
+  console.log('='.repeat(80));
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error('❌ Export failed:', error);
+    process.exit(1);
+  });
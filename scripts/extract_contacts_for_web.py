@@ -18,6 +18,16 @@ Usage:
     # Specify output directory
     python3 scripts/extract_contacts_for_web.py --batch --output public/contacts_data
 
+    # Record per-stage timings to a JSONL trace (see stage_trace.py)
+    python3 scripts/extract_contacts_for_web.py --batch --trace contact_trace.jsonl
+
+    # Minified JSON with pre-compressed .gz/.br siblings for the web tier
+    python3 scripts/extract_contacts_for_web.py --batch --minify --compress gz,br
+
+    # Read atoms from the memory-mapped atom store instead of re-parsing CIF text
+    # (structures are converted on first use; see atom_store.py)
+    python3 scripts/extract_contacts_for_web.py --batch --atom-store
+
 Requirements:
     - interface_analysis.py in parent directory
     - cif_mapping.json (from collect_cif_paths.py)
@@ -30,6 +40,10 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from stage_trace import StageTrace, open_trace
+from atom_store import AtomStore, STORE_DIR
+from static_assets import write_json_asset, parse_compress
+
 # Add SCRIPTS directory to path to import interface_analysis
 # __file__ is in: .../SCRIPTS/Global_Analysis/IFT_Interactors_paper/scripts/
 # We need: .../SCRIPTS/
@@ -62,10 +76,21 @@ class WebContactExtractor:
         'low': '#ff4500'         # Orange/Red
     }
 
-    def __init__(self, output_dir: str = "public/contacts_data"):
-        """Initialize extractor."""
+    def __init__(self, output_dir: str = "public/contacts_data", trace: Optional[StageTrace] = None,
+                 atom_store: Optional[str] = None, minify: bool = False, compress: tuple = ()):
+        """
+        Initialize extractor.
+
+        trace: optional stage timing trace
+        atom_store: atom store directory to read structures from instead of parsing CIF text
+        minify, compress: write minified JSON and/or pre-compressed siblings ('gz', 'br')
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.trace = trace if trace is not None else StageTrace()
+        self.atom_store = atom_store
+        self.minify = minify
+        self.compress = compress
 
     def extract_from_files(self, cif_path: str, confidences_path: str) -> Optional[Dict]:
         """
@@ -88,13 +113,22 @@ class WebContactExtractor:
                 print(f"  ERROR: Confidences file not found: {confidences_path}")
                 return None
 
-            # Load confidences JSON
-            with open(conf_file, 'r') as f:
-                conf_data = json.load(f)
-
-            # Parse CIF file
-            cif_parser = CIFParser(str(cif_file))
-            if not cif_parser.parse_atoms():
+            # Load confidences JSON (read and parse traced separately: reads may be NFS-bound)
+            with self.trace.stage('read_confidences'):
+                with open(conf_file, 'rb') as f:
+                    raw = f.read()
+            with self.trace.stage('parse_json'):
+                conf_data = json.loads(raw)
+            del raw
+
+            # Parse CIF file (or load its atoms from the atom store, converting once)
+            with self.trace.stage('load_atoms' if self.atom_store else 'parse_cif'):
+                if self.atom_store:
+                    cif_parser = AtomStore.for_cif(cif_file, self.atom_store)
+                else:
+                    cif_parser = CIFParser(str(cif_file))
+                parsed = cif_parser.parse_atoms()
+            if not parsed:
                 print(f"  ERROR: Failed to parse CIF file")
                 return None
 
@@ -104,11 +138,7 @@ class WebContactExtractor:
                 print(f"  ERROR: No token_chain_ids in confidences file")
                 return None
 
-            chain_boundaries = {}
-            for i, chain in enumerate(token_chains):
-                if chain not in chain_boundaries:
-                    chain_boundaries[chain] = []
-                chain_boundaries[chain].append(i)
+            chain_boundaries = self._chain_boundaries(token_chains)
 
             if len(chain_boundaries) < 2:
                 print(f"  ERROR: Less than 2 chains found")
@@ -121,23 +151,15 @@ class WebContactExtractor:
                 return None
 
             # Get sequences from CIF
-            sequences = cif_parser.get_sequences()
+            with self.trace.stage('sequences'):
+                sequences = cif_parser.get_sequences()
 
             # Analyze contacts
             contacts = self._analyze_contacts(
                 chain_boundaries, pae_matrix, cif_parser, sequences
             )
 
-            # Build result
-            result = {
-                'chains': list(chain_boundaries.keys()),
-                'chain_lengths': {chain: len(indices) for chain, indices in chain_boundaries.items()},
-                'contacts': contacts,
-                'summary': self._calculate_summary(contacts),
-                'spatial_validation_enabled': True
-            }
-
-            return result
+            return self._build_result(chain_boundaries, contacts)
 
         except Exception as e:
             print(f"  ERROR: {e}")
@@ -145,66 +167,112 @@ class WebContactExtractor:
             traceback.print_exc()
             return None
 
+    @staticmethod
+    def _chain_boundaries(token_chains: List[str]) -> Dict[str, List[int]]:
+        """Token indices per chain, in order of first appearance."""
+        chain_boundaries = {}
+        for i, chain in enumerate(token_chains):
+            if chain not in chain_boundaries:
+                chain_boundaries[chain] = []
+            chain_boundaries[chain].append(i)
+        return chain_boundaries
+
+    def _build_result(self, chain_boundaries: Dict, contacts: List[Dict]) -> Dict:
+        """Web JSON payload for the extracted contacts."""
+        return {
+            'chains': list(chain_boundaries.keys()),
+            'chain_lengths': {chain: len(indices) for chain, indices in chain_boundaries.items()},
+            'contacts': contacts,
+            'summary': self._calculate_summary(contacts),
+            'spatial_validation_enabled': True
+        }
+
     def _analyze_contacts(self, chain_boundaries: Dict, pae_matrix: List,
                          cif_parser: CIFParser, sequences: Dict) -> List[Dict]:
         """Analyze interface contacts with spatial validation."""
-        SPATIAL_CUTOFF = 5.0  # Angstroms
+        with self.trace.stage('pae_mask'):
+            candidates = self._mask_pae(chain_boundaries, pae_matrix)
+        with self.trace.stage('distance'):
+            return self._validate_distances(candidates, cif_parser, sequences)
 
+    def _mask_pae(self, chain_boundaries: Dict, pae_matrix: List) -> List[tuple]:
+        """
+        Select inter-chain token pairs below the loosest PAE threshold.
+
+        Returns (chain1, res1_seq_idx, chain2, res2_seq_idx, pae, confidence)
+        tuples, with 0-based residue indices within each chain.
+        """
         chains = list(chain_boundaries.keys())
-        contacts = []
+        candidates = []
 
         for i, chain1 in enumerate(chains):
             for j, chain2 in enumerate(chains[i+1:], i+1):
                 chain1_indices = chain_boundaries[chain1]
                 chain2_indices = chain_boundaries[chain2]
+                start1 = min(chain1_indices)
+                start2 = min(chain2_indices)
 
                 for idx1 in chain1_indices:
                     for idx2 in chain2_indices:
                         pae_value = pae_matrix[idx1][idx2]
 
                         # Check PAE threshold
-                        contact_quality = None
                         for threshold_name, threshold_value in self.PAE_THRESHOLDS.items():
                             if pae_value < threshold_value:
-                                contact_quality = threshold_name
+                                candidates.append((chain1, idx1 - start1, chain2, idx2 - start2,
+                                                   pae_value, threshold_name))
                                 break
 
-                        if contact_quality:
-                            # Spatial validation
-                            res1_in_chain = idx1 - min(chain1_indices) + 1
-                            res2_in_chain = idx2 - min(chain2_indices) + 1
-
-                            min_distance = cif_parser.calculate_min_distance(
-                                chain1, res1_in_chain, chain2, res2_in_chain
-                            )
-
-                            if min_distance <= SPATIAL_CUTOFF:
-                                # Get amino acids
-                                aa1 = 'X'
-                                aa2 = 'X'
-
-                                res1_seq_idx = idx1 - min(chain1_indices)
-                                res2_seq_idx = idx2 - min(chain2_indices)
-
-                                if chain1 in sequences and res1_seq_idx < len(sequences[chain1]):
-                                    aa1 = sequences[chain1][res1_seq_idx]
-                                if chain2 in sequences and res2_seq_idx < len(sequences[chain2]):
-                                    aa2 = sequences[chain2][res2_seq_idx]
-
-                                contact = {
-                                    'chain1': chain1,
-                                    'resi1': res1_in_chain,
-                                    'aa1': aa1,
-                                    'chain2': chain2,
-                                    'resi2': res2_in_chain,
-                                    'aa2': aa2,
-                                    'pae': round(float(pae_value), 2),
-                                    'distance': round(float(min_distance), 2),
-                                    'confidence': contact_quality,
-                                    'color': self.CONFIDENCE_COLORS[contact_quality]
-                                }
-
-                                contacts.append(contact)
+        return candidates
+
+    def _validate_distances(self, candidates: List[tuple], cif_parser: CIFParser,
+                            sequences: Dict) -> List[Dict]:
+        """Keep PAE candidates whose closest atoms are within the spatial cutoff."""
+        SPATIAL_CUTOFF = 5.0  # Angstroms
+
+        contacts = []
+
+        # The atom store computes all candidate distances in one vectorized pass
+        distances = None
+        if hasattr(cif_parser, 'min_distances'):
+            distances = cif_parser.min_distances([(c1, r1 + 1, c2, r2 + 1) for c1, r1, c2, r2, _, _ in candidates])
+
+        for k, (chain1, res1_seq_idx, chain2, res2_seq_idx, pae_value, contact_quality) in enumerate(candidates):
+            # Spatial validation
+            res1_in_chain = res1_seq_idx + 1
+            res2_in_chain = res2_seq_idx + 1
+
+            if distances is not None:
+                min_distance = distances[k]
+            else:
+                min_distance = cif_parser.calculate_min_distance(
+                    chain1, res1_in_chain, chain2, res2_in_chain
+                )
+
+            if min_distance <= SPATIAL_CUTOFF:
+                # Get amino acids
+                aa1 = 'X'
+                aa2 = 'X'
+
+                if chain1 in sequences and res1_seq_idx < len(sequences[chain1]):
+                    aa1 = sequences[chain1][res1_seq_idx]
+                if chain2 in sequences and res2_seq_idx < len(sequences[chain2]):
+                    aa2 = sequences[chain2][res2_seq_idx]
+
+                contact = {
+                    'chain1': chain1,
+                    'resi1': res1_in_chain,
+                    'aa1': aa1,
+                    'chain2': chain2,
+                    'resi2': res2_in_chain,
+                    'aa2': aa2,
+                    'pae': round(float(pae_value), 2),
+                    'distance': round(float(min_distance), 2),
+                    'confidence': contact_quality,
+                    'color': self.CONFIDENCE_COLORS[contact_quality]
+                }
+
+                contacts.append(contact)
 
         return contacts
 
@@ -234,8 +302,8 @@ class WebContactExtractor:
             'data': data
         }
 
-        with open(output_file, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        with self.trace.stage('save'):
+            write_json_asset(output_file, output_data, self.minify, self.compress)
 
         return output_file
 
@@ -293,10 +361,14 @@ class WebContactExtractor:
 
             print(f"  [{processed}/{total}] Processing interaction {interaction_id}...")
 
-            result = self.extract_from_files(cif_path, conf_path)
+            with self.trace.item(interaction_id) as item:
+                result = self.extract_from_files(cif_path, conf_path)
+                if result:
+                    output_file = self.save_to_file(int(interaction_id), result)
+                    item['contacts'] = result['summary']['total_contacts']
+                item['status'] = 'ok' if result else 'failed'
 
             if result:
-                output_file = self.save_to_file(int(interaction_id), result)
                 successful += 1
                 print(f"    ✓ Saved to {output_file.name}")
                 print(f"    Contacts: {result['summary']['total_contacts']} " +
@@ -339,15 +411,29 @@ def main():
                        help='Interaction ID (required with --directory)')
     parser.add_argument('--output', type=str, default='public/contacts_data',
                        help='Output directory (default: public/contacts_data)')
+    parser.add_argument('--trace', type=str,
+                       help='Write per-stage timings to this JSONL file (or set STAGE_TRACE)')
+    parser.add_argument('--minify', action='store_true',
+                       help='Write minified JSON instead of pretty-printed')
+    parser.add_argument('--compress', type=str, default='',
+                       help='Also write pre-compressed siblings, e.g. gz,br (see static_assets.py)')
+    parser.add_argument('--atom-store', type=str, nargs='?', const=str(STORE_DIR),
+                       help=f'Read atoms from the atom store (default directory: {STORE_DIR})')
 
     args = parser.parse_args()
+    try:
+        compress = parse_compress(args.compress)
+    except ValueError as e:
+        parser.error(str(e))
 
     print("="*80)
     print("PAE CONTACT EXTRACTION FOR WEB")
     print("="*80)
     print()
 
-    extractor = WebContactExtractor(output_dir=args.output)
+    trace = open_trace(args.trace, 'extract_contacts_for_web.py')
+    extractor = WebContactExtractor(output_dir=args.output, trace=trace, atom_store=args.atom_store,
+                                    minify=args.minify, compress=compress)
 
     if args.batch:
         # Batch processing
@@ -379,6 +465,7 @@ def main():
         print(f"Failed: {stats['failed']} ({stats['failed']/stats['total']*100:.1f}%)")
         print()
         print(f"Output files saved to: {extractor.output_dir}")
+        trace.close()
 
     elif args.directory:
         # Single directory processing
@@ -391,10 +478,14 @@ def main():
         print(f"Confidences file: {args.confidences}")
         print()
 
-        result = extractor.extract_from_files(args.cif, args.confidences)
+        with trace.item(args.interaction_id) as item:
+            result = extractor.extract_from_files(args.cif, args.confidences)
+            if result:
+                output_file = extractor.save_to_file(args.interaction_id, result)
+            item['status'] = 'ok' if result else 'failed'
+        trace.close()
 
         if result:
-            output_file = extractor.save_to_file(args.interaction_id, result)
             print()
             print(f"✓ Success!")
             print(f"  Output: {output_file}")
@@ -7,15 +7,17 @@
  * interaction directory names, then maps to CIF file locations.
  *
  * Output: cif_manifest.json - Clean list for manual review
+ *         public/cif_manifest_index/ - Slim lookup index (id -> directory,
+ *         bait/prey), sharded by ID range (see scripts/manifest_index.py)
  *
  * Usage:
  *   export POSTGRES_URL="postgresql://..."
- *   node scripts/generate_cif_manifest.mjs
+ *   node scripts/generate_cif_manifest.mjs [--shard-size 100]
  */
 
 import { sql } from '@vercel/postgres';
 import { readFile } from 'fs/promises';
-import { writeFile } from 'fs/promises';
+import { writeFile, mkdir, rm } from 'fs/promises';
 import { access, constants } from 'fs/promises';
 import { join, dirname } from 'path';
 import { fileURLToPath } from 'url';
@@ -23,6 +25,12 @@ import { fileURLToPath } from 'url';
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
+// Slim index layout, kept in sync with scripts/manifest_index.py
+const INDEX_DIR = join(dirname(__dirname), 'public', 'cif_manifest_index');
+const INDEX_FIELDS = ['interaction_directory', 'bait_uniprot', 'prey_uniprot', 'bait_gene', 'prey_gene', 'status'];
+const shardSizeArg = process.argv.indexOf('--shard-size');
+const SHARD_SIZE = shardSizeArg === -1 ? 100 : parseInt(process.argv[shardSizeArg + 1], 10);
+
 /**
  * Check if a file exists
  */
@@ -35,6 +43,40 @@ async function fileExists(filePath) {
   }
 }
 
+/**
+ * Write the slim lookup index: index.json plus shard-NNNN.json files holding
+ * only the fields the structure route/page need, SHARD_SIZE IDs per shard
+ */
+async function writeManifestIndex(outputData) {
+  const shards = {};
+  for (const [id, entry] of Object.entries(outputData.entries)) {
+    const key = SHARD_SIZE > 0 ? Math.floor(Number(id) / SHARD_SIZE) : 0;
+    shards[key] ??= {};
+    shards[key][id] = Object.fromEntries(INDEX_FIELDS.map(field => [field, entry[field] ?? null]));
+  }
+
+  // Rebuilt from scratch so stale shards do not linger
+  await rm(INDEX_DIR, { recursive: true, force: true });
+  await mkdir(INDEX_DIR, { recursive: true });
+
+  const index = {
+    generated_at: new Date().toISOString(),
+    source: 'cif_manifest.json',
+    source_generated_at: outputData.generated_at,
+    shard_size: SHARD_SIZE,
+    total: Object.keys(outputData.entries).length,
+    fields: INDEX_FIELDS,
+    shards: {}
+  };
+  for (const key of Object.keys(shards).sort((a, b) => a - b)) {
+    const file = `shard-${String(key).padStart(4, '0')}.json`;
+    await writeFile(join(INDEX_DIR, file), JSON.stringify(shards[key]));
+    index.shards[key] = { file, count: Object.keys(shards[key]).length };
+  }
+  await writeFile(join(INDEX_DIR, 'index.json'), JSON.stringify(index));
+  return index;
+}
+
 /**
  * Parse v4 JSON file to extract interaction directory names
  */
@@ -273,6 +315,9 @@ async function main() {
     await writeFile(outputFile, JSON.stringify(outputData, null, 2));
 
     console.log(`✅ Manifest saved to: ${outputFile}`);
+
+    const index = await writeManifestIndex(outputData);
+    console.log(`✅ Lookup index saved to: ${INDEX_DIR} (${Object.keys(index.shards).length} shards)`);
     console.log();
     console.log('📋 Review this file and verify the paths are correct!');
     console.log();
@@ -2,6 +2,9 @@
 """
 Inspect Excel/CSV files to understand their structure before writing parsers.
 
+Only the first 1000 rows of each sheet are parsed (or read from the columnar
+cache built by excel_cache.py, if the workbook has been ingested).
+
 Usage:
     python3 inspect_excel.py <file_path> [sheet_name]
 
@@ -14,6 +17,8 @@ import sys
 import pandas as pd
 from pathlib import Path
 
+from excel_cache import sheet_names, sample_sheet, SAMPLE_ROWS
+
 def inspect_excel(file_path, sheet_name=None):
     """Inspect Excel or CSV file structure."""
 
@@ -33,9 +38,9 @@ def inspect_excel(file_path, sheet_name=None):
     try:
         if ext in ['.xlsx', '.xls']:
             # Excel file - list all sheets
-            xls = pd.ExcelFile(file_path)
-            print(f"📊 Excel file with {len(xls.sheet_names)} sheet(s):")
-            for i, sheet in enumerate(xls.sheet_names, 1):
+            names = sheet_names(file_path)
+            print(f"📊 Excel file with {len(names)} sheet(s):")
+            for i, sheet in enumerate(names, 1):
                 print(f"   {i}. {sheet}")
             print()
 
@@ -44,14 +49,18 @@ def inspect_excel(file_path, sheet_name=None):
                 sheets_to_inspect = [sheet_name]
             else:
                 # Inspect all sheets (or first 3 if many)
-                sheets_to_inspect = xls.sheet_names[:3]
+                sheets_to_inspect = names[:3]
 
             for sheet in sheets_to_inspect:
                 print(f"\n{'─'*80}")
                 print(f"📑 Sheet: {sheet}")
                 print(f"{'─'*80}\n")
 
-                df = pd.read_excel(file_path, sheet_name=sheet)
+                df, total_rows = sample_sheet(file_path, sheet, nrows=SAMPLE_ROWS)
+                if total_rows and total_rows > len(df):
+                    print(f"ℹ️  Sampled first {len(df)} of {total_rows} rows\n")
+                elif len(df) == SAMPLE_ROWS:
+                    print(f"ℹ️  Sampled first {SAMPLE_ROWS} rows\n")
                 inspect_dataframe(df)
 
         elif ext == '.csv':
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Slim, sharded lookup index for cif_manifest.json.
+
+The full manifest carries NFS paths, notes and scores for every interaction,
+but most consumers (the structure/[id] route and page, the API benchmark) only
+need an interaction's directory and partners. The index keeps just those
+fields in small JSON shards under public/cif_manifest_index/:
+
+- index.json         shard_size, fields, total and {shard key: {file, count}}
+- shard-NNNN.json    {interaction id: {interaction_directory, bait_uniprot,
+                      prey_uniprot, bait_gene, prey_gene, status}} for ids
+                      shard_size * NNNN .. shard_size * (NNNN + 1) - 1
+
+A lookup reads index.json and one shard (a few KB) instead of the whole
+manifest. shard_size 0 puts all entries into shard-0000.json. The same layout
+is written by generate_cif_manifest.mjs when it regenerates the manifest; this
+script rebuilds it from an existing cif_manifest.json.
+
+Usage:
+    # Rebuild the index from cif_manifest.json
+    python3 scripts/manifest_index.py
+
+    # Different shard size, with pre-compressed siblings (see static_assets.py)
+    python3 scripts/manifest_index.py --shard-size 50 --compress gz,br
+
+In code:
+    index = ManifestIndex()
+    entry = index.get(123)
+"""
+
+import json
+import shutil
+import argparse
+from pathlib import Path
+from datetime import datetime
+
+from static_assets import write_json_asset, parse_compress
+
+MANIFEST_JSON = Path("cif_manifest.json")
+INDEX_DIR = Path("public/cif_manifest_index")
+INDEX_JSON = "index.json"
+DEFAULT_SHARD_SIZE = 100
+SLIM_FIELDS = ('interaction_directory', 'bait_uniprot', 'prey_uniprot', 'bait_gene', 'prey_gene', 'status')
+
+
+def shard_key(interaction_id, shard_size):
+    """Shard holding an interaction ID"""
+    return int(interaction_id) // shard_size if shard_size else 0
+
+
+def shard_file(key):
+    return f"shard-{key:04d}.json"
+
+
+def build_manifest_index(manifest_path=MANIFEST_JSON, index_dir=INDEX_DIR, shard_size=DEFAULT_SHARD_SIZE,
+                         compress=()):
+    """Write the slim sharded index for a manifest; returns the index.json contents"""
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    entries = manifest.get('entries', manifest.get('mappings', {}))
+
+    shards = {}
+    for interaction_id, entry in entries.items():
+        slim = {field: entry.get(field) for field in SLIM_FIELDS}
+        shards.setdefault(shard_key(interaction_id, shard_size), {})[interaction_id] = slim
+
+    # Rebuilt from scratch so shards from a larger shard size or removed IDs do not linger
+    index_dir = Path(index_dir)
+    shutil.rmtree(index_dir, ignore_errors=True)
+    index_dir.mkdir(parents=True)
+
+    index = {
+        'generated_at': datetime.now().isoformat(),
+        'source': str(manifest_path),
+        'source_generated_at': manifest.get('generated_at'),
+        'shard_size': shard_size,
+        'total': len(entries),
+        'fields': list(SLIM_FIELDS),
+        'shards': {},
+    }
+    for key in sorted(shards):
+        write_json_asset(index_dir / shard_file(key), shards[key], minify=True, compress=compress)
+        index['shards'][str(key)] = {'file': shard_file(key), 'count': len(shards[key])}
+    write_json_asset(index_dir / INDEX_JSON, index, minify=True, compress=compress)
+    return index
+
+
+class ManifestIndex:
+    """Lazy reader for the slim manifest index; shards are loaded on first use"""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = Path(index_dir)
+        with open(self.index_dir / INDEX_JSON) as f:
+            self.index = json.load(f)
+        self.shard_size = self.index['shard_size']
+        self._shards = {}
+
+    def _shard(self, key):
+        if key not in self._shards:
+            info = self.index['shards'].get(str(key))
+            if info is None:
+                self._shards[key] = {}
+            else:
+                with open(self.index_dir / info['file']) as f:
+                    self._shards[key] = json.load(f)
+        return self._shards[key]
+
+    def get(self, interaction_id):
+        """Slim entry for an interaction ID, or None"""
+        return self._shard(shard_key(interaction_id, self.shard_size)).get(str(interaction_id))
+
+    def __len__(self):
+        return self.index['total']
+
+    def items(self):
+        """(interaction id, entry) for every entry, shard by shard"""
+        for key in sorted(self.index['shards'], key=int):
+            yield from self._shard(int(key)).items()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the slim sharded lookup index for cif_manifest.json')
+    parser.add_argument('--manifest', default=str(MANIFEST_JSON), help='Full manifest to index')
+    parser.add_argument('--output', default=str(INDEX_DIR), help=f'Index directory (default: {INDEX_DIR})')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help='Interaction IDs per shard (0: a single shard)')
+    parser.add_argument('--compress', type=str, default='', help='Also write pre-compressed siblings, e.g. gz,br')
+    args = parser.parse_args()
+
+    try:
+        compress = parse_compress(args.compress)
+    except ValueError as e:
+        parser.error(str(e))
+
+    index = build_manifest_index(args.manifest, args.output, args.shard_size, compress)
+    sizes = [(Path(args.output) / info['file']).stat().st_size for info in index['shards'].values()]
+    print(f"✓ Indexed {index['total']} entries from {args.manifest} into {len(sizes)} shard(s) in {args.output}")
+    print(f"  Shard size: {min(sizes) / 1024:.1f}-{max(sizes) / 1024:.1f} KB "
+          f"(manifest: {Path(args.manifest).stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
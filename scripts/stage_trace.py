@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Stage-Level Tracing for Batch Scripts
+=====================================
+
+Opt-in instrumentation for the batch scripts (extract_contacts_for_web.py,
+collect_cif_paths.py, ift_protein_extractor_updated.py). Per item and per
+stage it records wall time, CPU time, bytes read and memory into a JSONL trace,
+and prints the slowest stages and items at the end of the run.
+
+CPU time next to wall time separates I/O waits (NFS reads, HTTP) from parsing
+and compute: a stage with low CPU share is waiting, not working. Bytes read
+come from /proc/self/io (rchar, which includes network reads) and memory from
+/proc/self/statm and /proc/self/status, so they are only recorded on Linux;
+elsewhere they are null.
+
+Memory is recorded as the current RSS at the end of a stage or item and its
+change since the start (rss_delta_mb). The item peak (peak_rss_mb) is VmHWM
+after resetting it through /proc/self/clear_refs at the start of the item, so
+it covers that item only; where the reset is not available it is null. The
+ru_maxrss high-water mark is kept as process_peak_rss_mb: it never decreases,
+so it says how large the process got, not what an item needed.
+
+Tracing is off unless a trace path is given, either with the script's --trace
+option or the STAGE_TRACE environment variable; a disabled trace costs one
+attribute check per stage.
+
+Trace records (one JSON object per line):
+- run: script, arguments, host and start time
+- stage: item, stage, wall_s, cpu_s, bytes_read, rss_mb, rss_delta_mb (and
+  error if the stage raised)
+- item: item, wall_s, cpu_s, bytes_read, rss_mb, rss_delta_mb, peak_rss_mb,
+  process_peak_rss_mb, per-stage wall times and any fields set by the script
+  (e.g. status)
+- summary: per-stage totals at the end of the run
+
+Usage:
+    python3 scripts/extract_contacts_for_web.py --batch --trace contact_trace.jsonl
+    STAGE_TRACE=extraction_trace.jsonl python3 ift_protein_extractor_updated.py
+
+    # Summarize an existing trace
+    python3 scripts/stage_trace.py contact_trace.jsonl --top 20
+
+In code:
+    trace = open_trace(args.trace)
+    for item_id in items:
+        with trace.item(item_id) as record:
+            with trace.stage('read'):
+                ...
+            record['status'] = 'ok'
+    trace.close()
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import resource
+from datetime import datetime
+from contextlib import contextmanager
+
+TRACE_ENV = 'STAGE_TRACE'
+DEFAULT_TOP = 10
+
+
+def bytes_read():
+    """Bytes read by this process so far (rchar from /proc/self/io), or None"""
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def rss_mb():
+    """Current resident set size in MB (from /proc/self/statm), or None"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def peak_rss_mb():
+    """Process-lifetime peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
+
+
+def reset_peak_rss():
+    """Reset VmHWM to the current RSS (Linux /proc/self/clear_refs); True if it was reset"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def window_peak_rss_mb():
+    """Peak resident set size in MB since the last reset_peak_rss() (VmHWM), or None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _round(value, digits=4):
+    return None if value is None else round(value, digits)
+
+
+def _delta(end, start):
+    return end - start if end is not None and start is not None else None
+
+
+class StageTrace:
+    """Per-item, per-stage timings written to a JSONL file (disabled when path is None)"""
+
+    def __init__(self, path=None, script=None):
+        self.path = path
+        self.enabled = path is not None
+        self.stage_totals = {}
+        self.items = []
+        self._item = None
+        self._file = None
+        if self.enabled:
+            self._file = open(path, 'a')
+            self._write({
+                'event': 'run',
+                'script': script or os.path.basename(sys.argv[0]),
+                'argv': sys.argv[1:],
+                'host': socket.gethostname(),
+                'pid': os.getpid(),
+                'started_at': datetime.now().isoformat(),
+            })
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    @staticmethod
+    def _snapshot():
+        return time.perf_counter(), time.process_time(), bytes_read(), rss_mb()
+
+    @staticmethod
+    def _measure(start):
+        wall, cpu, read, rss = StageTrace._snapshot()
+        return {
+            'wall_s': _round(wall - start[0]),
+            'cpu_s': _round(cpu - start[1]),
+            'bytes_read': _delta(read, start[2]),
+            'rss_mb': _round(rss, 1),
+            'rss_delta_mb': _round(_delta(rss, start[3]), 1),
+        }
+
+    @contextmanager
+    def item(self, item_id, **fields):
+        """Trace one unit of work (interaction, protein, ...); yields a dict for extra fields"""
+        if not self.enabled:
+            yield {}
+            return
+        record = {'event': 'item', 'item': str(item_id), **fields}
+        stages = {}
+        self._item = (record['item'], stages)
+        peak_reset = reset_peak_rss()
+        start = self._snapshot()
+        try:
+            yield record
+        except BaseException as e:
+            record.setdefault('status', 'error')
+            record['error'] = type(e).__name__
+            raise
+        finally:
+            self._item = None
+            record.update(self._measure(start))
+            record['peak_rss_mb'] = _round(window_peak_rss_mb(), 1) if peak_reset else None
+            record['process_peak_rss_mb'] = _round(peak_rss_mb(), 1)
+            record['stages'] = {name: _round(wall) for name, wall in stages.items()}
+            self.items.append(record)
+            self._write(record)
+
+    @contextmanager
+    def stage(self, name):
+        """Trace one stage, inside an item or on its own"""
+        if not self.enabled:
+            yield
+            return
+        start = self._snapshot()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            record = {'event': 'stage', 'item': self._item[0] if self._item else None, 'stage': name}
+            record.update(self._measure(start))
+            if error:
+                record['error'] = error
+            self._write(record)
+            self._add(record)
+            if self._item:
+                stages = self._item[1]
+                stages[name] = stages.get(name, 0.0) + record['wall_s']
+
+    def _add(self, record):
+        totals = self.stage_totals.setdefault(record['stage'], {
+            'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'bytes_read': 0, 'max_s': 0.0, 'max_item': None})
+        totals['count'] += 1
+        totals['wall_s'] += record['wall_s']
+        totals['cpu_s'] += record['cpu_s']
+        totals['bytes_read'] += record['bytes_read'] or 0
+        if record['wall_s'] > totals['max_s']:
+            totals['max_s'], totals['max_item'] = record['wall_s'], record['item']
+
+    def close(self, top=DEFAULT_TOP):
+        """Write the summary record, print the slowest stages and items, and close the trace"""
+        if not self.enabled:
+            return
+        self._write({'event': 'summary', 'finished_at': datetime.now().isoformat(),
+                     'items': len(self.items),
+                     'stages': {name: {key: _round(value) if isinstance(value, float) else value
+                                       for key, value in totals.items()}
+                                for name, totals in self.stage_totals.items()}})
+        self._file.close()
+        print()
+        print_summary(self.stage_totals, self.items, top)
+        print(f"Stage trace written to: {self.path}")
+
+
+def open_trace(path=None, script=None):
+    """Trace to `path`, or to $STAGE_TRACE if set; disabled otherwise"""
+    return StageTrace(path or os.environ.get(TRACE_ENV) or None, script)
+
+
+def print_summary(stage_totals, items, top=DEFAULT_TOP):
+    """Stage totals sorted by wall time, then the slowest items with their dominant stage"""
+    total_wall = sum(totals['wall_s'] for totals in stage_totals.values())
+    print("=" * 80)
+    print("STAGE TIMING SUMMARY")
+    print("=" * 80)
+    print(f"{'Stage':<20} {'Count':>7} {'Total s':>10} {'Mean s':>9} {'Max s':>9} {'Share':>7} "
+          f"{'CPU %':>6} {'MB read':>9}")
+    for name, totals in sorted(stage_totals.items(), key=lambda kv: -kv[1]['wall_s']):
+        wall = totals['wall_s']
+        share = wall / total_wall * 100 if total_wall else 0.0
+        cpu = totals['cpu_s'] / wall * 100 if wall else 0.0
+        print(f"{name:<20} {totals['count']:>7} {wall:>10.2f} {wall / totals['count']:>9.3f} "
+              f"{totals['max_s']:>9.3f} {share:>6.1f}% {cpu:>5.0f}% {totals['bytes_read'] / 1e6:>9.1f}")
+
+    slowest = sorted(items, key=lambda record: -(record['wall_s'] or 0))[:top]
+    if slowest:
+        print()
+        print(f"Slowest {len(slowest)} of {len(items)} items:")
+        for record in slowest:
+            stages = record.get('stages') or {}
+            dominant = max(stages.items(), key=lambda kv: kv[1]) if stages else None
+            detail = f" ({dominant[0]} {dominant[1]:.2f}s)" if dominant else ''
+            status = f" [{record['status']}]" if record.get('status') else ''
+            print(f"  {record['item']:<24} {record['wall_s']:>9.2f}s{detail}{status}")
+    print()
+
+
+def load_trace(path):
+    """Stage totals and item records from a JSONL trace (all runs in the file)"""
+    trace = StageTrace()
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record['event'] == 'stage':
+                trace._add(record)
+            elif record['event'] == 'item':
+                trace.items.append(record)
+    return trace.stage_totals, trace.items
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a stage trace written by a batch script')
+    parser.add_argument('trace', help='JSONL trace file')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='Slowest items to list')
+    args = parser.parse_args()
+
+    stage_totals, items = load_trace(args.trace)
+    print_summary(stage_totals, items, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Static JSON Assets with Pre-Compressed Siblings
+===============================================
+
+Writes JSON assets for the web tier, optionally minified and with
+pre-compressed siblings (x.json.gz, x.json.br), so routes can return the
+compressed bytes directly instead of compressing every response:
+
+- public/contacts_data/<id>.json (WebContactExtractor.save_to_file)
+- cif_mapping.json (collect_cif_paths.py) and cif_manifest.json
+
+Siblings for encodings that are not requested are deleted, so a re-run without
+compression never leaves stale .gz/.br files behind. Files are written to a
+temporary name and renamed, so a route never reads a half-written asset.
+gzip output is reproducible (mtime 0); brotli needs the optional brotli package
+and is skipped with a warning if it is missing.
+
+Requirements:
+    pip install brotli   # only for .br siblings
+
+Usage:
+    # Re-emit existing assets minified, with .gz and .br siblings
+    python3 scripts/static_assets.py public/contacts_data cif_manifest.json --minify --compress gz,br
+
+In code:
+    write_json_asset(path, data, minify=True, compress=('gz', 'br'))
+"""
+
+import os
+import gzip
+import json
+import argparse
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIONS = ('gz', 'br')
+_warned_brotli = False
+
+
+def parse_compress(text):
+    """'gz,br' -> ('gz', 'br'); empty or None -> ()"""
+    if not text:
+        return ()
+    encodings = tuple(item.strip() for item in text.split(',') if item.strip())
+    unknown = [item for item in encodings if item not in COMPRESSIONS]
+    if unknown:
+        raise ValueError(f"Unknown compression(s): {', '.join(unknown)} (supported: {', '.join(COMPRESSIONS)})")
+    return encodings
+
+
+def encode_json(data, minify=False):
+    """UTF-8 JSON bytes: compact separators when minified, 2-space indent otherwise"""
+    if minify:
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _compress(data, encoding):
+    global _warned_brotli
+    if encoding == 'gz':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is None:
+        if not _warned_brotli:
+            print("WARNING: brotli is not installed (pip install brotli); skipping .br files")
+            _warned_brotli = True
+        return None
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+
+def _write_atomic(path, data):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_compressed_siblings(path, data, compress=()):
+    """Write path.gz/path.br for the requested encodings and delete the others; returns sizes"""
+    path = Path(path)
+    sizes = {}
+    for encoding in COMPRESSIONS:
+        sibling = path.with_name(f"{path.name}.{encoding}")
+        compressed = _compress(data, encoding) if encoding in compress else None
+        if compressed is None:
+            sibling.unlink(missing_ok=True)
+            continue
+        _write_atomic(sibling, compressed)
+        sizes[encoding] = len(compressed)
+    return sizes
+
+
+def write_json_asset(path, data, minify=False, compress=()):
+    """Write a JSON asset and its compressed siblings; returns {'json': bytes, 'gz': ..., 'br': ...}"""
+    path = Path(path)
+    encoded = encode_json(data, minify)
+    _write_atomic(path, encoded)
+    sizes = {'json': len(encoded)}
+    sizes.update(write_compressed_siblings(path, encoded, compress))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Minify JSON assets and write pre-compressed siblings')
+    parser.add_argument('paths', nargs='+', help='JSON files or directories of JSON files')
+    parser.add_argument('--minify', action='store_true', help='Rewrite the JSON files minified')
+    parser.add_argument('--compress', default='gz,br', help='Encodings to write (default: gz,br; "" removes siblings)')
+    args = parser.parse_args()
+
+    try:
+        compress = parse_compress(args.compress)
+    except ValueError as e:
+        parser.error(str(e))
+
+    files = []
+    for path in map(Path, args.paths):
+        files += sorted(path.glob('*.json')) if path.is_dir() else [path]
+
+    totals = {'before': 0, 'json': 0, 'gz': 0, 'br': 0}
+    for i, path in enumerate(files, 1):
+        raw = path.read_bytes()
+        totals['before'] += len(raw)
+        if args.minify:
+            sizes = write_json_asset(path, json.loads(raw), minify=True, compress=compress)
+        else:
+            sizes = {'json': len(raw), **write_compressed_siblings(path, raw, compress)}
+        for key, size in sizes.items():
+            totals[key] += size
+        if i % 100 == 0:
+            print(f"  Processed {i}/{len(files)}")
+
+    print(f"✓ {len(files)} JSON assets: {totals['before'] / 1e6:.2f} MB -> {totals['json'] / 1e6:.2f} MB JSON")
+    for encoding in compress:
+        if totals[encoding]:
+            print(f"  .{encoding}: {totals[encoding] / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()